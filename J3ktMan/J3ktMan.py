@@ -1,7 +1,9 @@
 """Welcome to Reflex! This file outlines the steps to create a basic app."""
 
+from reflex.utils.exec import is_prod_mode
 import reflex as rx
 
+from J3ktMan import db, profiler
 from J3ktMan.page.index import index
 from J3ktMan.page.join_project import join_project
 from J3ktMan.page.kanban import kanban
@@ -19,6 +21,32 @@ from J3ktMan.model import project  # noqa
 
 app = rx.App()
 
+
+async def database_pool_stats() -> dict:
+    """
+    Reports the connection pool of this worker, to size the pool and to
+    notice its exhaustion.
+    """
+    return db.get_pool_stats().dict()
+
+
+async def database_profile() -> list[dict]:
+    """
+    Reports the database work of each event handler and computed var, empty
+    unless `DATABASE_PROFILE` is set.
+    """
+    return [entry.dict() for entry in profiler.get_report()]
+
+
+# the reports describe the deployment, they are only served while profiling
+# or in development
+if app.api is not None and (profiler.is_enabled() or not is_prod_mode()):
+    app.api.add_api_route("/_health/db", database_pool_stats)
+    app.api.add_api_route("/_health/db/profile", database_profile)
+
+if profiler.is_enabled():
+    profiler.install_state_hooks()
+
 app.add_page(index)
 
 # for some reason, the @rx.page(route="...") decorator doesn't work so the route is added manually here :(
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+import threading
+import time
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MISSING = object()
+"""
+Returned by `TTLCache.get` when there's no live entry for the key. Allows
+`None` to be cached as a regular value.
+"""
+
+
+class TTLCache(Generic[K, V]):
+    """
+    A thread-safe, process-wide cache. Entries expire `ttl` seconds after
+    they were stored and once more than `maxsize` entries are stored, the
+    least recently used one is evicted.
+
+    With a `weigher`, `maxsize` bounds the total weight of the entries
+    instead of their number, e.g. the number of rows of the cached values.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        weigher: Callable[[V], int] | None = None,
+    ) -> None:
+        assert maxsize > 0
+        assert ttl > 0
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.weigher = weigher
+
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._weight = 0
+
+        # bumped on every invalidation, so that a value loaded concurrently
+        # with a write is never stored after the write invalidated it
+        self._generation = 0
+
+    def get(self, key: K) -> V | object:
+        """
+        Returns the cached value of the key or `MISSING` if the key isn't
+        cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Stores the value of the key. The `ttl` argument overrides the cache's
+        default time-to-live for this entry only.
+        """
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        """
+        Returns the cached value of the key, calling `loader` and caching its
+        result on a miss.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value  # type: ignore
+
+        generation = self._generation
+        value = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value, None)
+
+        return value
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._generation += 1
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._weight = 0
+
+    def _store(self, key: K, value: V, ttl: float | None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        self._remove(key)
+
+        weight = self._weigh(value)
+        if weight > self.maxsize:
+            # would evict everything else and still not fit
+            return
+
+        self._entries[key] = (expires_at, value)
+        self._weight += weight
+
+        while self._weight > self.maxsize:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._weight -= self._weigh(evicted)
+
+    def _remove(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= self._weigh(entry[1])
+
+    def _weigh(self, value: V) -> int:
+        return 1 if self.weigher is None else self.weigher(value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,434 @@
+"""
+Feed of the changes made to the projects, so that the boards opened by other
+users stay in sync without reloading the whole project.
+
+The CRUD layer publishes a compact `Change` after every write to the tasks,
+the states viewing the project subscribe to it and apply the changes to their
+data. The changes are carried between the worker processes by the backend
+selected with `CHANGE_FEED_BACKEND`:
+
+- `local`: the changes only reach the subscribers of the same process, the
+  default and the stand-in of the other backends for a single worker
+- `postgres`: Postgres' LISTEN/NOTIFY on the app's database
+- `redis`: Redis' pub/sub on the redis url of the Reflex config
+
+The caches of a project in this process are dropped when a change published
+by another process, e.g. the CLI's import, is received, before the
+subscribers are notified.
+"""
+
+from reflex.config import get_config
+import reflex as rx
+import sqlalchemy
+
+from . import db
+from .crud.schedule import invalidate_project_schedule
+from .crud.snapshot import invalidate_project_snapshot
+from .crud.stats import invalidate_project_task_stats
+
+import asyncio
+import enum
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from typing import Callable, Protocol, cast
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "j3ktman_changes"
+"""
+Name of the Postgres and Redis channel the changes are published on.
+"""
+
+MAX_PAYLOAD_SIZE = 7900
+"""
+Maximum size in bytes of a published change, below the 8000 bytes limit of
+Postgres' NOTIFY. Larger changes are published without their fields.
+"""
+
+MAX_PENDING_CHANGES = 1000
+"""
+Maximum number of changes waiting to be applied by a subscriber, the
+subscriber is marked as lost once exceeded.
+"""
+
+RECONNECT_DELAY = 5
+"""
+Number of seconds waited before listening again after the connection to the
+backend was lost.
+"""
+
+
+class ChangeKind(str, enum.Enum):
+    TASK_CREATED = "task_created"
+    TASK_MOVED = "task_moved"
+    TASK_RENAMED = "task_renamed"
+    TASK_UPDATED = "task_updated"
+    TASK_DELETED = "task_deleted"
+
+    PROJECT_CHANGED = "project_changed"
+    """
+    Anything in the project may have changed, e.g. after a bulk write, the
+    subscribers have to load the project again.
+    """
+
+
+class Change(rx.Base):
+    """
+    A change made to a task of the project. Only the fields explicitly given
+    are published, so `milestone_id`, `start_date` and `end_date` can be
+    given as None to clear them.
+    """
+
+    kind: ChangeKind
+    project_id: int
+    task_id: int | None = None
+    name: str | None = None
+    description: str | None = None
+    status_id: int | None = None
+    milestone_id: int | None = None
+    start_date: int | None = None
+    end_date: int | None = None
+    version: int | None = None
+
+    partial: bool = False
+    """
+    Whether the fields were dropped because the change was too large to be
+    published, the subscribers have to load the task again.
+    """
+
+    def fields(self) -> dict:
+        """
+        Returns the task fields given in the change.
+        """
+        return self.dict(
+            exclude_unset=True,
+            exclude={"kind", "project_id", "task_id", "partial"},
+        )
+
+
+class ChangeBackend(Protocol):
+    """
+    Carries the published changes, serialized, to the subscribers of every
+    process.
+    """
+
+    def publish(self, payload: str) -> None: ...
+
+    def listen(self, deliver: Callable[[str], None]) -> None:
+        """
+        Starts calling `deliver` with every payload published, including the
+        ones published by this process.
+        """
+        ...
+
+
+class _Selectable(Protocol):
+    """
+    A driver connection that can be waited on with `select`, e.g. psycopg2's.
+    """
+
+    def fileno(self) -> int: ...
+
+
+class LocalBackend:
+    def __init__(self) -> None:
+        self._deliver: Callable[[str], None] | None = None
+
+    def publish(self, payload: str) -> None:
+        if self._deliver is not None:
+            self._deliver(payload)
+
+    def listen(self, deliver: Callable[[str], None]) -> None:
+        self._deliver = deliver
+
+
+class PostgresBackend:
+    def __init__(self, engine: sqlalchemy.Engine) -> None:
+        self._engine = engine
+
+    def publish(self, payload: str) -> None:
+        with self._engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": payload},
+            )
+
+    def listen(self, deliver: Callable[[str], None]) -> None:
+        threading.Thread(
+            target=self._listen,
+            args=(deliver,),
+            name="change-feed",
+            daemon=True,
+        ).start()
+
+    def _listen(self, deliver: Callable[[str], None]) -> None:
+        dialect = self._engine.dialect
+
+        while True:
+            try:
+                # a connection of its own, it would hold a slot of the pool
+                # forever otherwise
+                args, kwargs = dialect.create_connect_args(self._engine.url)
+                connection = dialect.connect(*args, **kwargs)
+                connection.autocommit = True
+
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                finally:
+                    cursor.close()
+
+                selectable = cast(_Selectable, connection)
+
+                while True:
+                    ready, _, _ = select.select([selectable], [], [], 60)
+                    if not ready:
+                        continue
+
+                    connection.poll()
+
+                    while connection.notifies:
+                        deliver(connection.notifies.pop(0).payload)
+
+            except Exception:
+                logger.exception("Lost the connection to the change feed")
+                time.sleep(RECONNECT_DELAY)
+
+
+class RedisBackend:
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, payload: str) -> None:
+        self._client.publish(CHANNEL, payload)
+
+    def listen(self, deliver: Callable[[str], None]) -> None:
+        threading.Thread(
+            target=self._listen,
+            args=(deliver,),
+            name="change-feed",
+            daemon=True,
+        ).start()
+
+    def _listen(self, deliver: Callable[[str], None]) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+
+                for message in pubsub.listen():
+                    deliver(message["data"].decode())
+
+            except Exception:
+                logger.exception("Lost the connection to the change feed")
+                time.sleep(RECONNECT_DELAY)
+
+
+class Subscription:
+    """
+    The changes of a project received by one subscriber, to be used as a
+    context manager from the event loop of the subscriber.
+    """
+
+    def __init__(self, bus: "ChangeBus", project_id: int) -> None:
+        self.project_id = project_id
+
+        self.lost = False
+        """
+        Whether changes were dropped because too many were pending, the
+        subscriber has to load the project again.
+        """
+
+        self._bus = bus
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[Change] = asyncio.Queue(
+            maxsize=MAX_PENDING_CHANGES
+        )
+
+    async def get(self, timeout: float) -> list[Change]:
+        """
+        Waits for changes and returns all the pending ones, or an empty list
+        after `timeout` seconds without a change.
+        """
+        try:
+            changes = [await asyncio.wait_for(self._queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+
+        while not self._queue.empty():
+            changes.append(self._queue.get_nowait())
+
+        return changes
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+    def _put(self, change: Change) -> None:
+        if self._queue.full():
+            self.lost = True
+        else:
+            self._queue.put_nowait(change)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+class ChangeBus:
+    """
+    Dispatches the changes received by the backend to the subscribers of the
+    project in this process.
+    """
+
+    def __init__(self, backend: ChangeBackend) -> None:
+        self._backend = backend
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listening = False
+
+        self._origin = uuid.uuid4().hex
+        """
+        ID of the bus sent with the changes it publishes, to tell them apart
+        from the ones published by the other processes.
+        """
+
+    def publish(self, change: Change) -> None:
+        """
+        Publishes the change to the subscribers of every process. Never
+        raises, the change was already committed.
+        """
+        payload = _serialize(change, self._origin)
+
+        if len(payload.encode()) > MAX_PAYLOAD_SIZE:
+            payload = _serialize(
+                Change(
+                    kind=change.kind,
+                    project_id=change.project_id,
+                    task_id=change.task_id,
+                    partial=True,
+                ),
+                self._origin,
+            )
+
+        try:
+            self._backend.publish(payload)
+        except Exception:
+            logger.exception("Failed to publish %s", payload)
+
+    def subscribe(self, project_id: int) -> Subscription:
+        """
+        Returns the subscription to the changes of the project, must be
+        called from the event loop the changes are awaited on.
+        """
+        subscription = Subscription(self, project_id)
+
+        with self._lock:
+            self._subscriptions.setdefault(project_id, set()).add(
+                subscription
+            )
+
+            # the backend is only listened to once there's a subscriber,
+            # e.g. the CLI only publishes
+            if not self._listening:
+                self._backend.listen(self._deliver)
+                self._listening = True
+
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.project_id)
+
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+
+                if not subscriptions:
+                    del self._subscriptions[subscription.project_id]
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            origin = data.pop("origin", None)
+            change = Change.parse_obj(data)
+        except Exception:
+            logger.exception("Received an invalid change %s", payload)
+            return
+
+        # the writes of this process already dropped its caches, the ones of
+        # the other processes didn't, the subscribers would load them again
+        # from the stale caches
+        if origin != self._origin:
+            invalidate_project_snapshot(change.project_id)
+            invalidate_project_task_stats(change.project_id)
+            invalidate_project_schedule(change.project_id)
+
+        with self._lock:
+            subscriptions = list(
+                self._subscriptions.get(change.project_id, ())
+            )
+
+        for subscription in subscriptions:
+            try:
+                subscription._loop.call_soon_threadsafe(
+                    subscription._put, change
+                )
+            except RuntimeError:
+                # the event loop of the subscriber is closed
+                self._unsubscribe(subscription)
+
+
+def _serialize(change: Change, origin: str) -> str:
+    return json.dumps({**change.dict(exclude_unset=True), "origin": origin})
+
+
+_bus: ChangeBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_backend() -> ChangeBackend:
+    """
+    Returns the backend selected by `CHANGE_FEED_BACKEND`.
+    """
+    name = os.getenv("CHANGE_FEED_BACKEND", "local").lower()
+
+    if name == "postgres":
+        return PostgresBackend(db.get_engine())
+
+    if name == "redis":
+        url = get_config().redis_url
+        if url is None:
+            raise ValueError("No redis url configured")
+
+        return RedisBackend(url)
+
+    if name != "local":
+        raise ValueError(f'Unknown change feed backend "{name}"')
+
+    return LocalBackend()
+
+
+def get_bus() -> ChangeBus:
+    """
+    Returns the change bus of the process, created on first use.
+    """
+    global _bus
+
+    with _bus_lock:
+        if _bus is None:
+            _bus = ChangeBus(get_backend())
+
+        return _bus
+
+
+@db.after_commit
+def publish(change: Change) -> None:
+    get_bus().publish(change)
@@ -0,0 +1,79 @@
+"""
+Maintenance commands, run from the root of the app so that `rxconfig.py` is
+found, e.g. `python -m J3ktMan.cli import-tasks 1 backlog.csv`.
+"""
+
+import argparse
+import sys
+
+from J3ktMan.crud import task_export, task_import
+
+
+def import_tasks(args: argparse.Namespace) -> int:
+    with open(args.file, newline="", encoding="utf-8") as file:
+        if args.file.endswith((".jsonl", ".json")):
+            rows = task_import.read_json_lines(file)
+        else:
+            rows = task_import.read_csv(file)
+
+        report = task_import.import_tasks(args.project_id, rows)
+
+    for error in report.errors:
+        print(f"{args.file}:{error.line}: {error.message}", file=sys.stderr)
+
+    print(f"{report.created} tasks created, {len(report.errors)} rows skipped")
+
+    return 1 if report.errors else 0
+
+
+def export_project(args: argparse.Namespace) -> int:
+    if args.format == "csv":
+        chunks = task_export.export_csv(args.project_id)
+    else:
+        chunks = task_export.export_json(args.project_id)
+
+    if args.output is None:
+        sys.stdout.writelines(chunks)
+        return 0
+
+    with open(args.output, "w", newline="", encoding="utf-8") as file:
+        file.writelines(chunks)
+
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m J3ktMan.cli")
+    commands = parser.add_subparsers(required=True)
+
+    import_parser = commands.add_parser(
+        "import-tasks",
+        help="create the tasks of a CSV or JSON Lines file in a project",
+    )
+    import_parser.add_argument("project_id", type=int)
+    import_parser.add_argument("file")
+    import_parser.set_defaults(command=import_tasks)
+
+    export_parser = commands.add_parser(
+        "export-project",
+        help="write a project as JSON, or its tasks as CSV",
+        description="The JSON export is a single document of the whole "
+        "project, keyed by IDs, and can't be imported back. The CSV export "
+        "is the one import-tasks reads.",
+    )
+    export_parser.add_argument("project_id", type=int)
+    export_parser.add_argument(
+        "--format", choices=["json", "csv"], default="json"
+    )
+    export_parser.add_argument(
+        "--output", help="file to write to, the standard output by default"
+    )
+    export_parser.set_defaults(command=export_project)
+
+    args = parser.parse_args()
+
+    return args.command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,11 @@ from reflex_clerk import ClerkState
 from typing import Any
 import reflex as rx
 
+from J3ktMan.crud import aio
 from J3ktMan.crud.project import (
     ExistingProjectNameError,
     ProjectCreate,
     TooShortProjectNameError,
-    create_project,
 )
 from J3ktMan.state.home_state import HomeState
 
@@ -25,7 +25,7 @@ class State(rx.State):
         project_name = str(form["name"])
 
         try:
-            create_project(
+            await aio.create_project(
                 ProjectCreate(user_id=clerk_state.user_id, name=project_name)
             )
 
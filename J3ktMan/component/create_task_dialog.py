@@ -88,7 +88,7 @@ class TaskFormState(rx.State):
 
         assert status_id is not None, "Status ID not found"
 
-        created_task = state.create_task(
+        created_task = await state.create_task(
             name,
             description,
             priority,
@@ -1,4 +1,4 @@
-from J3ktMan.crud.project import get_invitation_code
+from J3ktMan.crud import aio
 
 from reflex_clerk import ClerkState
 import reflex as rx
@@ -26,7 +26,7 @@ class InviteMemberDialog(rx.ComponentState):
 
         # let's do for 10 minutes and no redeem limit. we can add options to
         # change this later
-        code = get_invitation_code(
+        code = await aio.get_invitation_code(
             clerk_state.user_id,
             project_id,
             600,
@@ -1,4 +1,4 @@
-from J3ktMan.state.project import State as ProjectState, Data
+from J3ktMan.state.project import State as ProjectState, Task
 from J3ktMan.utils import date_to_epoch, epoch_to_date
 from reflex.event import EventSpec
 import reflex as rx
@@ -6,6 +6,7 @@ import reflex as rx
 
 class State(rx.State):
     _editing_task_id: int | None = None
+    _editing_task: Task | None = None
     _editing_task_name: str | None = None
     _editing_task_description: str | None = None
     _editing_task_start_date: int | None = None
@@ -15,30 +16,75 @@ class State(rx.State):
     def editing_task_id(self) -> int | None:
         return self._editing_task_id
 
+    @rx.var(cache=True)
+    def editing_task(self) -> Task | None:
+        """
+        The task being edited, the tasks of the project stay on the backend.
+        Copied by the events of the dialog that open or change it.
+        """
+        return self._editing_task
+
+    async def _load_editing_task(self) -> None:
+        """
+        Copies the task being edited from the project state.
+        """
+        if self._editing_task_id is None:
+            self._editing_task = None
+            return
+
+        project_state = await self.get_state(ProjectState)
+        task = project_state._get_task(self._editing_task_id)
+
+        if task is None:
+            self._editing_task = None
+            return
+
+        self._editing_task = Task(
+            id=task.id,  # type: ignore
+            name=task.name,
+            description=task.description,
+            status_id=task.status_id,
+            milestone_id=task.milestone_id,
+            start_date=task.start_date,
+            end_date=task.end_date,
+            version=task.version,
+        )
+
     @rx.event
-    def set_editing_task_id(self, task_id: int, open: bool):
+    async def set_editing_task_id(self, task_id: int, open: bool):
         if open:
             self.reset()
             self._editing_task_id = task_id
         else:
             self._editing_task_id = None
 
+        await self._load_editing_task()
+
+    @rx.event
+    def set_editing_task_open(self, open: bool):
+        if not open:
+            self._editing_task_id = None
+            self._editing_task = None
+
     @rx.event
     async def set_editing_date_task_id(self, task_id: int, open: bool):
         if not open:
             return
 
         project_state = await self.get_state(ProjectState)
-        if project_state.data is None:
+        if project_state.project_id is None:
             return
 
-        task = project_state.data.tasks_by_id[task_id]
+        task = project_state._get_task(task_id)
+        assert task is not None
+
         self._editing_task_start_date = task.start_date
         self._editing_task_end_date = task.end_date
 
     @rx.event
     def reset_state(self):
         self._editing_task_id = None
+        self._editing_task = None
         self._editing_task_name = None
         self._editing_task_description = None
         self._editing_task_start_date = None
@@ -96,7 +142,10 @@ class State(rx.State):
         self._editing_task_name = None
 
         state = await self.get_state(ProjectState)
-        return state.rename_task(self._editing_task_id, new_task_name)
+        events = await state.rename_task(self._editing_task_id, new_task_name)
+
+        await self._load_editing_task()
+        return events
 
     @rx.event
     async def confirm_editing_task_description(self) -> list[EventSpec] | None:
@@ -110,10 +159,13 @@ class State(rx.State):
         self._editing_task_description = None
 
         state = await self.get_state(ProjectState)
-        return state.set_task_description(
+        events = await state.set_task_description(
             self._editing_task_id, new_task_description
         )
 
+        await self._load_editing_task()
+        return events
+
     @rx.event
     async def confirm_editing_task_dates(self) -> list[EventSpec] | None:
         if self._editing_task_id is None:
@@ -125,10 +177,23 @@ class State(rx.State):
         self._editing_task_end_date = None
 
         state = await self.get_state(ProjectState)
-        return state.change_task_dates(
+        events = await state.change_task_dates(
             self._editing_task_id, start_date, end_date
         )
 
+        await self._load_editing_task()
+        return events
+
+    @rx.event
+    async def assign_milestone(
+        self, task_id: int, milestone_id: int | None
+    ) -> list[EventSpec] | None:
+        state = await self.get_state(ProjectState)
+        events = await state.assign_milestone(task_id, milestone_id)
+
+        await self._load_editing_task()
+        return events
+
     @rx.event
     async def delete_task(self) -> list[EventSpec] | None:
         if self._editing_task_id is None:
@@ -136,9 +201,10 @@ class State(rx.State):
 
         task_id = self._editing_task_id
         self._editing_task_id = None
+        self._editing_task = None
 
         state = await self.get_state(ProjectState)
-        return state.delete_task(task_id)
+        return await state.delete_task(task_id)
 
 
 def _make_handler(base, additional):
@@ -261,8 +327,6 @@ def task_dialog_content(
     on_task_delete=None,
     on_task_date_edit=None,
 ) -> rx.Component:
-    data: Data = ProjectState.data  # type: ignore
-
     return rx.dialog.content(
         rx.vstack(
             rx.hstack(
@@ -300,11 +364,11 @@ def task_dialog_content(
                         ),
                     ),
                     rx.heading(
-                        data.tasks_by_id[task_id].name,
+                        State.editing_task.name,
                         size="4",
                         width="100%",
                         on_click=State.update_task_editing_name(
-                            data.tasks_by_id[task_id].name
+                            State.editing_task.name
                         ),
                     ),
                 ),
@@ -313,9 +377,9 @@ def task_dialog_content(
                         rx.button(
                             rx.fragment(
                                 rx.cond(
-                                    data.tasks_by_id[task_id].milestone_id,
-                                    data.milestones_by_id[  # type: ignore
-                                        data.tasks_by_id[task_id].milestone_id
+                                    State.editing_task.milestone_id,
+                                    ProjectState.milestones_by_id[  # type: ignore
+                                        State.editing_task.milestone_id
                                     ].name,
                                     "No Milestone",
                                 ),
@@ -323,7 +387,7 @@ def task_dialog_content(
                             ),
                             variant="soft",
                             color_scheme=rx.cond(
-                                data.tasks_by_id[task_id].milestone_id,
+                                State.editing_task.milestone_id,
                                 "indigo",
                                 "gray",
                             ),
@@ -338,7 +402,7 @@ def task_dialog_content(
                                 milestone.name,
                                 cursor="pointer",
                                 on_click=_make_handler(  # type: ignore
-                                    ProjectState.assign_milestone(
+                                    State.assign_milestone(
                                         task_id,
                                         milestone.id,
                                     ),
@@ -351,7 +415,7 @@ def task_dialog_content(
                             "None",
                             color_scheme="gray",
                             on_click=_make_handler(  # type: ignore
-                                ProjectState.assign_milestone(
+                                State.assign_milestone(
                                     task_id,
                                     None,
                                 ),
@@ -394,7 +458,7 @@ def task_dialog_content(
                                 ),
                                 rx.vstack(
                                     rx.heading(
-                                        f'Delete Task "{data.tasks_by_id[task_id].name}"',
+                                        f'Delete Task "{State.editing_task.name}"',
                                         size="4",
                                     ),
                                     rx.text(
@@ -470,9 +534,9 @@ def task_dialog_content(
                 ),
                 rx.box(
                     rx.cond(
-                        data.tasks_by_id[task_id].description.length() > 0,  # type: ignore
+                        State.editing_task.description.length() > 0,
                         rx.text(
-                            data.tasks_by_id[task_id].description,
+                            State.editing_task.description,
                             width="100%",
                             cursor="text",
                             class_name="hover:underline hover:italic",
@@ -487,7 +551,7 @@ def task_dialog_content(
                         ),
                     ),
                     on_click=State.update_task_editing_description(
-                        data.tasks_by_id[task_id].description
+                        State.editing_task.description
                     ),
                 ),
             ),
@@ -516,3 +580,31 @@ def task_dialog(
         open=State.editing_task_id == task_id,
         on_open_change=lambda e: State.set_editing_task_id(task_id, e),
     )
+
+
+def shared_task_dialog(
+    on_task_name_edit=None,
+    on_task_description_edit=None,
+    on_assign_milestone=None,
+    on_delete_task=None,
+) -> rx.Component:
+    """
+    A single dialog for the task being edited, opened with
+    `State.set_editing_task_id(task_id, True)`. Pages listing many tasks use
+    it instead of mounting a `task_dialog` per task, the content is only
+    built once a task is opened.
+    """
+    return rx.dialog.root(
+        rx.cond(
+            State.editing_task_id,
+            task_dialog_content(
+                State.editing_task_id,  # type: ignore
+                on_task_name_edit=on_task_name_edit,
+                on_task_description_edit=on_task_description_edit,
+                on_assign_milestone=on_assign_milestone,
+                on_task_delete=on_delete_task,
+            ),
+        ),
+        open=State.editing_task_id.bool(),  # type: ignore
+        on_open_change=State.set_editing_task_open,
+    )
@@ -18,7 +18,7 @@ class DropdownState(rx.State):
         Delete the task with the given ID.
         """
         state = await self.get_state(ProjectState)
-        return state.delete_task(task_id)
+        return await state.delete_task(task_id)
 
     @rx.event
     async def edit(self, form_data: Dict[str, Any]) -> None:
@@ -0,0 +1,112 @@
+"""
+Awaitable variants of the CRUD functions, meant to be used from `async`
+Reflex event handlers and computed vars.
+
+Every function has the same signature as its synchronous counterpart, the
+call is offloaded to a bounded thread pool so a slow query never blocks the
+event loop that serves the other websockets of the worker.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+import asyncio
+import contextvars
+import functools
+import sys
+
+from .. import profiler
+from . import project, schedule, snapshot, stats, task_import, tasks
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+MAX_WORKERS = 8
+"""
+Maximum number of CRUD calls running at the same time, further calls wait in
+the queue of the thread pool.
+"""
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="crud"
+)
+
+
+def offload(fn: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """
+    Wraps the synchronous function so that it runs on the CRUD thread pool.
+    The caller's context variables are visible to the function.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        context = contextvars.copy_context()
+        call = functools.partial(fn, *args, **kwargs)
+
+        if profiler.is_enabled():
+            # the event handler or computed var awaiting the call
+            caller = sys._getframe(1).f_code.co_qualname
+            call = profiler.profile(call, caller, fn.__name__)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            _executor, context.run, call
+        )
+
+    return wrapper
+
+
+# project
+create_project = offload(project.create_project)
+get_project = offload(project.get_project)
+get_projects = offload(project.get_projects)
+get_project_members = offload(project.get_project_members)
+get_membership = offload(project.get_membership)
+is_in_project = offload(project.is_in_project)
+reedem_invitation_code = offload(project.reedem_invitation_code)
+get_project_from_invitation_code = offload(
+    project.get_project_from_invitation_code
+)
+get_invitation_code = offload(project.get_invitation_code)
+
+# schedule
+get_task_timings = offload(schedule.get_task_timings)
+get_critical_task_ids = offload(schedule.get_critical_task_ids)
+get_critical_path = offload(schedule.get_critical_path)
+
+# snapshot
+get_project_snapshot = offload(snapshot.get_project_snapshot)
+
+# stats
+get_project_task_stats = offload(stats.get_project_task_stats)
+
+# task import
+import_tasks = offload(task_import.import_tasks)
+
+# tasks
+create_milestone = offload(tasks.create_milestone)
+get_milestone_by_task_id = offload(tasks.get_milestone_by_task_id)
+set_task_description = offload(tasks.set_task_description)
+rename_status = offload(tasks.rename_status)
+rename_task = offload(tasks.rename_task)
+get_milestones_by_project_id = offload(tasks.get_milestones_by_project_id)
+get_milestone_by_id = offload(tasks.get_milestone_by_id)
+assign_milestone = offload(tasks.assign_milestone)
+delete_milestone = offload(tasks.delete_milestone)
+create_task = offload(tasks.create_task)
+update_task_dates = offload(tasks.update_task_dates)
+get_task_by_id = offload(tasks.get_task_by_id)
+delete_task = offload(tasks.delete_task)
+get_tasks_by_milestone_id = offload(tasks.get_tasks_by_milestone_id)
+assign_task = offload(tasks.assign_task)
+get_assigned_tasks_by_user_id = offload(tasks.get_assigned_tasks_by_user_id)
+get_assignees_by_task_id = offload(tasks.get_assignees_by_task_id)
+unassign_task = offload(tasks.unassign_task)
+create_task_dependency = offload(tasks.create_task_dependency)
+remove_task_dependency = offload(tasks.remove_task_dependency)
+get_dependency_graph = offload(tasks.get_dependency_graph)
+create_status = offload(tasks.create_status)
+get_statuses_by_project_id = offload(tasks.get_statuses_by_project_id)
+get_tasks_by_status_id = offload(tasks.get_tasks_by_status_id)
+set_status = offload(tasks.set_status)
+apply_task_changes = offload(tasks.apply_task_changes)
+delete_status = offload(tasks.delete_status)
@@ -1,5 +1,8 @@
 from sqlalchemy import delete
 from sqlmodel import Session
+import sqlmodel as sql
+from J3ktMan import db
+from J3ktMan.cache import TTLCache
 from J3ktMan.model.project import InvitationCode, Project, ProjectMember, Role
 
 from dataclasses import dataclass
@@ -11,6 +14,17 @@ import datetime
 import random
 import string
 
+MEMBERSHIP_CACHE_TTL = 30
+"""
+Number of seconds the membership of a user in a project is served from
+memory.
+"""
+
+MEMBERSHIP_CACHE_SIZE = 4096
+"""
+Maximum number of (user, project) memberships kept in memory.
+"""
+
 
 class ProjectCreate(rx.Base):
     user_id: str
@@ -50,7 +64,7 @@ def create_project(info: ProjectCreate) -> Project:
     if len(info.name) < 4:
         raise TooShortProjectNameError()
 
-    with rx.session() as session:
+    with db.session() as session:
         current_time = int(datetime.datetime.now().timestamp())
 
         # check if there's a project with the same name for this user
@@ -85,11 +99,13 @@ def create_project(info: ProjectCreate) -> Project:
         session.add(project_member)
         session.commit()
 
+        invalidate_membership(info.user_id, project.id)  # type: ignore
+
         return project
 
 
 def get_project(project_id: int) -> Project:
-    with rx.session() as session:
+    with db.session() as session:
         project = session.exec(
             Project.select().where(Project.id == project_id)
         ).first()
@@ -103,12 +119,21 @@ def get_project(project_id: int) -> Project:
 def get_projects(user_id: str) -> Sequence[Project]:
     """Returns all the projects that the user is a member of."""
 
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Project.select().join(ProjectMember).where(ProjectMember.user_id == user_id)
         ).all()
 
 
+def get_project_members(project_id: int) -> Sequence[ProjectMember]:
+    """Returns all the members of the project."""
+
+    with db.session() as session:
+        return session.exec(
+            ProjectMember.select().where(ProjectMember.project_id == project_id)
+        ).all()
+
+
 @dataclass
 class UnauthorizedError(Exception):
     """
@@ -118,21 +143,59 @@ class UnauthorizedError(Exception):
     role: Role
 
 
-def is_in_project(user_id: str, project_id: int) -> bool:
-    with rx.session() as session:
-        project = session.exec(Project.select().where(Project.id == project_id)).first()
+class Membership(rx.Base):
+    project: Project
+    role: Role
 
-        if project is None:
+
+_membership_cache: TTLCache[tuple[str, int], Membership | None] = TTLCache(
+    maxsize=MEMBERSHIP_CACHE_SIZE, ttl=MEMBERSHIP_CACHE_TTL
+)
+
+
+def get_membership(user_id: str, project_id: int) -> Membership | None:
+    """
+    Returns the project and the role of the user in it, or None if the user
+    isn't a member of the project. Both are read with a single query and
+    cached for `MEMBERSHIP_CACHE_TTL` seconds.
+    """
+
+    def load() -> Membership | None:
+        with db.session() as session:
+            row = session.exec(
+                sql.select(Project, ProjectMember.role)
+                .outerjoin(
+                    ProjectMember,
+                    (ProjectMember.project_id == Project.id)  # type: ignore
+                    & (ProjectMember.user_id == user_id),
+                )
+                .where(Project.id == project_id)
+            ).first()
+
+        # not cached, the project may be created right after
+        if row is None:
             raise InvalidProjectIDError()
 
-        member = session.exec(
-            ProjectMember.select().where(
-                (ProjectMember.project_id == project_id)
-                & (ProjectMember.user_id == user_id)
-            )
-        ).first()
+        project, role = row
+        if role is None:
+            return None
+
+        return Membership(project=project, role=Role(role))
 
-        return member is not None
+    return _membership_cache.get_or_load((user_id, project_id), load)
+
+
+@db.after_commit
+def invalidate_membership(user_id: str, project_id: int) -> None:
+    """
+    Drops the cached membership of the user in the project. Must be called
+    after every write that adds or removes the member.
+    """
+    _membership_cache.invalidate((user_id, project_id))
+
+
+def is_in_project(user_id: str, project_id: int) -> bool:
+    return get_membership(user_id, project_id) is not None
 
 
 def remove_expired_invitation_codes(session: Session, current_epoch: int):
@@ -152,7 +215,7 @@ def reedem_invitation_code(invitation_code: str, user_id: str) -> bool:
     invitation code is associated with. Returns None if the code is expired or
     invalid.
     """
-    with rx.session() as session:
+    with db.session() as session:
         current_epoch = int(datetime.datetime.now().timestamp())
 
         # use this opportunity to clean up expired invitation codes
@@ -207,6 +270,8 @@ def reedem_invitation_code(invitation_code: str, user_id: str) -> bool:
 
         session.commit()
 
+        invalidate_membership(user_id, project.id)  # type: ignore
+
         return True
 
 
@@ -217,7 +282,7 @@ def get_project_from_invitation_code(
     Gets the Project that the invitation code is associated with. Returns None
     if the code is expired or invalid.
     """
-    with rx.session() as session:
+    with db.session() as session:
         current_epoch = int(datetime.datetime.now().timestamp())
 
         invitation = session.exec(
@@ -246,7 +311,7 @@ def get_invitation_code(
     assert duration > 0
     assert redeem_limit is None or redeem_limit > 0
 
-    with rx.session() as session:
+    with db.session() as session:
         current_epoch = int(datetime.datetime.now().timestamp())
 
         # use this opportunity to clean up expired invitation codes
@@ -0,0 +1,270 @@
+from sqlmodel import Session
+import sqlmodel as sql
+
+from dataclasses import dataclass
+import threading
+
+from .. import db
+from ..cache import MISSING, TTLCache
+from ..dependency_graph import CycleError, DependencyGraph
+from ..model.tasks import Status, Task, TaskDependency
+from ..schedule import ProjectSchedule, TaskDates, TaskTiming
+
+SCHEDULE_CACHE_TTL = 300
+"""
+Number of seconds a project's schedule is served from memory.
+"""
+
+SCHEDULE_CACHE_SIZE = 256
+"""
+Maximum number of projects whose schedule is kept in memory.
+"""
+
+
+@dataclass
+class _CachedSchedule:
+    schedule: ProjectSchedule
+
+    last_dependency_id: int
+    """
+    ID of the last dependency included in the schedule's graph. The
+    dependencies of a project are created one at a time, with the project
+    locked, so the ones created since by other processes are exactly those
+    with a greater ID.
+    """
+
+
+_schedule_cache: TTLCache[int, _CachedSchedule] = TTLCache(
+    maxsize=SCHEDULE_CACHE_SIZE, ttl=SCHEDULE_CACHE_TTL
+)
+
+_schedule_lock = threading.Lock()
+"""
+Guards the cached schedules, which are updated in place.
+"""
+
+
+def get_task_timings(project_id: int) -> dict[int, TaskTiming]:
+    """
+    Returns the earliest/latest start and finish of every task of the given
+    project ID, keyed by task ID.
+    """
+    schedule = _get_project_schedule(project_id).schedule
+
+    with _schedule_lock:
+        return schedule.timings()
+
+
+def get_critical_task_ids(project_id: int) -> set[int]:
+    """
+    Returns the IDs of the tasks of the given project ID that can't be
+    delayed without delaying the whole project.
+    """
+    schedule = _get_project_schedule(project_id).schedule
+
+    with _schedule_lock:
+        return schedule.critical_tasks()
+
+
+def get_critical_path(project_id: int) -> list[int]:
+    """
+    Returns the IDs of one chain of critical tasks of the given project ID,
+    in the order they have to be done.
+    """
+    schedule = _get_project_schedule(project_id).schedule
+
+    with _schedule_lock:
+        return schedule.critical_path()
+
+
+@db.after_commit
+def schedule_task_dates_changed(
+    project_id: int,
+    task_id: int,
+    start_date: int | None,
+    end_date: int | None,
+) -> None:
+    """
+    Reschedules the cached schedule of the project after the dates of the
+    task changed or the task was created.
+    """
+    cached = _schedule_cache.get(project_id)
+    if cached is MISSING:
+        # discards a schedule being loaded from before the change
+        _schedule_cache.invalidate(project_id)
+        return
+
+    with _schedule_lock:
+        cached.schedule.set_task_dates(  # type: ignore
+            task_id, start_date, end_date
+        )
+
+
+def check_dependency(
+    session: Session,
+    project_id: int,
+    dependency_task_id: int,
+    dependant_task_id: int,
+) -> None:
+    """
+    Throws `CycleError` if the dependency would close a cycle in the
+    project's graph. The session must have locked the project, so that no
+    dependency can be created until this one is committed.
+
+    The check runs on the graph of the cached schedule, only the
+    dependencies created since by other processes are loaded. A cycle may
+    go through dependencies removed by them, it is checked again on a graph
+    loaded from the database.
+    """
+    cached = _get_project_schedule(project_id)
+
+    edges = session.exec(
+        sql.select(
+            TaskDependency.id,
+            TaskDependency.dependency_id,
+            TaskDependency.dependant_id,
+        )
+        .join(Task, Task.id == TaskDependency.dependant_id)  # type: ignore
+        .join(Status)
+        .where(Status.project_id == project_id)
+        .where(sql.col(TaskDependency.id) > cached.last_dependency_id)
+        .order_by(TaskDependency.id)  # type: ignore
+    ).all()
+
+    with _schedule_lock:
+        try:
+            for dependency_id, dependency, dependant in edges:
+                assert dependency_id is not None
+
+                cached.schedule.add_dependency(dependency, dependant)
+                cached.last_dependency_id = dependency_id
+
+            if not _closes_cycle(
+                cached.schedule.graph, dependency_task_id, dependant_task_id
+            ):
+                return
+
+        except CycleError:
+            pass
+
+    _schedule_cache.invalidate(project_id)
+    cached = _get_project_schedule(project_id)
+
+    with _schedule_lock:
+        if _closes_cycle(
+            cached.schedule.graph, dependency_task_id, dependant_task_id
+        ):
+            raise CycleError()
+
+
+def _closes_cycle(
+    graph: DependencyGraph, dependency_task_id: int, dependant_task_id: int
+) -> bool:
+    return dependency_task_id == dependant_task_id or graph.depends_on(
+        dependency_task_id, dependant_task_id
+    )
+
+
+@db.after_commit
+def schedule_dependency_added(
+    project_id: int,
+    dependency_id: int,
+    dependency_task_id: int,
+    dependant_task_id: int,
+) -> None:
+    """
+    Adds the dependency, whose ID is `dependency_id`, to the cached graph of
+    the project and reschedules the tasks affected by it.
+    """
+    cached = _schedule_cache.get(project_id)
+    if cached is MISSING:
+        _schedule_cache.invalidate(project_id)
+        return
+
+    with _schedule_lock:
+        try:
+            cached.schedule.add_dependency(  # type: ignore
+                dependency_task_id, dependant_task_id
+            )
+        except CycleError:
+            # the cached graph is out of sync with the database
+            _schedule_cache.invalidate(project_id)
+            return
+
+        cached.last_dependency_id = max(  # type: ignore
+            cached.last_dependency_id, dependency_id  # type: ignore
+        )
+
+
+@db.after_commit
+def schedule_dependency_removed(
+    project_id: int, dependency_task_id: int, dependant_task_id: int
+) -> None:
+    """
+    Removes the dependency from the cached graph of the project and
+    reschedules the tasks affected by it.
+    """
+    cached = _schedule_cache.get(project_id)
+    if cached is MISSING:
+        _schedule_cache.invalidate(project_id)
+        return
+
+    with _schedule_lock:
+        cached.schedule.remove_dependency(  # type: ignore
+            dependency_task_id, dependant_task_id
+        )
+
+
+@db.after_commit
+def invalidate_project_schedule(project_id: int) -> None:
+    """
+    Drops the cached schedule of the given project ID. Must be called after
+    every write that removes tasks or dependencies from the project.
+    """
+    _schedule_cache.invalidate(project_id)
+
+
+def _get_project_schedule(project_id: int) -> _CachedSchedule:
+    return _schedule_cache.get_or_load(
+        project_id, lambda: _query_project_schedule(project_id)
+    )
+
+
+def _query_project_schedule(project_id: int) -> _CachedSchedule:
+    """
+    Loads the dates and the dependencies of the project's tasks, the rest of
+    the tasks' columns are never loaded.
+    """
+    with db.session() as session:
+        rows = session.exec(
+            sql.select(Task.id, Task.start_date, Task.end_date)
+            .join(Status)
+            .where(Status.project_id == project_id)
+        ).all()
+
+        edges = session.exec(
+            sql.select(
+                TaskDependency.id,
+                TaskDependency.dependency_id,
+                TaskDependency.dependant_id,
+            )
+            .join(Task, Task.id == TaskDependency.dependant_id)  # type: ignore
+            .join(Status)
+            .where(Status.project_id == project_id)
+        ).all()
+
+    dates = {
+        task_id: TaskDates(start_date, end_date)
+        for task_id, start_date, end_date in rows
+    }
+
+    graph = DependencyGraph.from_edges(
+        ((dependency, dependant) for _, dependency, dependant in edges), dates
+    )
+
+    return _CachedSchedule(
+        schedule=ProjectSchedule(graph, dates),
+        last_dependency_id=max(
+            (dependency_id or 0 for dependency_id, _, _ in edges), default=0
+        ),
+    )
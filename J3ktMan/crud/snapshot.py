@@ -0,0 +1,199 @@
+"""
+Process-wide cache of the project snapshots loaded by the project pages.
+
+Every session viewing a project used to load its own copy of the whole
+project, the snapshots are now shared by all the sessions of the worker and
+only loaded again after a write. Each project has a version, bumped by every
+write to its milestones, statuses or tasks, so a snapshot loaded concurrently
+with a write is never cached.
+
+The snapshots are cached by project and version: a write makes the next
+sessions load a new snapshot, while the sessions loaded from an older one
+keep reading it from the cache with `get_project_snapshot_at`, the states
+only keep its version.
+
+The cached snapshots are shared, they must never be mutated: the states read
+the tasks and their indexes from the snapshot and only copy the ones they
+change.
+"""
+
+import reflex as rx
+
+from .project import InvalidProjectIDError
+from .. import db
+from ..cache import MISSING, TTLCache
+from ..model.project import Project
+from ..model.tasks import Milestone, Status, Task
+
+import threading
+
+SNAPSHOT_CACHE_TTL = 300
+"""
+Number of seconds a project's snapshot is served from memory. Bounds the
+staleness of the snapshots after writes made by other worker processes.
+"""
+
+SNAPSHOT_CACHE_ROWS = 200_000
+"""
+Maximum number of milestones, statuses and tasks, summed over all the
+projects, kept in memory. The least recently used snapshots are evicted
+first.
+"""
+
+
+class ProjectSnapshot(rx.Base):
+    project: Project
+    milestones: list[Milestone]
+    statuses: list[Status]
+    tasks_by_id: dict[int, Task]
+
+    task_ids_by_status_id: dict[int, dict[int, None]]
+    """
+    IDs of the tasks in each status, in display order, kept as ordered sets.
+    """
+
+    task_ids_by_milestone_id: dict[int, dict[int, None]]
+    """
+    IDs of the tasks in each milestone, in display order, kept as ordered
+    sets.
+    """
+
+    version: int = 0
+    """
+    Version of the project the snapshot was loaded at.
+    """
+
+    @property
+    def rows(self) -> int:
+        return (
+            1
+            + len(self.milestones)
+            + len(self.statuses)
+            + len(self.tasks_by_id)
+        )
+
+
+_snapshot_cache: TTLCache[tuple[int, int], ProjectSnapshot] = TTLCache(
+    maxsize=SNAPSHOT_CACHE_ROWS,
+    ttl=SNAPSHOT_CACHE_TTL,
+    weigher=lambda snapshot: snapshot.rows,
+)
+
+_versions: dict[int, int] = {}
+_versions_lock = threading.Lock()
+"""
+Guards the versions, so that a snapshot is only cached if the version it was
+loaded at is still the current one.
+"""
+
+
+def get_project_version(project_id: int) -> int:
+    """
+    Returns the current version of the project in this process.
+    """
+    with _versions_lock:
+        return _versions.get(project_id, 0)
+
+
+def get_project_snapshot(project_id: int) -> ProjectSnapshot:
+    """
+    Returns the project together with all of its milestones, statuses and
+    tasks. The snapshot is shared with the other sessions and must not be
+    mutated.
+    """
+    version = get_project_version(project_id)
+
+    snapshot = _snapshot_cache.get((project_id, version))
+    if snapshot is not MISSING:
+        return snapshot  # type: ignore
+
+    snapshot = _load_project_snapshot(project_id, version)
+
+    with _versions_lock:
+        if _versions.get(project_id, 0) == version:
+            _snapshot_cache.set((project_id, version), snapshot)
+
+    return snapshot
+
+
+def get_project_snapshot_at(project_id: int, version: int) -> ProjectSnapshot:
+    """
+    Returns the snapshot of the project at the given version, the one a
+    session was loaded from, or the current snapshot once that version is no
+    longer cached.
+    """
+    snapshot = _snapshot_cache.get((project_id, version))
+    if snapshot is not MISSING:
+        return snapshot  # type: ignore
+
+    return get_project_snapshot(project_id)
+
+
+@db.after_commit
+def invalidate_project_snapshot(project_id: int) -> None:
+    """
+    Bumps the version of the project, so that its next snapshot is loaded
+    again. The older snapshots stay cached for the sessions loaded from them.
+    Must be called after every write to the project's milestones, statuses
+    or tasks.
+    """
+    with _versions_lock:
+        _versions[project_id] = _versions.get(project_id, 0) + 1
+
+
+def _load_project_snapshot(project_id: int, version: int) -> ProjectSnapshot:
+    """
+    Loads the whole graph in one session with a fixed number of queries,
+    regardless of how many statuses the project has.
+    """
+    with db.session() as session:
+        project = session.exec(
+            Project.select().where(Project.id == project_id)
+        ).first()
+
+        if project is None:
+            raise InvalidProjectIDError()
+
+        milestones = session.exec(
+            Milestone.select()
+            .where(Milestone.project_id == project_id)
+            .order_by(Milestone.id)  # type: ignore
+        ).all()
+
+        statuses = session.exec(
+            Status.select()
+            .where(Status.project_id == project_id)
+            .order_by(Status.id)  # type: ignore
+        ).all()
+
+        tasks = session.exec(
+            Task.select()
+            .join(Status)
+            .where(Status.project_id == project_id)
+            .order_by(Task.id)  # type: ignore
+        ).all()
+
+        task_ids_by_status_id: dict[int, dict[int, None]] = {
+            status.id: {} for status in statuses  # type: ignore
+        }
+        task_ids_by_milestone_id: dict[int, dict[int, None]] = {
+            milestone.id: {} for milestone in milestones  # type: ignore
+        }
+
+        for task in tasks:
+            assert task.id is not None
+
+            task_ids_by_status_id[task.status_id][task.id] = None
+
+            if task.milestone_id is not None:
+                task_ids_by_milestone_id[task.milestone_id][task.id] = None
+
+        return ProjectSnapshot(
+            project=project,
+            milestones=list(milestones),
+            statuses=list(statuses),
+            tasks_by_id={task.id: task for task in tasks},
+            task_ids_by_status_id=task_ids_by_status_id,
+            task_ids_by_milestone_id=task_ids_by_milestone_id,
+            version=version,
+        )
@@ -0,0 +1,139 @@
+import reflex as rx
+import sqlmodel as sql
+
+from sqlalchemy import func
+
+from .. import db
+from ..cache import TTLCache
+from ..model.tasks import Priority, Status, Task
+
+COMPLETED_STATUS_NAMES = ["completed"]
+PENDING_STATUS_NAMES = ["in progress", "pending", "to do"]
+
+STATS_CACHE_TTL = 60
+"""
+Number of seconds a project's task stats are served from memory.
+"""
+
+STATS_CACHE_SIZE = 512
+"""
+Maximum number of projects whose task stats are kept in memory.
+"""
+
+
+class StatusTaskCount(rx.Base):
+    status_id: int
+    name: str
+    count: int
+
+
+class ProjectTaskStats(rx.Base):
+    statuses: list[StatusTaskCount]
+    """
+    Number of tasks in each status of the project, ordered by status ID.
+    """
+
+    priority_counts: dict[str, int]
+    """
+    Number of tasks for each priority, keyed by the priority name.
+    """
+
+    @property
+    def total(self) -> int:
+        return sum(status.count for status in self.statuses)
+
+    @property
+    def completed(self) -> int:
+        return self.count_in_statuses(COMPLETED_STATUS_NAMES)
+
+    @property
+    def pending(self) -> int:
+        return self.count_in_statuses(PENDING_STATUS_NAMES)
+
+    @property
+    def completion_ratio(self) -> float:
+        """
+        Ratio of completed tasks to all tasks, 0 for a project without tasks.
+        """
+        total = self.total
+        return self.completed / total if total > 0 else 0.0
+
+    def count_in_statuses(self, names: list[str]) -> int:
+        """
+        Returns the number of tasks whose status name (case-insensitive) is
+        one of the given names.
+        """
+        lowered = {name.lower() for name in names}
+
+        return sum(
+            status.count
+            for status in self.statuses
+            if status.name.lower() in lowered
+        )
+
+
+_stats_cache: TTLCache[int, ProjectTaskStats] = TTLCache(
+    maxsize=STATS_CACHE_SIZE, ttl=STATS_CACHE_TTL
+)
+
+
+def get_project_task_stats(project_id: int) -> ProjectTaskStats:
+    """
+    Returns the task counts of the given project ID grouped by status and
+    priority. The result is shared by every session of the process until the
+    project's tasks change or the entry expires.
+
+    The returned object is shared, it must not be mutated.
+    """
+    return _stats_cache.get_or_load(
+        project_id, lambda: _query_project_task_stats(project_id)
+    )
+
+
+@db.after_commit
+def invalidate_project_task_stats(project_id: int) -> None:
+    """
+    Drops the cached task stats of the given project ID. Must be called
+    after every write that changes the project's statuses or tasks.
+    """
+    _stats_cache.invalidate(project_id)
+
+
+def _query_project_task_stats(project_id: int) -> ProjectTaskStats:
+    """
+    Counts the tasks of the project in a single aggregate query, the tasks
+    themselves are never loaded.
+    """
+    with db.session() as session:
+        rows = session.exec(
+            sql.select(
+                Status.id,
+                Status.name,
+                Task.priority,
+                func.count(Task.id),  # type: ignore
+            )
+            .select_from(Status)
+            .outerjoin(Task, Task.status_id == Status.id)  # type: ignore
+            .where(Status.project_id == project_id)
+            .group_by(Status.id, Status.name, Task.priority)  # type: ignore
+            .order_by(Status.id)  # type: ignore
+        ).all()
+
+    statuses: dict[int, StatusTaskCount] = {}
+    priority_counts = {priority.value: 0 for priority in Priority}
+
+    for status_id, name, priority, count in rows:
+        status = statuses.setdefault(
+            status_id,
+            StatusTaskCount(status_id=status_id, name=name, count=0),
+        )
+        status.count += count
+
+        # statuses without any task are still reported with a NULL priority
+        if priority is not None:
+            priority_counts[Priority(priority).value] += count
+
+    return ProjectTaskStats(
+        statuses=list(statuses.values()),
+        priority_counts=priority_counts,
+    )
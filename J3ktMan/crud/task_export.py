@@ -0,0 +1,199 @@
+"""
+Streaming export of a project, as JSON or as a CSV of its tasks.
+
+The rows are fetched from server-side cursors and written as they arrive, the
+writers are generators of text chunks so that the memory used doesn't depend
+on the size of the project and the first bytes are available right away.
+
+Only the CSV export can be imported back with `task_import`: the JSON export
+is a single document of the whole project, with its assignments and
+dependencies keyed by IDs, while the import reads JSON Lines of tasks
+referring to their status and milestone by name.
+"""
+
+import sqlalchemy
+import sqlmodel as sql
+
+from .project import InvalidProjectIDError
+from .. import db
+from ..model.project import Project
+from ..model.tasks import (
+    Milestone,
+    Status,
+    Task,
+    TaskAssignment,
+    TaskDependency,
+)
+from ..utils import epoch_to_date
+
+import csv
+import io
+import json
+from typing import Any, Iterator
+
+EXPORT_BATCH_SIZE = 1000
+"""
+Number of rows fetched from the database, and written, at a time.
+"""
+
+CSV_COLUMNS = [
+    "name",
+    "description",
+    "status",
+    "milestone",
+    "priority",
+    "start_date",
+    "end_date",
+]
+"""
+Columns of the CSV export, the same as the ones read by `task_import`.
+"""
+
+
+def export_json(project_id: int) -> Iterator[str]:
+    """
+    Yields the JSON document of the project, its statuses, milestones, tasks,
+    task assignments and task dependencies.
+    """
+    with db.new_session() as session:
+        project = session.exec(
+            Project.select().where(Project.id == project_id)
+        ).first()
+
+        if project is None:
+            raise InvalidProjectIDError()
+
+        yield '{"project": ' + json.dumps(project.dict())
+
+        sections: list[tuple[str, Any]] = [
+            (
+                "statuses",
+                Status.select()
+                .where(Status.project_id == project_id)
+                .order_by(Status.id),  # type: ignore
+            ),
+            (
+                "milestones",
+                Milestone.select()
+                .where(Milestone.project_id == project_id)
+                .order_by(Milestone.id),  # type: ignore
+            ),
+            (
+                "tasks",
+                Task.select()
+                .join(Status)
+                .where(Status.project_id == project_id)
+                .order_by(Task.id),  # type: ignore
+            ),
+            (
+                "assignments",
+                TaskAssignment.select()
+                .join(Task)
+                .join(Status)
+                .where(Status.project_id == project_id),
+            ),
+            (
+                "dependencies",
+                TaskDependency.select()
+                .join(
+                    Task,
+                    Task.id == TaskDependency.dependant_id,  # type: ignore
+                )
+                .join(Status)
+                .where(Status.project_id == project_id),
+            ),
+        ]
+
+        for name, statement in sections:
+            yield f', "{name}": ['
+
+            separator = ""
+            for batch in _fetch(session, statement):
+                yield separator + ", ".join(
+                    json.dumps(row.dict()) for row in batch
+                )
+                separator = ", "
+
+            yield "]"
+
+        yield "}\n"
+
+
+def export_csv(project_id: int) -> Iterator[str]:
+    """
+    Yields the CSV of the tasks of the project, with the statuses and the
+    milestones by name, so that it can be imported back.
+    """
+    with db.new_session() as session:
+        project = session.exec(
+            Project.select().where(Project.id == project_id)
+        ).first()
+
+        if project is None:
+            raise InvalidProjectIDError()
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+
+        # SQLAlchemy's select, sqlmodel's is only typed up to 4 columns
+        statement = (
+            sqlalchemy.select(
+                sql.col(Task.name),
+                sql.col(Task.description),
+                sql.col(Status.name),
+                sql.col(Milestone.name),
+                sql.col(Task.priority),
+                sql.col(Task.start_date),
+                sql.col(Task.end_date),
+            )
+            .join(Status)
+            .outerjoin(
+                Milestone, sql.col(Milestone.id) == sql.col(Task.milestone_id)
+            )
+            .where(sql.col(Status.project_id) == project_id)
+            .order_by(sql.col(Task.id))
+        )
+
+        for batch in _fetch(session, statement):
+            writer.writerows(
+                (
+                    name,
+                    description,
+                    status,
+                    milestone or "",
+                    priority.value,
+                    epoch_to_date(start_date),
+                    epoch_to_date(end_date),
+                )
+                for (
+                    name,
+                    description,
+                    status,
+                    milestone,
+                    priority,
+                    start_date,
+                    end_date,
+                ) in batch
+            )
+
+            yield buffer.getvalue()
+
+            buffer.seek(0)
+            buffer.truncate()
+
+        # the header of a project without tasks
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def _fetch(session: sql.Session, statement: Any) -> Iterator[list[Any]]:
+    """
+    Yields the rows of the statement in batches, read from a server-side
+    cursor.
+    """
+    result = session.exec(
+        statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    yield from result.partitions()
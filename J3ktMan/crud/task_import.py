@@ -0,0 +1,258 @@
+"""
+Bulk import of tasks from CSV or JSON Lines files.
+
+Each row describes a task with the `name`, `description`, `status`,
+`milestone`, `priority`, `start_date` and `end_date` columns. `name` and
+`status` are required, statuses and milestones are referred to by name and
+dates are either `YYYY-MM-DD` or epochs, as whole numbers or digit strings.
+
+The rows are read lazily and inserted in chunks, the statuses, milestones and
+task names of the project are loaded once up front, so importing doesn't cost
+any query per row.
+"""
+
+from sqlalchemy import insert
+import reflex as rx
+import sqlmodel as sql
+
+from .project import InvalidProjectIDError
+from .schedule import invalidate_project_schedule
+from .snapshot import invalidate_project_snapshot
+from .stats import invalidate_project_task_stats
+from .. import change_feed, db
+from ..change_feed import Change, ChangeKind
+from ..model.project import Project
+from ..model.tasks import Milestone, Priority, Status, Task
+from ..utils import date_to_epoch
+
+import csv
+import itertools
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+IMPORT_CHUNK_SIZE = 1000
+"""
+Number of rows validated and inserted per statement.
+"""
+
+
+class RowError(rx.Base):
+    line: int
+    """
+    Line of the row in the file, starting at 1.
+    """
+
+    message: str
+
+
+class ImportReport(rx.Base):
+    created: int = 0
+    """
+    Number of tasks created.
+    """
+
+    errors: list[RowError] = []
+    """
+    The rows that were skipped and why.
+    """
+
+
+class InvalidRowError(Exception):
+    pass
+
+
+def read_csv(file: TextIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yields the rows of a CSV file with a header, with their line numbers.
+    """
+    reader = csv.DictReader(file)
+
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_json_lines(file: TextIO) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yields the rows of a JSON Lines file, one object per line, with their line
+    numbers. Blank lines are skipped, malformed ones are yielded as an empty
+    row so that they are reported.
+    """
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError:
+            row = None
+
+        yield line, row if isinstance(row, dict) else {}
+
+
+def import_tasks(
+    project_id: int,
+    rows: Iterable[tuple[int, dict[str, Any]]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Creates a task for every valid row in the given project ID. Invalid rows
+    are reported and skipped, each chunk is committed on its own.
+
+    Checks:
+    - If the status and the milestone exist in the project
+    - If there's a task with the same name in the project or in the file
+    - If the start date is before the end date
+    """
+    report = ImportReport()
+
+    with db.session() as session:
+        project = session.exec(
+            Project.select().where(Project.id == project_id)
+        ).first()
+
+        if project is None:
+            raise InvalidProjectIDError()
+
+        status_ids: dict[str, int] = dict(
+            session.exec(  # type: ignore
+                sql.select(Status.name, Status.id).where(
+                    Status.project_id == project_id
+                )
+            ).all()
+        )
+        milestone_ids: dict[str, int] = dict(
+            session.exec(  # type: ignore
+                sql.select(Milestone.name, Milestone.id).where(
+                    Milestone.project_id == project_id
+                )
+            ).all()
+        )
+        task_names = set(
+            session.exec(
+                sql.select(Task.name)
+                .join(Status)
+                .where(Status.project_id == project_id)
+            ).all()
+        )
+
+        rows = iter(rows)
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            values = []
+
+            for line, row in chunk:
+                try:
+                    task = _parse_row(row, status_ids, milestone_ids)
+                except InvalidRowError as error:
+                    report.errors.append(
+                        RowError(line=line, message=str(error))
+                    )
+                    continue
+
+                if task["name"] in task_names:
+                    report.errors.append(
+                        RowError(
+                            line=line,
+                            message=f'Task "{task["name"]}" already exists',
+                        )
+                    )
+                    continue
+
+                task_names.add(task["name"])
+                values.append(task)
+
+            if values:
+                session.exec(insert(Task), params=values)  # type: ignore
+                session.commit()
+
+                report.created += len(values)
+
+                # after every chunk, the committed chunks stay visible if a
+                # later one fails
+                invalidate_project_task_stats(project_id)
+                invalidate_project_schedule(project_id)
+                invalidate_project_snapshot(project_id)
+                change_feed.publish(
+                    Change(
+                        kind=ChangeKind.PROJECT_CHANGED, project_id=project_id
+                    )
+                )
+
+    return report
+
+
+def _parse_row(
+    row: dict[str, Any],
+    status_ids: dict[str, int],
+    milestone_ids: dict[str, int],
+) -> dict[str, Any]:
+    """
+    Returns the column values of the task described by the row.
+    """
+    name = _get_text(row, "name")
+    if not name:
+        raise InvalidRowError("Missing task name")
+
+    status = _get_text(row, "status")
+    if status not in status_ids:
+        raise InvalidRowError(f'Unknown status "{status}"')
+
+    milestone = _get_text(row, "milestone")
+    if milestone and milestone not in milestone_ids:
+        raise InvalidRowError(f'Unknown milestone "{milestone}"')
+
+    priority = _get_text(row, "priority").upper() or Priority.MEDIUM
+    if priority not in Priority.__members__:
+        raise InvalidRowError(f'Unknown priority "{priority}"')
+
+    start_date = _get_date(row, "start_date")
+    end_date = _get_date(row, "end_date")
+
+    if start_date is not None and end_date is not None:
+        if start_date > end_date:
+            raise InvalidRowError("Invalid date range")
+
+    return {
+        "name": name,
+        "description": _get_text(row, "description"),
+        "status_id": status_ids[status],
+        "milestone_id": milestone_ids[milestone] if milestone else None,
+        "priority": Priority(priority),
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def _get_text(row: dict[str, Any], column: str) -> str:
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+
+def _get_date(row: dict[str, Any], column: str) -> int | None:
+    value = row.get(column)
+
+    if value is None or value == "":
+        return None
+
+    # `True` and `False` are ints too
+    if isinstance(value, bool):
+        raise InvalidRowError(f'Invalid {column} "{value}"')
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise InvalidRowError(f'Invalid {column} "{value}"')
+
+        return int(value)
+
+    text = str(value).strip()
+
+    # CSV cells are always strings, epochs included
+    if text.removeprefix("-").isdigit():
+        return int(text)
+
+    try:
+        return date_to_epoch(text)
+    except ValueError:
+        raise InvalidRowError(f'Invalid {column} "{value}"')
@@ -1,5 +1,24 @@
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from sqlmodel.sql.expression import Select
 import reflex as rx
-
+import sqlalchemy
+import sqlmodel as sql
+
+from .schedule import (
+    check_dependency,
+    invalidate_project_schedule,
+    schedule_dependency_added,
+    schedule_dependency_removed,
+    schedule_task_dates_changed,
+)
+from .snapshot import invalidate_project_snapshot
+from .stats import invalidate_project_task_stats
+from .. import change_feed, db
+from ..change_feed import Change, ChangeKind
+from ..dependency_graph import CycleError, DependencyGraph
+from ..model.project import Project
 from ..model.tasks import (
     Task,
     Status,
@@ -9,8 +28,10 @@ from ..model.tasks import (
     Priority,
 )
 
+from dataclasses import dataclass
+import contextlib
 import datetime
-from typing import Sequence
+from typing import Any, Iterator, Sequence, cast
 
 
 class ExistingMilestoneNameError(Exception):
@@ -37,6 +58,75 @@ class DateError(Exception):
     pass
 
 
+@dataclass
+class VersionConflictError(Exception):
+    """
+    Thrown when a task or a status was updated by someone else since the
+    version the update was based on was read. Carries the current row, so
+    that the caller can show it and retry.
+    """
+
+    current: Task | Status
+
+
+def _compare_and_swap(
+    session: Session,
+    model: type[Task] | type[Status],
+    row_id: int,
+    version: int | None,
+    values: dict[str, Any],
+    error: type[Exception],
+) -> Any:
+    """
+    Updates the row with a single statement if its version is still the
+    given one, or whatever its version if None, and increments the version.
+    Returns the updated row.
+
+    Raises `VersionConflictError` if the version changed and `error` if the
+    row doesn't exist.
+    """
+    statement = (
+        update(model)
+        .where(model.id == row_id)  # type: ignore
+        .values(**values, version=model.version + 1)
+        .returning(model)
+    )
+
+    if version is not None:
+        statement = statement.where(sql.col(model.version) == version)
+
+    row = session.exec(statement).scalar_one_or_none()  # type: ignore
+    if row is not None:
+        return row
+
+    current = session.exec(model.select().where(model.id == row_id)).first()
+    if current is None:
+        raise error()
+
+    raise VersionConflictError(current=current)
+
+
+@contextlib.contextmanager
+def _unique_name(
+    session: Session, existing: Any, error: type[Exception]
+) -> Iterator[None]:
+    """
+    Raises `error` if the writes of the block violate a unique `(project_id,
+    name)` index, i.e. the row selected by `existing` was committed by a
+    concurrent write after the name was checked. The transaction is rolled
+    back.
+    """
+    try:
+        yield
+    except IntegrityError:
+        session.rollback()
+
+        if session.exec(existing).first() is None:
+            raise
+
+        raise error()
+
+
 class MilestoneCreate(rx.Base):
     name: str
     description: str
@@ -47,18 +137,16 @@ def create_milestone(info: MilestoneCreate) -> Milestone:
     """
     Creates a milestone in the given project ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         current_time = int(datetime.datetime.now().timestamp())
 
         # check if there's a milestone with the same name
-        existing_milestone = session.exec(
-            Milestone.select().where(
-                (Milestone.name == info.name)
-                & (Milestone.project_id == info.parent_project_id)
-            )
-        ).first()
+        existing_milestone = Milestone.select().where(
+            (Milestone.name == info.name)
+            & (Milestone.project_id == info.parent_project_id)
+        )
 
-        if existing_milestone is not None:
+        if session.exec(existing_milestone).first() is not None:
             raise ExistingMilestoneNameError()
 
         milestone = Milestone(
@@ -68,9 +156,22 @@ def create_milestone(info: MilestoneCreate) -> Milestone:
             due_date=current_time,
         )
         session.add(milestone)
-        session.commit()
+
+        with _unique_name(
+            session, existing_milestone, ExistingMilestoneNameError
+        ):
+            session.commit()
+
         session.refresh(milestone)
 
+        invalidate_project_snapshot(info.parent_project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.PROJECT_CHANGED,
+                project_id=info.parent_project_id,
+            )
+        )
+
         return milestone
 
 
@@ -78,7 +179,7 @@ def get_milestone_by_task_id(task_id: int) -> Milestone | None:
     """
     Returns the milestone of a task.
     """
-    with rx.session() as session:
+    with db.session() as session:
         task = session.exec(Task.select().where(Task.id == task_id)).first()
         if task is None:
             raise InvalidTaskIDError()
@@ -89,21 +190,46 @@ def get_milestone_by_task_id(task_id: int) -> Milestone | None:
 
 
 def set_task_description(task_id: int, new_description: str) -> Task:
-    with rx.session() as session:
-        task = session.exec(Task.select().where(Task.id == task_id)).first()
-        if task is None:
+    with db.session() as session:
+        project_id = session.exec(
+            sql.select(Status.project_id).join(Task).where(Task.id == task_id)
+        ).first()
+
+        if project_id is None:
             raise InvalidTaskIDError()
 
-        task.description = new_description
-        session.add(task)
+        task = _compare_and_swap(
+            session,
+            Task,
+            task_id,
+            None,
+            {"description": new_description},
+            InvalidTaskIDError,
+        )
         session.commit()
         session.refresh(task)
 
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_UPDATED,
+                project_id=project_id,
+                task_id=task_id,
+                description=new_description,
+                version=task.version,
+            )
+        )
+
     return task
 
 
-def rename_status(status_id: int, new_name: str) -> Status:
-    with rx.session() as session:
+def rename_status(
+    status_id: int, new_name: str, version: int | None = None
+) -> Status:
+    """
+    Renames a status, if its version is still the given one.
+    """
+    with db.session() as session:
         status = session.exec(
             Status.select().where(Status.id == status_id)
         ).first()
@@ -112,26 +238,46 @@ def rename_status(status_id: int, new_name: str) -> Status:
             raise InvalidStatusIDError()
 
         # check if there's a status with the same name in the same project
-        existing_status = session.exec(
-            Status.select().where(
-                (Status.name == new_name)
-                & (Status.project_id == status.project_id)
-            )
-        ).first()
+        existing_status = Status.select().where(
+            (Status.name == new_name)
+            & (Status.project_id == status.project_id)
+        )
 
-        if existing_status is not None:
+        if session.exec(existing_status).first() is not None:
             raise ExistingStatusNameError()
 
-        status.name = new_name
-        session.add(status)
-        session.commit()
+        with _unique_name(session, existing_status, ExistingStatusNameError):
+            status = _compare_and_swap(
+                session,
+                Status,
+                status_id,
+                version,
+                {"name": new_name},
+                InvalidStatusIDError,
+            )
+            session.commit()
+
         session.refresh(status)
 
+        invalidate_project_task_stats(status.project_id)
+        invalidate_project_snapshot(status.project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.PROJECT_CHANGED,
+                project_id=status.project_id,
+            )
+        )
+
         return status
 
 
-def rename_task(task_id: int, new_name: str) -> Task:
-    with rx.session() as session:
+def rename_task(
+    task_id: int, new_name: str, version: int | None = None
+) -> Task:
+    """
+    Renames a task, if its version is still the given one.
+    """
+    with db.session() as session:
         task = session.exec(Task.select().where(Task.id == task_id)).first()
 
         if task is None:
@@ -156,11 +302,28 @@ def rename_task(task_id: int, new_name: str) -> Task:
         if existing_task is not None:
             raise ExistingTaskNameError()
 
-        task.name = new_name
-        session.add(task)
+        task = _compare_and_swap(
+            session,
+            Task,
+            task_id,
+            version,
+            {"name": new_name},
+            InvalidTaskIDError,
+        )
         session.commit()
         session.refresh(task)
 
+        invalidate_project_snapshot(parent_status.project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_RENAMED,
+                project_id=parent_status.project_id,
+                task_id=task_id,
+                name=new_name,
+                version=task.version,
+            )
+        )
+
         return task
 
 
@@ -168,7 +331,7 @@ def get_milestones_by_project_id(project_id: int) -> Sequence[Milestone]:
     """
     Returns all milestones in the given project ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Milestone.select().where(Milestone.project_id == project_id)
         ).all()
@@ -178,7 +341,7 @@ def get_milestone_by_id(milestone_id: int) -> Milestone | None:
     """
     Returns a milestone by its ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Milestone.select().where(Milestone.id == milestone_id)
         ).first()
@@ -188,10 +351,12 @@ def assign_milestone(milestone_id: int | None, task_id: int) -> Task | None:
     """
     Assign a milestone to an existing task.
     """
-    with rx.session() as session:
+    with db.session() as session:
+        project_id = session.exec(
+            sql.select(Status.project_id).join(Task).where(Task.id == task_id)
+        ).first()
 
-        task = session.exec(Task.select().where(Task.id == task_id)).first()
-        if task is None:
+        if project_id is None:
             raise InvalidTaskIDError()
 
         if milestone_id is not None:
@@ -199,10 +364,28 @@ def assign_milestone(milestone_id: int | None, task_id: int) -> Task | None:
             if milestone is None:
                 raise InvalidMilestoneIDError()
 
-        task.milestone_id = milestone_id
-        session.add(task)
+        task = _compare_and_swap(
+            session,
+            Task,
+            task_id,
+            None,
+            {"milestone_id": milestone_id},
+            InvalidTaskIDError,
+        )
         session.commit()
         session.refresh(task)
+
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_UPDATED,
+                project_id=project_id,
+                task_id=task_id,
+                milestone_id=milestone_id,
+                version=task.version,
+            )
+        )
+
         return task
 
 
@@ -211,23 +394,63 @@ def delete_milestone(milestone_id: int) -> None:
     Deletes a milestone by its ID.
 
     Chechs:
-    - Deletes all tasks in the milestone
+    - Deletes all tasks in the milestone, with their assignments and
+      dependencies
     """
-    with rx.session() as session:
-        milestone = get_milestone_by_id(milestone_id)
-        if milestone is None:
-            return
+    with db.session() as session:
+        project_id = session.exec(
+            sql.select(Milestone.project_id).where(
+                Milestone.id == milestone_id
+            )
+        ).first()
 
-        # get all tasks in the milestone
-        tasks = get_tasks_by_milestone_id(milestone_id)
+        if project_id is None:
+            return
 
-        # delete all tasks in the milestone
-        for task in tasks:
-            session.delete(task)
+        _delete_tasks(
+            session,
+            sql.select(Task.id).where(Task.milestone_id == milestone_id),
+        )
 
-        session.delete(milestone)
+        session.exec(
+            delete(Milestone).where(
+                Milestone.id == milestone_id  # type: ignore
+            )
+        )
         session.commit()
 
+        invalidate_project_task_stats(project_id)
+        invalidate_project_schedule(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(kind=ChangeKind.PROJECT_CHANGED, project_id=project_id)
+        )
+
+
+def _delete_tasks(session: Session, task_ids: Any) -> None:
+    """
+    Deletes the tasks whose IDs are selected by the `task_ids` subquery,
+    together with their assignments and dependencies. The number of
+    statements doesn't depend on the number of tasks.
+    """
+    task_ids = task_ids.scalar_subquery()
+
+    for statement in (
+        delete(TaskAssignment).where(
+            TaskAssignment.task_id.in_(task_ids)  # type: ignore
+        ),
+        delete(TaskDependency).where(
+            TaskDependency.dependency_id.in_(task_ids)  # type: ignore
+            | TaskDependency.dependant_id.in_(task_ids)  # type: ignore
+        ),
+        delete(Task).where(Task.id.in_(task_ids)),  # type: ignore
+    ):
+        session.exec(
+            statement.execution_options(  # type: ignore
+                synchronize_session=False
+            )
+        )
+
 
 def create_task(
     name: str,
@@ -244,7 +467,7 @@ def create_task(
     Chechs:
     - If there's a task with the same name in the same milestone
     """
-    with rx.session() as session:
+    with db.session() as session:
         status = session.exec(
             Status.select().where(Status.id == status_id)
         ).first()
@@ -284,6 +507,26 @@ def create_task(
 
         session.refresh(new_task)
 
+        invalidate_project_task_stats(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_CREATED,
+                project_id=project_id,
+                task_id=new_task.id,
+                name=name,
+                description=description,
+                status_id=status_id,
+                milestone_id=milestone_id,
+                start_date=start_date,
+                end_date=end_date,
+                version=new_task.version,
+            )
+        )
+        schedule_task_dates_changed(
+            project_id, new_task.id, start_date, end_date
+        )
+
         return new_task
 
 
@@ -291,6 +534,7 @@ def update_task_dates(
     task_id: int,
     start_date: int | None = None,
     end_date: int | None = None,
+    version: int | None = None,
 ) -> Task:
     """
     Updates the start and end dates of a task.
@@ -298,8 +542,9 @@ def update_task_dates(
     Chechs:
     - If the task exists
     - If the start date is before the end date
+    - If the version of the task is still the given one
     """
-    with rx.session() as session:
+    with db.session() as session:
         task = session.exec(Task.select().where(Task.id == task_id)).first()
         if task is None:
             raise InvalidTaskIDError()
@@ -308,13 +553,34 @@ def update_task_dates(
             if start_date > end_date:
                 raise DateError()
 
-        task.start_date = start_date
-        task.end_date = end_date
-
-        session.add(task)
+        project_id = session.exec(
+            sql.select(Status.project_id).where(Status.id == task.status_id)
+        ).one()
+
+        task = _compare_and_swap(
+            session,
+            Task,
+            task_id,
+            version,
+            {"start_date": start_date, "end_date": end_date},
+            InvalidTaskIDError,
+        )
         session.commit()
         session.refresh(task)
 
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_UPDATED,
+                project_id=project_id,
+                task_id=task_id,
+                start_date=start_date,
+                end_date=end_date,
+                version=task.version,
+            )
+        )
+        schedule_task_dates_changed(project_id, task_id, start_date, end_date)
+
         return task
 
 
@@ -322,7 +588,7 @@ def get_task_by_id(task_id: int) -> Task | None:
     """
     Returns a task by its ID
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(Task.select().where(Task.id == task_id)).first()
 
 
@@ -334,37 +600,36 @@ def delete_task(task_id: int) -> None:
     - Deletes all task assignments related to the task
     - Removes the **dependency** of the task from other tasks
     """
-    with rx.session() as session:
-        task = get_task_by_id(task_id)
-        if task is None:
-            return
+    with db.session() as session:
+        project_id = session.exec(
+            sql.select(Status.project_id)
+            .join(Task)
+            .where(Task.id == task_id)
+        ).first()
 
-        assignments = session.exec(
-            TaskAssignment.select().where((TaskAssignment.task_id == task_id))
-        ).all()
+        if project_id is None:
+            return
 
-        for assignment in assignments:
-            session.delete(assignment)
+        _delete_tasks(session, sql.select(Task.id).where(Task.id == task_id))
+        session.commit()
 
-        dependencies = session.exec(
-            TaskDependency.select().where(
-                (TaskDependency.dependency_id == task_id)
-                | (TaskDependency.dependant_id == task_id)
+        invalidate_project_task_stats(project_id)
+        invalidate_project_schedule(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_DELETED,
+                project_id=project_id,
+                task_id=task_id,
             )
-        ).all()
-
-        for dependency in dependencies:
-            session.delete(dependency)
-
-        session.delete(task)
-        session.commit()
+        )
 
 
 def get_tasks_by_milestone_id(milestone_id: int) -> Sequence[Task]:
     """
     Returns all tasks in the given milestone ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Task.select().where(Task.milestone_id == milestone_id)
         ).all()
@@ -377,7 +642,7 @@ def assign_task(task_id: int, user_id: str) -> TaskAssignment:
     Chechs:
     - If the task is already assigned to the user
     """
-    with rx.session() as session:
+    with db.session() as session:
         current_time = int(datetime.datetime.now().timestamp())
 
         # check if the task is already assigned to the user
@@ -407,7 +672,7 @@ def get_assigned_tasks_by_user_id(user_id: str) -> Sequence[Task]:
     """
     Returns all tasks assigned to the user.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Task.select()
             .join(TaskAssignment)
@@ -419,7 +684,7 @@ def get_assignees_by_task_id(task_id: int) -> Sequence[str]:
     """
     Returns all user IDs assigned to the task.
     """
-    with rx.session() as session:
+    with db.session() as session:
         task_assignments = session.exec(
             TaskAssignment.select().where(TaskAssignment.task_id == task_id)
         ).all()
@@ -434,7 +699,7 @@ def unassign_task(task_id: int, user_id: str) -> None:
     Chechs:
     - If the task is not assigned to the user
     """
-    with rx.session() as session:
+    with db.session() as session:
         assigned_task = session.exec(
             TaskAssignment.select().where(
                 (TaskAssignment.task_id == task_id)
@@ -456,18 +721,51 @@ def create_task_dependency(
     Creates a dependency between two tasks.
 
     Chechs:
-    - Error on cyclic dependencies
+    - Both tasks exist in the same project
+    - Error on cyclic dependencies, including transitive ones
     """
-    with rx.session() as session:
-        # check if there's a cyclic dependency
-        cyclic_dependency = session.exec(
+    with db.session() as session:
+        project_ids = dict(
+            session.exec(
+                sql.select(Task.id, Status.project_id)
+                .join(Status)
+                .where(
+                    Task.id.in_(  # type: ignore
+                        [dependent_task_id, dependency_task_id]
+                    )
+                )
+            ).all()
+        )
+
+        if (
+            dependent_task_id not in project_ids
+            or dependency_task_id not in project_ids
+            or project_ids[dependent_task_id]
+            != project_ids[dependency_task_id]
+        ):
+            raise InvalidTaskIDError()
+
+        project_id = project_ids[dependent_task_id]
+
+        # the dependencies of the project are created one at a time, two
+        # concurrent ones could otherwise close a cycle together
+        _lock_project(session, project_id)
+
+        existing_dependency = session.exec(
             TaskDependency.select().where(
-                (TaskDependency.dependency_id == dependent_task_id)
-                & (TaskDependency.dependant_id == dependency_task_id)
+                (TaskDependency.dependency_id == dependency_task_id)
+                & (TaskDependency.dependant_id == dependent_task_id)
             )
         ).first()
 
-        if cyclic_dependency is not None:
+        if existing_dependency is not None:
+            return existing_dependency
+
+        try:
+            check_dependency(
+                session, project_id, dependency_task_id, dependent_task_id
+            )
+        except CycleError:
             raise CyclicDependencyError()
 
         dependency = TaskDependency(
@@ -478,29 +776,84 @@ def create_task_dependency(
         session.commit()
         session.refresh(dependency)
 
+        assert dependency.id is not None
+
+        schedule_dependency_added(
+            project_id, dependency.id, dependency_task_id, dependent_task_id
+        )
+
         return dependency
 
 
+def _lock_project(session: Session, project_id: int) -> None:
+    """
+    Locks the project's row until the session commits or rolls back.
+    """
+    session.exec(
+        sql.select(Project.id)
+        .where(Project.id == project_id)
+        .with_for_update()
+    ).one()
+
+
+def _load_dependency_graph(
+    session: Session, project_id: int
+) -> DependencyGraph:
+    task_ids = session.exec(
+        sql.select(Task.id).join(Status).where(Status.project_id == project_id)
+    ).all()
+
+    edges = session.exec(
+        sql.select(TaskDependency.dependency_id, TaskDependency.dependant_id)
+        .join(Task, Task.id == TaskDependency.dependant_id)  # type: ignore
+        .join(Status)
+        .where(Status.project_id == project_id)
+    ).all()
+
+    try:
+        return DependencyGraph.from_edges(edges, task_ids)
+    except CycleError:
+        raise CyclicDependencyError()
+
+
+def get_dependency_graph(project_id: int) -> DependencyGraph:
+    """
+    Returns the dependency graph of all the tasks in the given project ID.
+    """
+    with db.session() as session:
+        return _load_dependency_graph(session, project_id)
+
+
 def remove_task_dependency(
     dependent_task_id: int, dependency_task_id: int
 ) -> None:
     """
     Removes a dependency between two tasks.
     """
-    with rx.session() as session:
+    with db.session() as session:
         dependency = session.exec(
             TaskDependency.select().where(
-                (TaskDependency.dependency_id == dependent_task_id)
-                & (TaskDependency.dependant_id == dependency_task_id)
+                (TaskDependency.dependency_id == dependency_task_id)
+                & (TaskDependency.dependant_id == dependent_task_id)
             )
         ).first()
 
         if dependency is None:
             return
 
+        project_id = session.exec(
+            sql.select(Status.project_id)
+            .join(Task)
+            .where(Task.id == dependency.dependant_id)
+        ).one()
+
         session.delete(dependency)
         session.commit()
 
+        schedule_dependency_removed(
+            project_id, dependency.dependency_id, dependency.dependant_id
+        )
+
 
 class ExistingStatusNameError(Exception):
     pass
@@ -510,15 +863,13 @@ def create_status(name: str, description: str, project_id: int) -> Status:
     """
     Creates a status in the given project ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         # check if there's exist a status with the same name
-        existing_status = session.exec(
-            Status.select().where(
-                (Status.name == name) & (Status.project_id == project_id)
-            )
-        ).first()
+        existing_status = Status.select().where(
+            (Status.name == name) & (Status.project_id == project_id)
+        )
 
-        if existing_status is not None:
+        if session.exec(existing_status).first() is not None:
             raise ExistingStatusNameError()
 
         status = Status(
@@ -528,9 +879,18 @@ def create_status(name: str, description: str, project_id: int) -> Status:
         )
 
         session.add(status)
-        session.commit()
+
+        with _unique_name(session, existing_status, ExistingStatusNameError):
+            session.commit()
+
         session.refresh(status)
 
+        invalidate_project_task_stats(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(kind=ChangeKind.PROJECT_CHANGED, project_id=project_id)
+        )
+
         return status
 
 
@@ -538,7 +898,7 @@ def get_statuses_by_project_id(project_id: int) -> Sequence[Status]:
     """
     Returns all statuses in the given project ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Status.select().where(Status.project_id == project_id)
         ).all()
@@ -548,7 +908,7 @@ def get_tasks_by_status_id(status_id: int) -> Sequence[Task]:
     """
     Returns all tasks in the given status ID.
     """
-    with rx.session() as session:
+    with db.session() as session:
         return session.exec(
             Task.select().where(Task.status_id == status_id)
         ).all()
@@ -566,8 +926,13 @@ class InvalidMilestoneIDError(Exception):
     pass
 
 
-def set_status(task_id: int, status_id: int) -> int:
-    with rx.session() as session:
+def set_status(
+    task_id: int, status_id: int, version: int | None = None
+) -> Task:
+    """
+    Moves a task to another status, if its version is still the given one.
+    """
+    with db.session() as session:
         # check if the task and status exist in the same project
         task = session.exec(Task.select().where(Task.id == task_id)).first()
         status = session.exec(
@@ -580,43 +945,322 @@ def set_status(task_id: int, status_id: int) -> int:
         if status is None:
             raise InvalidStatusIDError()
 
-        previous_status_id = task.status_id
-        task.status_id = status_id
+        task = _compare_and_swap(
+            session,
+            Task,
+            task_id,
+            version,
+            {"status_id": status_id},
+            InvalidTaskIDError,
+        )
+        project_id = status.project_id
 
         session.commit()
+        session.refresh(task)
+
+        invalidate_project_task_stats(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(
+                kind=ChangeKind.TASK_MOVED,
+                project_id=project_id,
+                task_id=task_id,
+                status_id=status_id,
+                version=task.version,
+            )
+        )
+
+        return task
+
 
-        return previous_status_id
+class TaskChange(rx.Base):
+    """
+    The fields to update on a task. Only the fields explicitly given are
+    written, so `milestone_id`, `start_date` and `end_date` can be given as
+    None to clear them.
+    """
 
+    task_id: int
+    version: int | None = None
+    """
+    Version of the task the change is based on, the change conflicts if the
+    task was updated since.
+    """
 
-def delete_status(status_id: int, to_status_id: int) -> Sequence[Task]:
+    name: str | None = None
+    description: str | None = None
+    priority: Priority | None = None
+    status_id: int | None = None
+    milestone_id: int | None = None
+    start_date: int | None = None
+    end_date: int | None = None
+
+
+def apply_task_changes(changes: Sequence[TaskChange]) -> Sequence[Task]:
+    """
+    Applies all the changes in a single transaction with bulk UPDATEs, the
+    number of queries doesn't depend on the number of changes. Several
+    changes to the same task are merged in order. Returns the changed tasks,
+    ordered by ID.
+
+    Chechs:
+    - If the tasks, statuses and milestones exist in the same project
+    - If there's a task with the same name in the same project
+    - If the start date is before the end date
+    - If the versions of the tasks are still the given ones
+    """
+    values_by_task_id: dict[int, dict[str, Any]] = {}
+    versions: dict[int, int] = {}
+
+    for change in changes:
+        values_by_task_id.setdefault(change.task_id, {}).update(
+            change.dict(exclude_unset=True, exclude={"task_id", "version"})
+        )
+
+        if change.version is not None:
+            versions.setdefault(change.task_id, change.version)
+
+    if not values_by_task_id:
+        return []
+
+    task_ids = list(values_by_task_id)
+
+    with db.session() as session:
+        # sqlmodel's select is only typed up to 4 columns, SQLAlchemy's is
+        # typed instead and cast to sqlmodel's for `exec`
+        statement = (
+            sqlalchemy.select(
+                sql.col(Task.id),
+                sql.col(Task.name),
+                sql.col(Task.start_date),
+                sql.col(Task.end_date),
+                sql.col(Status.project_id),
+                sql.col(Task.version),
+            )
+            .join(Status)
+            .where(sql.col(Task.id).in_(task_ids))
+            # the new versions are computed from the ones read
+            .with_for_update(of=Task)
+        )
+        rows = session.exec(
+            cast(
+                Select[tuple[int, str, int | None, int | None, int, int]],
+                statement,
+            )
+        ).all()
+
+        if len(rows) != len(task_ids):
+            raise InvalidTaskIDError()
+
+        current = {row[0]: row for row in rows}
+        project_ids = {task_id: row[4] for task_id, row in current.items()}
+
+        status_project_ids = _get_project_ids(
+            session, Status, values_by_task_id, "status_id"
+        )
+        milestone_project_ids = _get_project_ids(
+            session, Milestone, values_by_task_id, "milestone_id"
+        )
+
+        renamed: set[tuple[int, str]] = set()
+
+        for task_id, values in values_by_task_id.items():
+            row = current[task_id]
+            _, name, start_date, end_date, project_id, version = row
+
+            if versions.get(task_id, version) != version:
+                raise VersionConflictError(
+                    current=session.exec(
+                        Task.select().where(Task.id == task_id)
+                    ).one()
+                )
+
+            if "status_id" in values and (
+                status_project_ids.get(values["status_id"]) != project_id
+            ):
+                raise InvalidStatusIDError()
+
+            if values.get("milestone_id") is not None and (
+                milestone_project_ids.get(values["milestone_id"])
+                != project_id
+            ):
+                raise InvalidMilestoneIDError()
+
+            start_date = values.get("start_date", start_date)
+            end_date = values.get("end_date", end_date)
+
+            if start_date is not None and end_date is not None:
+                if start_date > end_date:
+                    raise DateError()
+
+            if "name" in values and values["name"] != name:
+                key = (project_id, values["name"])
+                if key in renamed:
+                    raise ExistingTaskNameError()
+
+                renamed.add(key)
+
+        if renamed:
+            # a task keeping the name conflicts, one renamed away doesn't
+            existing_tasks = session.exec(
+                sql.select(Task.id, Task.name, Status.project_id)
+                .join(Status)
+                .where(
+                    Task.name.in_(  # type: ignore
+                        {name for _, name in renamed}
+                    )
+                    & Status.project_id.in_(  # type: ignore
+                        {project_id for project_id, _ in renamed}
+                    )
+                )
+            ).all()
+
+            for task_id, name, project_id in existing_tasks:
+                new_name = values_by_task_id.get(task_id, {}).get("name", name)
+
+                if (project_id, name) in renamed and new_name == name:
+                    raise ExistingTaskNameError()
+
+        params = [
+            {"id": task_id, **values, "version": current[task_id][5] + 1}
+            for task_id, values in values_by_task_id.items()
+            if values
+        ]
+
+        if params:
+            # parameter sets with the same keys are sent as one executemany
+            session.exec(update(Task), params=params)  # type: ignore
+            session.commit()
+
+        tasks = session.exec(
+            Task.select()
+            .where(Task.id.in_(task_ids))  # type: ignore
+            .order_by(Task.id)  # type: ignore
+        ).all()
+
+    stats_project_ids = {
+        project_ids[task_id]
+        for task_id, values in values_by_task_id.items()
+        if "status_id" in values or "priority" in values
+    }
+
+    for project_id in stats_project_ids:
+        invalidate_project_task_stats(project_id)
+
+    for project_id in set(project_ids.values()):
+        invalidate_project_snapshot(project_id)
+
+    for task in tasks:
+        values = values_by_task_id[task.id]
+
+        if values:
+            change_feed.publish(
+                Change(
+                    kind=ChangeKind.TASK_UPDATED,
+                    project_id=project_ids[task.id],
+                    task_id=task.id,
+                    version=task.version,
+                    **{
+                        field: value
+                        for field, value in values.items()
+                        if field in Change.__fields__
+                    },
+                )
+            )
+
+    for task in tasks:
+        values = values_by_task_id[task.id]
+
+        if "start_date" in values or "end_date" in values:
+            schedule_task_dates_changed(
+                project_ids[task.id], task.id, task.start_date, task.end_date
+            )
+
+    return tasks
+
+
+def _get_project_ids(
+    session: Session,
+    model: type[Status] | type[Milestone],
+    values_by_task_id: dict[int, dict[str, Any]],
+    field: str,
+) -> dict[int, int]:
+    """
+    Returns the project IDs of the statuses or milestones referenced by the
+    `field` of the changes, keyed by their ID.
+    """
+    ids = {
+        values[field]
+        for values in values_by_task_id.values()
+        if values.get(field) is not None
+    }
+
+    if not ids:
+        return {}
+
+    return dict(
+        session.exec(
+            sql.select(model.id, model.project_id).where(
+                model.id.in_(ids)  # type: ignore
+            )
+        ).all()
+    )
+
+
+def delete_status(
+    status_id: int, to_status_id: int, version: int | None = None
+) -> Sequence[Task]:
     """
     Deletes a status by its ID.
 
     Chechs:
     - Moves all tasks in the status to the given status ID
+    - If the given status ID is another status of the same project
+    - If the version of the status is still the given one
     """
-    with rx.session() as session:
-        status = session.exec(
-            Status.select().where(Status.id == status_id)
+    if to_status_id == status_id:
+        raise InvalidStatusIDError()
+
+    with db.session() as session:
+        # also locks the status until the end of the transaction
+        status = _compare_and_swap(
+            session, Status, status_id, version, {}, InvalidStatusIDError
+        )
+
+        # shared lock, the status the tasks move to can't be deleted before
+        # the end of the transaction
+        to_project_id = session.exec(
+            sql.select(Status.project_id)
+            .where(Status.id == to_status_id)
+            .with_for_update(read=True)
         ).first()
 
-        if status is None:
+        if to_project_id != status.project_id:
             raise InvalidStatusIDError()
 
-        # get all tasks in the status
-        tasks = session.exec(
-            Task.select().where(Task.status_id == status_id)
+        task_ids = session.exec(
+            sql.select(Task.id).where(Task.status_id == status_id)
         ).all()
 
-        # move all tasks in the status to the given status ID
-        for task in tasks:
-            task.status_id = to_status_id
-            session.add(task)
+        # move all tasks in the status to the given status ID at once
+        session.exec(
+            update(Task)  # type: ignore
+            .where(Task.status_id == status_id)  # type: ignore
+            .values(status_id=to_status_id, version=Task.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+        project_id = status.project_id
 
         session.delete(status)
         session.commit()
 
-        for task in tasks:
-            session.refresh(task)
+        invalidate_project_task_stats(project_id)
+        invalidate_project_snapshot(project_id)
+        change_feed.publish(
+            Change(kind=ChangeKind.PROJECT_CHANGED, project_id=project_id)
+        )
 
-        return tasks
+        return session.exec(
+            Task.select().where(Task.id.in_(task_ids))  # type: ignore
+        ).all()
@@ -0,0 +1,155 @@
+from typing import Any, Protocol, Sequence
+
+import reflex as rx
+
+import asyncio
+import logging
+
+from ..cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_TTL = 300
+"""
+Number of seconds a Clerk user profile is served from memory.
+"""
+
+PROFILE_CACHE_SIZE = 4096
+"""
+Maximum number of Clerk user profiles kept in memory.
+"""
+
+MISSING_PROFILE_TTL = 60
+"""
+Number of seconds a user that Clerk doesn't know (e.g. deleted) is
+remembered as missing.
+"""
+
+MAX_CONCURRENT_FETCHES = 16
+"""
+Maximum number of Clerk requests in flight for a single `get_users` call.
+"""
+
+
+class ClerkUserClient(Protocol):
+    """
+    The part of the Clerk API client used to fetch user profiles.
+    """
+
+    def get_user(self, user_id: str) -> Any: ...
+
+
+class UserProfile(rx.Base):
+    user_id: str
+    username: str | None
+    email: str | None
+    profile_image_url: str | None
+
+
+_profile_cache: TTLCache[str, UserProfile | None] = TTLCache(
+    maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL
+)
+
+
+def _is_not_found(error: Exception) -> bool:
+    """
+    Returns True if the error is Clerk's answer that the user doesn't exist.
+    The exception types differ between the Clerk clients, all of them carry
+    the HTTP status of the response.
+    """
+    status_code = getattr(error, "status_code", None)
+
+    if status_code is None:
+        response = getattr(error, "response", None) or getattr(
+            error, "raw_response", None
+        )
+        status_code = getattr(response, "status_code", None)
+
+    return status_code == 404
+
+
+def _fetch_profile(
+    client: ClerkUserClient, user_id: str
+) -> UserProfile | None:
+    """
+    Fetches the profile from Clerk and caches the result. Returns None (and
+    caches the miss) if the user doesn't exist anymore, or None without
+    caching anything if Clerk couldn't be reached.
+    """
+    try:
+        user_data = client.get_user(user_id)
+    except Exception as e:
+        if _is_not_found(e):
+            _profile_cache.set(user_id, None, ttl=MISSING_PROFILE_TTL)
+        else:
+            logger.exception("Failed to fetch the user %s from Clerk", user_id)
+
+        return None
+
+    email_addresses = user_data.email_addresses or []
+
+    profile = UserProfile(
+        user_id=user_id,
+        username=user_data.username,
+        email=(
+            email_addresses[0].email_address
+            if len(email_addresses) > 0
+            else None
+        ),
+        profile_image_url=user_data.profile_image_url,
+    )
+    _profile_cache.set(user_id, profile)
+
+    return profile
+
+
+def get_user(client: ClerkUserClient, user_id: str) -> UserProfile | None:
+    """
+    Returns the Clerk profile of the user, None if the user doesn't exist or
+    Clerk couldn't be reached.
+    """
+    profile = _profile_cache.get(user_id)
+    if profile is not MISSING:
+        return profile  # type: ignore
+
+    return _fetch_profile(client, user_id)
+
+
+async def get_users(
+    client: ClerkUserClient, user_ids: Sequence[str]
+) -> dict[str, UserProfile | None]:
+    """
+    Returns the Clerk profiles of the given users keyed by user ID, None for
+    the users that don't exist or couldn't be fetched. The profiles that
+    aren't cached are fetched concurrently off the event loop, so the call
+    costs about one Clerk round trip no matter how many users miss the cache.
+    """
+    result: dict[str, UserProfile | None] = {}
+    misses: list[str] = []
+
+    for user_id in dict.fromkeys(user_ids):
+        profile = _profile_cache.get(user_id)
+
+        if profile is MISSING:
+            misses.append(user_id)
+        else:
+            result[user_id] = profile  # type: ignore
+
+    if len(misses) > 0:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(user_id: str) -> UserProfile | None:
+            async with semaphore:
+                return await asyncio.to_thread(_fetch_profile, client, user_id)
+
+        profiles = await asyncio.gather(*(fetch(id) for id in misses))
+        result.update(zip(misses, profiles))
+
+    return result
+
+
+def invalidate_user(user_id: str) -> None:
+    """
+    Drops the cached profile of the user.
+    """
+    _profile_cache.invalidate(user_id)
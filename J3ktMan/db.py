@@ -0,0 +1,362 @@
+"""
+The database engine shared by the CRUD layer, with its connection pool
+configured from the environment:
+
+- `DATABASE_POOL_SIZE`: connections kept open, 5 by default
+- `DATABASE_MAX_OVERFLOW`: connections opened beyond the pool size under
+  load, 10 by default
+- `DATABASE_POOL_TIMEOUT`: seconds to wait for a connection before failing,
+  30 by default
+- `DATABASE_POOL_RECYCLE`: seconds after which a connection is replaced,
+  never by default
+- `DATABASE_POOL_PRE_PING`: whether connections are checked before use,
+  true by default
+- `DATABASE_SLOW_CHECKOUT`: seconds waited for a connection above which the
+  checkout is logged, 0.1 by default
+
+Each worker process opens at most `DATABASE_POOL_SIZE +
+DATABASE_MAX_OVERFLOW` connections, the sum over all the workers must stay
+below Postgres' `max_connections`.
+"""
+
+from reflex.config import get_config
+from reflex.model import get_engine_args
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+import reflex as rx
+import sqlalchemy
+import sqlmodel
+
+from J3ktMan import profiler
+
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterator, ParamSpec, cast
+
+P = ParamSpec("P")
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSettings(rx.Base):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    slow_checkout: float
+
+
+class PoolStats(rx.Base):
+    size: int
+    """
+    Number of connections the pool keeps open.
+    """
+
+    checked_out: int
+    """
+    Number of connections currently in use.
+    """
+
+    overflow: int
+    """
+    Number of connections currently open beyond the pool size, negative while
+    the pool isn't full yet.
+    """
+
+    checkouts: int
+    """
+    Number of connections handed out since the start.
+    """
+
+    checkout_wait: float
+    """
+    Total seconds spent waiting for a connection.
+    """
+
+    max_checkout_wait: float
+    """
+    Longest wait for a connection, in seconds.
+    """
+
+    slow_checkouts: int
+    """
+    Number of checkouts that waited longer than the slow checkout threshold.
+    """
+
+    timeouts: int
+    """
+    Number of checkouts that gave up waiting, i.e. the pool was exhausted.
+    """
+
+    connects: int
+    """
+    Number of connections opened to the database.
+    """
+
+    invalidations: int
+    """
+    Number of connections discarded, e.g. after a failed pre-ping.
+    """
+
+
+def get_pool_settings() -> PoolSettings:
+    """
+    Returns the pool settings read from the environment.
+    """
+    return PoolSettings(
+        pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DATABASE_POOL_RECYCLE", "-1")),
+        pool_pre_ping=os.getenv("DATABASE_POOL_PRE_PING", "true").lower()
+        in ("1", "true", "yes"),
+        slow_checkout=float(os.getenv("DATABASE_SLOW_CHECKOUT", "0.1")),
+    )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A `QueuePool` that records how long each checkout waited for a
+    connection.
+    """
+
+    slow_checkout: float = 0.1
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._checkout_wait = 0.0
+        self._max_checkout_wait = 0.0
+        self._slow_checkouts = 0
+        self._timeouts = 0
+        self._connects = 0
+        self._invalidations = 0
+
+        event.listen(self, "connect", self._on_connect)
+        event.listen(self, "invalidate", self._on_invalidate)
+        event.listen(self, "soft_invalidate", self._on_invalidate)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = cast(InstrumentedQueuePool, super().recreate())
+        pool.slow_checkout = self.slow_checkout
+
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+
+            logger.error(
+                "Database pool exhausted after waiting %.3fs: %s",
+                time.perf_counter() - start,
+                self.status(),
+            )
+            raise
+
+        wait = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._checkout_wait += wait
+            self._max_checkout_wait = max(self._max_checkout_wait, wait)
+
+            if wait >= self.slow_checkout:
+                self._slow_checkouts += 1
+
+        if wait >= self.slow_checkout:
+            logger.warning(
+                "Waited %.3fs for a database connection: %s",
+                wait,
+                self.status(),
+            )
+
+        return connection
+
+    def _on_connect(self, *_) -> None:
+        with self._stats_lock:
+            self._connects += 1
+
+    def _on_invalidate(self, *_) -> None:
+        with self._stats_lock:
+            self._invalidations += 1
+
+    def stats(self) -> PoolStats:
+        with self._stats_lock:
+            return PoolStats(
+                size=self.size(),
+                checked_out=self.checkedout(),
+                overflow=self.overflow(),
+                checkouts=self._checkouts,
+                checkout_wait=self._checkout_wait,
+                max_checkout_wait=self._max_checkout_wait,
+                slow_checkouts=self._slow_checkouts,
+                timeouts=self._timeouts,
+                connects=self._connects,
+                invalidations=self._invalidations,
+            )
+
+
+_engine: sqlalchemy.Engine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> sqlalchemy.Engine:
+    """
+    Returns the engine of the app's database, created on first use.
+    """
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            url = get_config().db_url
+            if url is None:
+                raise ValueError("No database url configured")
+
+            settings = get_pool_settings()
+
+            _engine = sqlmodel.create_engine(
+                url,
+                **{
+                    **get_engine_args(url),
+                    "poolclass": InstrumentedQueuePool,
+                    "pool_size": settings.pool_size,
+                    "max_overflow": settings.max_overflow,
+                    "pool_timeout": settings.pool_timeout,
+                    "pool_recycle": settings.pool_recycle,
+                    "pool_pre_ping": settings.pool_pre_ping,
+                },
+            )
+            _engine.pool.slow_checkout = (  # type: ignore
+                settings.slow_checkout
+            )
+
+            if profiler.is_enabled():
+                profiler.install(_engine)
+
+        return _engine
+
+
+class ScopedSession(sqlmodel.Session):
+    """
+    A session shared by the nested `session()` blocks of one operation. Only
+    the outermost block commits, the commits of the nested ones flush, so
+    the whole operation is one transaction on one connection. The side
+    effects decorated by `after_commit` wait for that commit.
+    """
+
+    depth: int = 0
+    """
+    Number of `session()` blocks currently using the session.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._after_commit: list[Callable[[], None]] = []
+
+    def commit(self) -> None:
+        if self.depth > 1:
+            self.flush()
+            return
+
+        super().commit()
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        self._after_commit.clear()
+        super().rollback()
+
+    def close(self) -> None:
+        self._after_commit.clear()
+        super().close()
+
+
+_current_session: contextvars.ContextVar[ScopedSession | None] = (
+    contextvars.ContextVar("current_session", default=None)
+)
+
+
+@contextlib.contextmanager
+def session() -> Iterator[ScopedSession]:
+    """
+    Returns a session on the app's database, the replacement of
+    `rx.session()` for the CRUD layer. Inside another `session()` block of
+    the same context, the session of that block is reused instead of
+    checking out another connection.
+    """
+    current = _current_session.get()
+
+    if current is not None:
+        current.depth += 1
+        try:
+            yield current
+        finally:
+            current.depth -= 1
+
+        return
+
+    with ScopedSession(get_engine()) as new_session:
+        new_session.depth = 1
+        token = _current_session.set(new_session)
+
+        try:
+            yield new_session
+        finally:
+            _current_session.reset(token)
+
+
+def after_commit(function: Callable[P, None]) -> Callable[P, None]:
+    """
+    Decorates a side effect of the CRUD layer's writes, e.g. dropping a
+    cache or publishing a change. Called inside a nested `session()` block,
+    whose commit only flushes, it is run after the commit of the outermost
+    block instead, and not at all if the session rolls back.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> None:
+        current = _current_session.get()
+
+        if current is None or current.depth <= 1:
+            function(*args, **kwargs)
+        else:
+            current._after_commit.append(
+                functools.partial(function, *args, **kwargs)
+            )
+
+    return wrapper
+
+
+def new_session() -> sqlmodel.Session:
+    """
+    Returns a session that is never shared, for the sessions kept open by
+    generators: the context of a generator is the one of its consumer, a
+    `session()` block would leak into it between two items.
+    """
+    return sqlmodel.Session(get_engine())
+
+
+def get_pool_stats() -> PoolStats:
+    """
+    Returns the current state and the counters of the connection pool.
+    """
+    pool = get_engine().pool
+    assert isinstance(pool, InstrumentedQueuePool)
+
+    return pool.stats()
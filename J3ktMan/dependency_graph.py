@@ -0,0 +1,304 @@
+"""
+In-memory index of the dependencies between the tasks of a project.
+
+The graph keeps a topological order of its tasks up to date while edges are
+inserted (Pearce & Kelly, "A Dynamic Topological Sort Algorithm for Directed
+Acyclic Graphs"), so an insertion that respects the current order is accepted
+in constant time and any other insertion only explores the tasks between the
+two endpoints in that order.
+
+Run `python -m benchmarks.dependency_graph` from the repository root for a
+benchmark.
+"""
+
+from collections import deque
+from typing import Iterable, Iterator
+
+
+class CycleError(Exception):
+    """
+    Thrown when inserting an edge would make a task depend on itself.
+    """
+
+    pass
+
+
+class DependencyGraph:
+    """
+    Directed acyclic graph of tasks. An edge `dependency -> dependant` means
+    that `dependant` can't start before `dependency` is done.
+    """
+
+    def __init__(self) -> None:
+        self._dependants: dict[int, set[int]] = {}
+        self._dependencies: dict[int, set[int]] = {}
+
+        self._order: dict[int, int] = {}
+        """
+        Position of each task in a topological order of the graph. The
+        positions are unique but not necessarily contiguous.
+        """
+
+        self._next_order = 0
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Iterable[tuple[int, int]],
+        task_ids: Iterable[int] = (),
+    ) -> "DependencyGraph":
+        """
+        Builds the graph from `(dependency, dependant)` pairs in linear time.
+        `task_ids` adds tasks that have no dependency at all.
+
+        Throws `CycleError` if the edges contain a cycle.
+        """
+        graph = cls()
+
+        for task_id in task_ids:
+            graph.add_task(task_id)
+
+        for dependency, dependant in edges:
+            if dependency == dependant:
+                raise CycleError()
+
+            graph.add_task(dependency)
+            graph.add_task(dependant)
+
+            graph._dependants[dependency].add(dependant)
+            graph._dependencies[dependant].add(dependency)
+
+        # Kahn's algorithm
+        in_degree = {
+            task_id: len(dependencies)
+            for task_id, dependencies in graph._dependencies.items()
+        }
+        queue = deque(
+            task_id for task_id, degree in in_degree.items() if degree == 0
+        )
+
+        order = 0
+        while queue:
+            task_id = queue.popleft()
+            graph._order[task_id] = order
+            order += 1
+
+            for dependant in graph._dependants[task_id]:
+                in_degree[dependant] -= 1
+                if in_degree[dependant] == 0:
+                    queue.append(dependant)
+
+        if order != len(in_degree):
+            raise CycleError()
+
+        graph._next_order = order
+
+        return graph
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(dependants) for dependants in self._dependants.values())
+
+    def add_task(self, task_id: int) -> None:
+        if task_id in self._order:
+            return
+
+        self._dependants[task_id] = set()
+        self._dependencies[task_id] = set()
+        self._order[task_id] = self._next_order
+        self._next_order += 1
+
+    def remove_task(self, task_id: int) -> None:
+        """
+        Removes the task and all of its edges.
+        """
+        if task_id not in self._order:
+            return
+
+        for dependant in self._dependants.pop(task_id):
+            self._dependencies[dependant].discard(task_id)
+
+        for dependency in self._dependencies.pop(task_id):
+            self._dependants[dependency].discard(task_id)
+
+        del self._order[task_id]
+
+    def position(self, task_id: int) -> int:
+        """
+        Returns the position of the task in the current topological order.
+        A task is always positioned after all of its dependencies.
+        """
+        return self._order[task_id]
+
+    def has_edge(self, dependency: int, dependant: int) -> bool:
+        return dependant in self._dependants.get(dependency, ())
+
+    def add_edge(self, dependency: int, dependant: int) -> None:
+        """
+        Makes `dependant` depend on `dependency`, adding the tasks if needed.
+
+        Throws `CycleError` if `dependency` already depends on `dependant`,
+        directly or transitively. The graph is left unchanged in that case.
+        """
+        if dependency == dependant:
+            raise CycleError()
+
+        self.add_task(dependency)
+        self.add_task(dependant)
+
+        if dependant in self._dependants[dependency]:
+            return
+
+        lower = self._order[dependant]
+        upper = self._order[dependency]
+
+        # the edge violates the current order, only the tasks positioned
+        # between the two endpoints can be affected
+        if lower < upper:
+            forward = self._collect_forward(dependant, upper)
+            backward = self._collect_backward(dependency, lower)
+            self._reorder(backward, forward)
+
+        self._dependants[dependency].add(dependant)
+        self._dependencies[dependant].add(dependency)
+
+    def remove_edge(self, dependency: int, dependant: int) -> None:
+        """
+        Removes the edge if it exists. The topological order stays valid.
+        """
+        self._dependants.get(dependency, set()).discard(dependant)
+        self._dependencies.get(dependant, set()).discard(dependency)
+
+    def dependencies(self, task_id: int) -> set[int]:
+        """
+        Returns the tasks that the task directly depends on.
+        """
+        return set(self._dependencies.get(task_id, ()))
+
+    def dependants(self, task_id: int) -> set[int]:
+        """
+        Returns the tasks that directly depend on the task.
+        """
+        return set(self._dependants.get(task_id, ()))
+
+    def ancestors(self, task_id: int) -> set[int]:
+        """
+        Returns every task that the task depends on, directly or transitively.
+        """
+        return self._reachable(task_id, self._dependencies)
+
+    def descendants(self, task_id: int) -> set[int]:
+        """
+        Returns every task that depends on the task, directly or transitively.
+        """
+        return self._reachable(task_id, self._dependants)
+
+    def depends_on(self, dependant: int, dependency: int) -> bool:
+        """
+        Returns True if `dependant` depends on `dependency`, directly or
+        transitively.
+        """
+        if dependant not in self._order or dependency not in self._order:
+            return False
+
+        # a task can only depend on tasks that come before it in the order
+        if self._order[dependency] >= self._order[dependant]:
+            return False
+
+        return dependency in self._collect_backward(
+            dependant, self._order[dependency] - 1
+        )
+
+    def topological_order(self) -> list[int]:
+        """
+        Returns all the tasks, each task placed after all of its
+        dependencies.
+        """
+        return sorted(self._order, key=self._order.__getitem__)
+
+    def edges(self) -> Iterator[tuple[int, int]]:
+        for dependency, dependants in self._dependants.items():
+            for dependant in dependants:
+                yield (dependency, dependant)
+
+    def _reachable(
+        self, task_id: int, adjacency: dict[int, set[int]]
+    ) -> set[int]:
+        visited: set[int] = set()
+        stack = list(adjacency.get(task_id, ()))
+
+        while stack:
+            current = stack.pop()
+            if current in visited:
+                continue
+
+            visited.add(current)
+            stack.extend(adjacency[current] - visited)
+
+        return visited
+
+    def _collect_forward(self, start: int, upper: int) -> list[int]:
+        """
+        Collects the tasks reachable from `start` through dependants that are
+        positioned before `upper`. Reaching `upper` itself means a cycle.
+        """
+        order = self._order
+        visited = {start}
+        stack = [start]
+
+        while stack:
+            current = stack.pop()
+
+            for dependant in self._dependants[current]:
+                position = order[dependant]
+
+                if position == upper:
+                    raise CycleError()
+
+                if position < upper and dependant not in visited:
+                    visited.add(dependant)
+                    stack.append(dependant)
+
+        return list(visited)
+
+    def _collect_backward(self, start: int, lower: int) -> list[int]:
+        """
+        Collects the tasks reachable from `start` through dependencies that
+        are positioned after `lower`.
+        """
+        order = self._order
+        visited = {start}
+        stack = [start]
+
+        while stack:
+            current = stack.pop()
+
+            for dependency in self._dependencies[current]:
+                if order[dependency] > lower and dependency not in visited:
+                    visited.add(dependency)
+                    stack.append(dependency)
+
+        return list(visited)
+
+    def _reorder(self, backward: list[int], forward: list[int]) -> None:
+        """
+        Reassigns the positions of the affected tasks so that everything
+        `backward` (the new dependency and its dependencies) comes before
+        everything `forward` (the new dependant and its dependants).
+        """
+        order = self._order
+
+        backward.sort(key=order.__getitem__)
+        forward.sort(key=order.__getitem__)
+
+        tasks = backward + forward
+        positions = sorted(order[task_id] for task_id in tasks)
+
+        for task_id, position in zip(tasks, positions):
+            order[task_id] = position
@@ -52,6 +52,7 @@ class ProjectMember(rx.Model, table=True):
     user_id: str = sql.Field(
         primary_key=True,
         nullable=False,
+        index=True,
     )
     """
     Clerk's user_id that is a member of the project.
@@ -82,7 +83,9 @@ class InvitationCode(rx.Model, table=True):
     The alphanumeric string that represents the invitation code.
     """
 
-    project_id: int = sql.Field(nullable=False, foreign_key="project.id")
+    project_id: int = sql.Field(
+        nullable=False, foreign_key="project.id", index=True
+    )
     """
     The project ID that the invitation code is for.
     """
@@ -92,7 +95,7 @@ class InvitationCode(rx.Model, table=True):
     The unix epoch timestamp of when the invitation code was created.
     """
 
-    expired_at: int
+    expired_at: int = sql.Field(index=True)
     """
     The unix epoch timestamp of when the invitation code expires.
     """
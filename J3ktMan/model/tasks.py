@@ -17,6 +17,13 @@ class Milestone(rx.Model, table=True):
     Milestones to add to a project sprints.
     """
 
+    __table_args__ = (
+        # also serves the lookups by `project_id` alone
+        sqlalchemy.Index(
+            "ix_milestone_project_id_name", "project_id", "name", unique=True
+        ),
+    )
+
     id: int = sql.Field(primary_key=True, nullable=False)  # type:ignore
 
     project_id: int = sql.Field(foreign_key="project.id", nullable=False)
@@ -47,9 +54,10 @@ class Task(rx.Model, table=True):
 
     id: int = sql.Field(primary_key=True, nullable=False)  # type:ignore
 
-    name: str
+    name: str = sql.Field(index=True)
     """
-    Name of the task.
+    Name of the task. Unique within a project, the project is only reachable
+    through the status so the uniqueness is checked by the CRUD layer.
     """
 
     description: str
@@ -58,13 +66,15 @@ class Task(rx.Model, table=True):
     """
 
     milestone_id: int | None = sql.Field(
-        foreign_key="milestone.id", nullable=True
+        foreign_key="milestone.id", nullable=True, index=True
     )
     """
     Milestone's id that the task belongs to.
     """
 
-    status_id: int = sql.Field(foreign_key="status.id", nullable=False)
+    status_id: int = sql.Field(
+        foreign_key="status.id", nullable=False, index=True
+    )
     """
     Status id of the task.
     """
@@ -89,12 +99,27 @@ class Task(rx.Model, table=True):
     Unix epoch timestamp of when the task ends.
     """
 
+    version: int = sql.Field(
+        default=1, sa_column_kwargs={"server_default": "1"}
+    )
+    """
+    Incremented on every update of the task, so that the updates based on an
+    outdated read are detected instead of overwriting the newer data.
+    """
+
 
 class Status(rx.Model, table=True):
     """
     Represents the status of a task.
     """
 
+    __table_args__ = (
+        # also serves the lookups by `project_id` alone
+        sqlalchemy.Index(
+            "ix_status_project_id_name", "project_id", "name", unique=True
+        ),
+    )
+
     id: int = sql.Field(primary_key=True, nullable=False)  # type:ignore
 
     project_id: int = sql.Field(foreign_key="project.id", nullable=False)
@@ -112,6 +137,14 @@ class Status(rx.Model, table=True):
     Description of the status.
     """
 
+    version: int = sql.Field(
+        default=1, sa_column_kwargs={"server_default": "1"}
+    )
+    """
+    Incremented on every update of the status, so that the updates based on an
+    outdated read are detected instead of overwriting the newer data.
+    """
+
 
 class TaskAssignment(rx.Model, table=True):
     """
@@ -130,6 +163,7 @@ class TaskAssignment(rx.Model, table=True):
     user_id: str = sql.Field(
         primary_key=True,
         nullable=False,
+        index=True,
     )
     """
     Clerk's user_id that is assigned to the task.
@@ -149,6 +183,7 @@ class TaskDependency(rx.Model, table=True):
     dependency_id: int = sql.Field(
         foreign_key="task.id",
         nullable=True,
+        index=True,
     )
     """
     Task's id that the current task depends on.
@@ -156,6 +191,7 @@ class TaskDependency(rx.Model, table=True):
     dependant_id: int = sql.Field(
         foreign_key="task.id",
         nullable=True,
+        index=True,
     )
     """
     Task's id that depends on the current task.
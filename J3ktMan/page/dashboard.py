@@ -7,17 +7,16 @@ from J3ktMan.component.Dashboard.bar_chart import bar_chart
 from J3ktMan.component.Dashboard.pie_chart import pie_chart
 from J3ktMan.component.Dashboard.dashboard_card import dashboard_card
 from J3ktMan.model.project import Project
-from J3ktMan.crud.project import get_project, is_in_project, InvalidProjectIDError
+from J3ktMan.crud import aio
+from J3ktMan.crud.project import InvalidProjectIDError
 from J3ktMan.component.protected import protected_page_with
-from J3ktMan.crud.tasks import (
-    get_statuses_by_project_id,
-    get_tasks_by_status_id,
-)
+from J3ktMan.crud.stats import ProjectTaskStats
 
 
 class PageData(rx.Base):
     project_id: int
     project: Project
+    stats: ProjectTaskStats
 
 
 class State(rx.State):
@@ -35,9 +34,11 @@ class State(rx.State):
 
         try:
             project_id = int(self.router.page.params["project_id"])
-            project = get_project(project_id)
+            membership = await aio.get_membership(
+                clerk_state.user_id, project_id
+            )
 
-            if not is_in_project(clerk_state.user_id, project_id):
+            if membership is None:
                 return [
                     rx.toast.error(
                         "You are not authorized to view this project",
@@ -47,7 +48,8 @@ class State(rx.State):
 
             new_page_data = PageData(
                 project_id=project_id,
-                project=project,
+                project=membership.project,
+                stats=await aio.get_project_task_stats(project_id),
             )
 
             self.page_data = new_page_data
@@ -78,93 +80,35 @@ class State(rx.State):
         if self.page_data is None:
             return 0
 
-        # Get all statuses for this project
-        statuses = get_statuses_by_project_id(self.page_data.project_id)
-
-        # Find the "Completed" status (you might need to adjust this logic)
-        completed_status = next(
-            (status for status in statuses if status.name.lower() == "completed"), None
-        )
-
-        if completed_status is None:
-            return 0
-
-        # Get tasks with completed status
-        completed_tasks = get_tasks_by_status_id(completed_status.id)
-        return len(completed_tasks)
+        return self.page_data.stats.completed
 
     @rx.var(cache=True)
     def total_tasks_count(self) -> int:
         if self.page_data is None:
             return 0
 
-        # Get all statuses for this project
-        statuses = get_statuses_by_project_id(self.page_data.project_id)
-
-        # Count tasks across all statuses
-        total = 0
-        for status in statuses:
-            tasks = get_tasks_by_status_id(status.id)
-            total += len(tasks)
-
-        return total
+        return self.page_data.stats.total
 
     @rx.var(cache=True)
     def pending_tasks_count(self) -> int:
         if self.page_data is None:
             return 0
 
-        # Get all statuses for this project
-        statuses = get_statuses_by_project_id(self.page_data.project_id)
-
-        # Find the statuses that indicate pending tasks
-        pending_statuses = [
-            status
-            for status in statuses
-            if status.name.lower() in ["in progress", "pending", "to do"]
-        ]
-
-        # Count tasks with pending statuses
-        total = 0
-        for status in pending_statuses:
-            tasks = get_tasks_by_status_id(status.id)
-            total += len(tasks)
-
-        return total
+        return self.page_data.stats.pending
 
     @rx.var(cache=True)
     def priority_data(self) -> list:
-        # Initialize with default structure
-        result = [
-            {"name": "Low", "count": 0},
-            {"name": "Medium", "count": 0},
-            {"name": "High", "count": 0},
-        ]
-
         if self.page_data is None:
-            return result
-
-        # Get all statuses for this project
-        statuses = get_statuses_by_project_id(self.page_data.project_id)
-
-        # Count tasks by priority
-        priority_counts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
-
-        for status in statuses:
-            tasks = get_tasks_by_status_id(status.id)
-            for task in tasks:
-                try:
-                    priority_name = task.priority.name
-                    if priority_name in priority_counts:
-                        priority_counts[priority_name] += 1
-                except (AttributeError, TypeError):
-                    # Handle case where task might not have priority
-                    pass
+            # Initialize with default structure
+            return [
+                {"name": "Low", "count": 0},
+                {"name": "Medium", "count": 0},
+                {"name": "High", "count": 0},
+            ]
 
-        # Update the default data with actual counts
         return [
             {"name": priority, "count": count}
-            for priority, count in priority_counts.items()
+            for priority, count in self.page_data.stats.priority_counts.items()
         ]
 
     @rx.var(cache=True)
@@ -172,22 +116,16 @@ class State(rx.State):
         if self.page_data is None:
             return []
 
-        statuses = get_statuses_by_project_id(self.page_data.project_id)
-
         colors = ["#FF6384", "#36A2EB", "#FFCE56", "#4CAF50", "#9966FF"]
 
-        result = []
-        for i, status in enumerate(statuses):
-            tasks = get_tasks_by_status_id(status.id)
-            result.append(
-                {
-                    "name": status.name,
-                    "value": len(tasks),
-                    "fill": colors[i % len(colors)],
-                }
-            )
-
-        return result
+        return [
+            {
+                "name": status.name,
+                "value": status.count,
+                "fill": colors[i % len(colors)],
+            }
+            for i, status in enumerate(self.page_data.stats.statuses)
+        ]
 
 
 @rx.page("project/dashboard/[project_id]")
@@ -5,10 +5,7 @@ from reflex.event import EventSpec
 
 import reflex as rx
 
-from J3ktMan.crud.project import (
-    get_project_from_invitation_code,
-    reedem_invitation_code,
-)
+from J3ktMan.crud import aio
 
 
 class InvalidCode(rx.Base): ...
@@ -44,7 +41,9 @@ class State(rx.State):
         if not isinstance(self.project, InvitedPorject):
             return None
 
-        success = reedem_invitation_code(self.project.code, clerk_state.user_id)
+        success = await aio.reedem_invitation_code(
+            self.project.code, clerk_state.user_id
+        )
 
         if success:
             return [rx.redirect("/home")]
@@ -58,7 +57,7 @@ class State(rx.State):
         return rx.redirect("/home")
 
     @rx.event
-    def on_load(self) -> None:
+    async def on_load(self) -> None:
         self.project = InvalidCode()
         code: str | None = self.router.page.params.get("code", None)
 
@@ -66,7 +65,7 @@ class State(rx.State):
         if code is None:
             return
 
-        project = get_project_from_invitation_code(code)
+        project = await aio.get_project_from_invitation_code(code)
 
         if project is None:
             self.project = InvalidCode()
@@ -8,8 +8,15 @@ import J3ktMan.model.tasks
 from J3ktMan.component.drag_zone import drag_zone
 from J3ktMan.component.draggable_card import draggable_card
 from J3ktMan.component.protected import protected_page_with
-from J3ktMan.component.task_dialog import task_dialog, State as TaskDialogState
-from J3ktMan.state.project import State as ProjectState, Status
+from J3ktMan.component.task_dialog import (
+    shared_task_dialog,
+    State as TaskDialogState,
+)
+from J3ktMan.state.project import (
+    State as ProjectState,
+    Status,
+    Task as ProjectTask,
+)
 from J3ktMan.component.create_milestone_dialog import (
     create_milestone_dialog,
     State as CreateMilestoneState,
@@ -18,6 +25,10 @@ from J3ktMan.model.project import Project
 from J3ktMan.component.base import base_page
 from J3ktMan.component.invite_member_dialog import invite_member_dialog
 from J3ktMan.model.tasks import Priority
+from J3ktMan.utils import get_window
+
+import itertools
+from typing import Callable
 
 
 class Task(rx.Base):
@@ -42,6 +53,89 @@ class EditingStatusName(rx.Base):
     name: str
 
 
+class Card(rx.Base):
+    """
+    What a card displays of its task.
+    """
+
+    id: int
+    name: str
+    description: str
+    milestone_id: int | None
+
+
+class CardWindow(rx.Base):
+    cards: list[Card]
+    """
+    The rendered cards, the only tasks of the column sent to the browser.
+    """
+
+    padding_top: int
+    """
+    Height in pixels of the cards above the window.
+    """
+
+    padding_bottom: int
+    """
+    Height in pixels of the cards below the window.
+    """
+
+
+CARD_HEIGHT = 120
+"""
+Height in pixels of a task card, including the gap between the cards.
+"""
+
+OVERSCAN_CARDS = 10
+"""
+Number of cards rendered beyond each edge of a column's viewport. The
+rendered cards only change once the column scrolled by this many cards.
+"""
+
+COLUMN_VIEWPORT_SCRIPT = """
+(() => Object.fromEntries(
+    Array.from(
+        document.querySelectorAll("[data-status-id]"),
+        (column) => [
+            column.dataset.statusId,
+            [column.scrollTop, column.clientHeight],
+        ],
+    ),
+))()
+"""
+"""
+Reports the scroll position and the height of every column's viewport.
+"""
+
+RESET_COLUMNS_SCRIPT = """
+document
+    .querySelectorAll("[data-status-id]")
+    .forEach((column) => column.scrollTo(0, 0))
+"""
+"""
+Scrolls every column back to its first card.
+"""
+
+
+def filter_task_ids(
+    task_ids: dict[int, None],
+    get_task: Callable[[int], ProjectTask | J3ktMan.model.tasks.Task | None],
+    milestone_id: int | None,
+) -> dict[int, None]:
+    """
+    Returns the ordered set of the IDs of the tasks matching the filter, in
+    display order. A None filter matches every task.
+    """
+    if milestone_id is None:
+        return task_ids
+
+    return {
+        task_id: None
+        for task_id in task_ids
+        if get_task(task_id).milestone_id == milestone_id  # type: ignore
+    }
+
+
 class State(rx.State):
     dragging_task_id: int | None = None
     """The task ID that is being dragged by."""
@@ -60,25 +154,128 @@ class State(rx.State):
 
     editing_status_name: EditingStatusName | None = None
 
+    card_windows: dict[int, tuple[int, int]] = {}
+    """
+    The `[first, last)` indices of the rendered cards of each status. Columns
+    that haven't reported their viewport yet render their first cards.
+    """
+
     @rx.event
     def set_creating_status(self, value: bool) -> None:
         self.creating_status = value
 
     @rx.event
-    def set_filter_milestone_id(self, milestone_id: int | None) -> None:
+    def set_filter_milestone_id(self, milestone_id: int | None):
+        if milestone_id == self.filter_milestone_id:
+            return
+
         self.filter_milestone_id = milestone_id
 
+        # the filtered columns start over from their first page
+        self.card_windows = {}
+
+        return rx.call_script(RESET_COLUMNS_SCRIPT)
+
     @rx.event
     async def create_status(self, form_data) -> list[EventSpec] | None:
         status_name = str(form_data["status_name"])
 
         project_state = await self.get_state(ProjectState)
-        result = project_state.create_status(status_name)
+        result = await project_state.create_status(status_name)
 
         self.creating_status = False
 
         return result
 
+    @rx.event
+    def set_column_viewports(
+        self, viewports: dict[str, list[float]] | None
+    ) -> None:
+        """
+        Moves the rendered window of each column to the viewport reported by
+        `COLUMN_VIEWPORT_SCRIPT`: `{status_id: [scroll_top, height]}`.
+        """
+        if viewports is None:
+            return
+
+        for status_id, (scroll_top, height) in viewports.items():
+            window = get_window(
+                int(scroll_top) // CARD_HEIGHT,
+                -(-int(height) // CARD_HEIGHT) + 1,
+                OVERSCAN_CARDS,
+            )
+
+            # only touch the var when a window moves, so that scrolling
+            # inside the overscan doesn't send anything
+            if self.card_windows.get(int(status_id)) != window:
+                self.card_windows[int(status_id)] = window
+
+    @rx.var(cache=True)
+    async def _filtered_task_ids(self) -> dict[int, dict[int, None]]:
+        """
+        IDs of the tasks of each status matching the filter, in display
+        order. Kept on the backend, only the window of it is sent.
+        """
+        project_state = await self.get_state(ProjectState)
+
+        if project_state.project_id is None:
+            return {}
+
+        # read before the comprehension, the dependencies aren't detected
+        # through the state captured by its closure
+        get_task = project_state._get_task
+        get_status_task_ids = project_state._get_status_task_ids
+        status_ids = project_state.statuses_by_id.keys()
+        milestone_id = self.filter_milestone_id
+
+        return {
+            status_id: filter_task_ids(
+                get_status_task_ids(status_id), get_task, milestone_id
+            )
+            for status_id in status_ids
+        }
+
+    @rx.var(cache=True)
+    async def column_windows(self) -> dict[int, CardWindow]:
+        """
+        The filtered cards inside the rendered window of each status. Only
+        these are sent to the browser, the rest of the column is replaced by
+        padding.
+        """
+        windows = {}
+        filtered_task_ids = await self._filtered_task_ids
+
+        project_state = await self.get_state(ProjectState)
+
+        for status_id, task_ids in filtered_task_ids.items():
+            first, last = self.card_windows.get(
+                status_id, (0, 3 * OVERSCAN_CARDS)
+            )
+            first = min(first, len(task_ids))
+            last = min(last, len(task_ids))
+
+            cards = []
+            for task_id in itertools.islice(task_ids, first, last):
+                task = project_state._get_task(task_id)
+                assert task is not None
+
+                cards.append(
+                    Card(
+                        id=task.id,
+                        name=task.name,
+                        description=task.description,
+                        milestone_id=task.milestone_id,
+                    )
+                )
+
+            windows[status_id] = CardWindow(
+                cards=cards,
+                padding_top=first * CARD_HEIGHT,
+                padding_bottom=(len(task_ids) - last) * CARD_HEIGHT,
+            )
+
+        return windows
+
     @rx.event
     def set_mouse_over(self, status_id: int) -> None:
         self.mouse_over = status_id
@@ -101,12 +298,12 @@ class State(rx.State):
     @rx.event
     async def set_editing_status_name(self, status_id: int) -> None:
         project_state = await self.get_state(ProjectState)
-        if project_state.data is None:
+        if project_state.project_id is None:
             return
 
         self.editing_status_name = EditingStatusName(
             status_id=status_id,
-            name=project_state.data.statuses_by_id[status_id].name,
+            name=project_state.statuses_by_id[status_id].name,
         )
 
     @rx.event
@@ -128,21 +325,21 @@ class State(rx.State):
             return
 
         project_state = await self.get_state(ProjectState)
-        if project_state.data is None:
+        if project_state.project_id is None:
             return
 
         status_id = self.editing_status_name.status_id
         new_name = self.editing_status_name.name
 
         if (
-            project_state.data.statuses_by_id[status_id].name
+            project_state.statuses_by_id[status_id].name
             == self.editing_status_name.name
             or self.editing_status_name.name == ""
         ):
             return
 
         project_state = await self.get_state(ProjectState)
-        result = project_state.rename_status(
+        result = await project_state.rename_status(
             status_id,
             new_name,
         )
@@ -160,7 +357,7 @@ class State(rx.State):
         task_name = str(form_data["task_name"])
 
         project_state = await self.get_state(ProjectState)
-        result = project_state.create_task(
+        result = await project_state.create_task(
             task_name,
             "",
             Priority.MEDIUM,
@@ -231,7 +428,7 @@ class State(rx.State):
             return
 
         project_state = await self.get_state(ProjectState)
-        result = project_state.set_task_status(
+        result = await project_state.set_task_status(
             self.dragging_task_id, self.mouse_over
         )
 
@@ -296,65 +493,56 @@ def milestone_menu_item(
     )
 
 
-def task_card(task_id: int) -> rx.Component:
-    return rx.cond(
-        ~State.filter_milestone_id  # type: ignore
-        | (
-            State.filter_milestone_id
-            == ProjectState.data.tasks_by_id[task_id].milestone_id  # type: ignore
-        )
-        | (TaskDialogState.editing_task_id == task_id),
-        task_dialog(
-            draggable_card(
-                rx.dialog.trigger(
-                    rx.vstack(
-                        rx.text(ProjectState.data.tasks_by_id[task_id].name),  # type: ignore
-                        rx.text(
-                            ProjectState.data.tasks_by_id[task_id].description,  # type: ignore
-                            size="2",
-                            color_scheme="gray",
-                        ),
-                        rx.badge(
-                            rx.icon("list-check", size=12),
-                            rx.cond(
-                                ProjectState.data.tasks_by_id[  # type: ignore
-                                    task_id
-                                ].milestone_id,
-                                ProjectState.data.milestones_by_id[  # type: ignore
-                                    ProjectState.data.tasks_by_id[  # type: ignore
-                                        task_id
-                                    ].milestone_id
-                                ].name,
-                                "No Milestone",
-                            ),
-                            variant="soft",
-                            color_scheme=rx.cond(
-                                ProjectState.data.tasks_by_id[  # type: ignore
-                                    task_id
-                                ].milestone_id,
-                                "indigo",
-                                "gray",
-                            ),
-                            cursor="pointer",
-                        ),
-                    ),
+def task_card(task: Card) -> rx.Component:
+    return draggable_card(
+        rx.vstack(
+            rx.text(
+                task.name,
+                class_name="line-clamp-1",
+            ),
+            rx.text(
+                task.description,
+                size="2",
+                color_scheme="gray",
+                class_name="line-clamp-1",
+            ),
+            rx.badge(
+                rx.icon("list-check", size=12),
+                rx.cond(
+                    task.milestone_id,
+                    ProjectState.milestones_by_id[  # type: ignore
+                        task.milestone_id
+                    ].name,
+                    "No Milestone",
                 ),
-                variant="surface",
-                draggable=True,
-                cursor="pointer",
-                width="100%",
-                class_name=(  # type: ignore
-                    "round-sm "
-                    + rx.color_mode_cond(
-                        dark="hover:bg-zinc-800",
-                        light="hover:bg-gray-200",
-                    )
+                variant="soft",
+                color_scheme=rx.cond(
+                    task.milestone_id,
+                    "indigo",
+                    "gray",
                 ),
-                on_drag_start=State.on_drag(task_id),
-                on_drag_end=State.on_release,
+                cursor="pointer",
             ),
-            task_id,
         ),
+        variant="surface",
+        draggable=True,
+        cursor="pointer",
+        width="100%",
+        # fixed so that the cards outside of the window can be replaced
+        # by padding of a known height
+        height=f"{CARD_HEIGHT - 8}px",
+        flex_shrink="0",
+        class_name=(  # type: ignore
+            "round-sm "
+            + rx.color_mode_cond(
+                dark="hover:bg-zinc-800",
+                light="hover:bg-gray-200",
+            )
+        ),
+        # the dialog is shared by the whole board, see `kanban_content`
+        on_click=TaskDialogState.set_editing_task_id(task.id, True),
+        on_drag_start=State.on_drag(task.id),
+        on_drag_end=State.on_release,
     )
 
 
@@ -403,12 +591,12 @@ class StatusDeleteDialogState(rx.State):
             return []
 
         state = await self.get_state(ProjectState)
-        if state.data is None:
+        if state.project_id is None:
             return []
 
         return [
             status_id
-            for status_id in state.data.statuses_by_id.keys()
+            for status_id in state.statuses_by_id.keys()
             if status_id != self.deleting_status_id
         ]
 
@@ -427,7 +615,7 @@ class StatusDeleteDialogState(rx.State):
             ]
 
         state = await self.get_state(ProjectState)
-        result = state.delete_status(
+        result = await state.delete_status(
             self.deleting_status_id, self.migration_status_id
         )
 
@@ -444,7 +632,7 @@ def migration_status_button() -> rx.Component:
                 rx.hstack(
                     rx.cond(
                         StatusDeleteDialogState.migration_status_id,
-                        ProjectState.data.statuses_by_id[  # type: ignore
+                        ProjectState.statuses_by_id[  # type: ignore
                             StatusDeleteDialogState.migration_status_id
                         ].name,
                         "Select Status",
@@ -469,7 +657,7 @@ def migration_status_button() -> rx.Component:
                 StatusDeleteDialogState.get_available_statuses,  # type: ignore
                 lambda status_id: rx.menu.item(
                     rx.icon("git-commit-horizontal", size=12),
-                    ProjectState.data.statuses_by_id[  # type: ignore
+                    ProjectState.statuses_by_id[  # type: ignore
                         status_id
                     ].name,
                     cursor="pointer",
@@ -609,7 +797,30 @@ def kanban_column(st: Status) -> rx.Component:
         ),
         rx.divider(),
         rx.vstack(
-            rx.foreach(st.task_ids, task_card),
+            rx.vstack(
+                rx.box(
+                    height=f"{State.column_windows[st.id].padding_top}px",  # type: ignore
+                    flex_shrink="0",
+                ),
+                rx.foreach(
+                    State.column_windows[st.id].cards,  # type: ignore
+                    task_card,
+                ),
+                rx.box(
+                    height=f"{State.column_windows[st.id].padding_bottom}px",  # type: ignore
+                    flex_shrink="0",
+                ),
+                custom_attrs={"data-status-id": st.id},
+                on_scroll=rx.call_script(
+                    COLUMN_VIEWPORT_SCRIPT,
+                    callback=State.set_column_viewports,
+                ).debounce(50),
+                spacing="0",
+                gap="8px",
+                width="100%",
+                max_height="70vh",
+                overflow_y="auto",
+            ),
             rx.cond(
                 State.mouse_over == st.id,
                 rx.box(
@@ -670,7 +881,7 @@ def kanban_content() -> rx.Component:
     return rx.vstack(
         rx.skeleton(
             rx.hstack(
-                rx.heading(ProjectState.data.project_name),  # type: ignore
+                rx.heading(ProjectState.project_name),  # type: ignore
                 rx.spacer(),
                 rx.hstack(
                     invite_member_dialog(
@@ -680,7 +891,7 @@ def kanban_content() -> rx.Component:
                             color_scheme="gray",
                             size="2",
                         ),
-                        ProjectState.data.project_id,  # type: ignore
+                        ProjectState.project_id,  # type: ignore
                     ),
                     rx.icon_button(
                         "ellipsis",
@@ -718,7 +929,7 @@ def kanban_content() -> rx.Component:
                             rx.cond(
                                 State.filter_milestone_id,
                                 (
-                                    ProjectState.data.milestones_by_id[  # type: ignore
+                                    ProjectState.milestones_by_id[  # type: ignore
                                         State.filter_milestone_id
                                     ].name
                                 ),
@@ -779,6 +990,8 @@ def kanban_content() -> rx.Component:
             ),
             loading=~ProjectState.loaded,
         ),
+        # a single task dialog for the whole board instead of one per card
+        shared_task_dialog(),
         width="100%",
         height="100%",
     )
@@ -5,7 +5,8 @@ from typing import Dict
 from J3ktMan.component.base import base_page
 from J3ktMan.component.protected import protected_page_with
 
-from J3ktMan.crud.project import get_project
+from J3ktMan.crud import aio
+from J3ktMan.crud.user import get_users
 
 
 class MemberPageState(rx.State):
@@ -23,49 +24,46 @@ class MemberPageState(rx.State):
     @rx.event
     async def get_project_members_async(self):
         """Get all members of a project with their Clerk user data."""
-        from J3ktMan.model.project import ProjectMember
-
         # Get the project_id from the route params
         project_id = int(self.router.page.params.get("project_id", 0))
 
-        project = get_project(project_id=project_id)
+        project = await aio.get_project(project_id=project_id)
         if project:
             self.project_name = project.name
         else:
             self.project_name = "Unknown Project"
 
-        with rx.session() as session:
-            # Get all project members
-            members = session.exec(
-                ProjectMember.select().where(ProjectMember.project_id == project_id)
-            ).all()
-
-            # Initialize an empty result list
-            result = []
-
-            # Get Clerk state to access Clerk API
-            clerk_state = await self.get_state(ClerkState)
-
-            # For each member, fetch their Clerk user data
-            for member in members:
-                try:
-                    # Get user data from Clerk using the user_id
-                    user_data = clerk_state.clerk_api_client.get_user(member.user_id)
-
-                    # Create a member info dictionary with both project member data and user data
-                    member_info = {
-                        "username": user_data.username,
-                        "email": user_data.email_addresses[0].email_address,
-                        "role": member.role,
-                        "profile_image_url": user_data.profile_image_url,
-                    }
-
-                    result.append(member_info)
-                except Exception as e:
-                    # Handle exceptions (user might not exist in Clerk anymore)
-                    print(f"Error fetching user data for {member.user_id}: {e}")
-
-            self.project_members = result
+        # Get all project members
+        members = await aio.get_project_members(project_id)
+
+        # Get Clerk state to access Clerk API
+        clerk_state = await self.get_state(ClerkState)
+
+        # Fetch the Clerk user data of every member at once, cached profiles
+        # don't hit Clerk at all
+        profiles = await get_users(
+            clerk_state.clerk_api_client,
+            [member.user_id for member in members],
+        )
+
+        result = []
+        for member in members:
+            profile = profiles[member.user_id]
+
+            # the user might not exist in Clerk anymore
+            if profile is None:
+                continue
+
+            result.append(
+                {
+                    "username": profile.username or "",
+                    "email": profile.email or "",
+                    "role": member.role,
+                    "profile_image_url": profile.profile_image_url or "",
+                }
+            )
+
+        self.project_members = result
 
 
 def member_card(member: Dict[str, str]) -> rx.Component:
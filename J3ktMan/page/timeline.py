@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Literal
 
+import numpy as np
 import pandas as pd
 import reflex as rx
+from reflex.vars.object import ObjectVar
+from reflex.vars.sequence import ArrayVar
 from typing_extensions import TypedDict
 
 import J3ktMan.model.project
@@ -11,208 +14,165 @@ from J3ktMan.component.create_milestone_dialog import create_milestone_dialog
 from J3ktMan.component.protected import protected_page_with
 from J3ktMan.component.task_dialog import task_dialog
 from J3ktMan.component.create_task_dialog import create_task_dialog
-from J3ktMan.state.project import (
-    State as ProjectState,
-    Data as ProjectData,
-    Milestone as MilestoneData,
-)
-from J3ktMan.utils import epoch_to_date
+from J3ktMan.crud import aio
+from J3ktMan.model.tasks import Task as TaskModel
+from J3ktMan.state.project import State as ProjectState, Task as ProjectTask
+from J3ktMan.utils import epoch_to_date, get_window
 import calendar
+import itertools
 
 
-def get_milestone_data(project_data: ProjectData) -> pd.DataFrame:
-    # TODO: Fetch the data from the backend
+def get_sprint_data(
+    tasks: Iterable[ProjectTask | TaskModel],
+) -> pd.DataFrame:
     """
-    data format should be like this:
-        data = [
-            {
-                "id": 1,
-                "project_id": 1,
-                "name": "Milestone 1",
-                "description": "First milestone",
-                "due_date": 1640995200,  # Epoch timestamp
-            },
-        ]
+    Returns the given tasks, one row per task. The dates are kept as float
+    epoch columns, NaN when the task doesn't have the date.
     """
-    mock_data = [
-        {
-            "id": 1,
-            "project_id": 1,
-            "name": "Milestone 1",
-            "description": "First milestone",
-            "due_date": 1735689600,  # 2025-01-01 00:00:00 UTC
-        },
-        {
-            "id": 2,
-            "project_id": 1,
-            "name": "Milestone 2",
-            "description": "Second milestone",
-            "due_date": 1739462400,  # 2025-02-15 00:00:00 UTC
-        },
-        {
-            "id": 3,
-            "project_id": 1,
-            "name": "Milestone 3",
-            "description": "Third milestone",
-            "due_date": 1741075200,  # 2025-03-01 00:00:00 UTC
-        },
-        {
-            "id": 4,
-            "project_id": 1,
-            "name": "Milestone 4",
-            "description": "Fourth milestone",
-            "due_date": 1748016000,  # 2025-06-23 00:00:00 UTC
-        },
-    ]
+    return pd.DataFrame.from_records(
+        [
+            (
+                task.id,
+                task.name,
+                task.milestone_id,
+                task.status_id,
+                task.start_date,
+                task.end_date,
+            )
+            for task in tasks
+        ],
+        columns=[
+            "id",
+            "name",
+            "milestone_id",
+            "status_id",
+            "start_date",
+            "end_date",
+        ],
+        coerce_float=True,
+    ).astype({"start_date": "float64", "end_date": "float64"})
+
+
+def day_offsets(
+    epochs: np.ndarray, origin: datetime
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the number of whole days between `origin` and each epoch, and
+    the YYYY-MM-DD label of each epoch (NaN and None for a NaN epoch).
 
-    # Convert epoch timestamps to date strings
-    data = [
-        {
-            "id": milestone["id"],
-            "project_id": milestone["project_id"],
-            "name": milestone["name"],
-            "description": milestone["description"],
-            "due_date": epoch_to_date(milestone["due_date"]),
-        }
-        for milestone in mock_data
-    ]
-    data = [
-        {
-            "id": milestone.id,
-            "name": milestone.name,
-            "description": milestone.description,
-            "due_date": None,
-        }
-        for milestone in project_data.milestones_by_id.values()
-    ]
-    return pd.DataFrame(data)
+    Each distinct epoch is converted once. Task dates are picked by day, so
+    there are far fewer distinct epochs than tasks.
+    """
+    valid = ~np.isnan(epochs)
+    unique, inverse = np.unique(epochs[valid], return_inverse=True)
 
+    dates = [datetime.fromtimestamp(epoch) for epoch in unique]
 
-# Fetch the project tasks data
-def get_sprint_data(project_data: ProjectData) -> pd.DataFrame:
-    # TODO: Fetch the data from the backend
+    days = np.full(len(epochs), np.nan)
+    days[valid] = np.array(
+        [(date - origin).days for date in dates], dtype=np.float64
+    )[inverse]
+
+    labels = np.full(len(epochs), None, dtype=object)
+    labels[valid] = np.array(
+        [date.strftime("%Y-%m-%d") for date in dates], dtype=object
+    )[inverse]
+
+    return days, labels
+
+
+TASK_MARKER_DAYS = 5
+"""
+Width in days of the bar of a task that only has a start or an end date.
+"""
+
+
+def layout_tasks(
+    tasks: pd.DataFrame, first_month: datetime, total_days: int
+) -> pd.DataFrame:
     """
-    data format should be like this:
-        data = [
-            {
-                "id": "SW-5",
-                "name": "Planning",
-                "description": "Planning the project",
-                "milestone_id": 1,
-                "status_id": 1,
-                "priority": "HIGH",
-                "start_date": 1640995200,  # Epoch timestamp
-                "end_date": 1644844800,    # Epoch timestamp
-            },
-        ]
+    Computes the position of each task bar as percentages of the timeline
+    width. Returns a frame indexed like `tasks` with the `left`, `width`,
+    `start_time` and `end_time` columns, `left` is NaN for a task without
+    any date.
     """
-    mock_data = [
-        {
-            "id": "SW-5",
-            "name": "Planning",
-            "description": "Planning the project",
-            "milestone_id": 1,
-            "status_id": 1,  # 1 maps to "DONE"
-            "priority": "HIGH",
-            "start_date": 1735689600,  # 2025-01-01 00:00:00 UTC
-            "end_date": 1736918400,  # 2025-01-15 00:00:00 UTC
-        },
-        {
-            "id": "SW-6",
-            "name": "Design",
-            "description": "Designing the system",
-            "milestone_id": 1,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "MEDIUM",
-            "start_date": 1739462400,  # 2025-02-15 00:00:00 UTC
-            "end_date": 1739856000,  # 2025-02-20 00:00:00 UTC
-        },
-        {
-            "id": "SW-13",
-            "name": "Development",
-            "description": "Developing features",
-            "milestone_id": 2,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "HIGH",
-            "start_date": 1736304000,  # 2025-01-10 00:00:00 UTC
-            "end_date": 1736918400,  # 2025-01-15 00:00:00 UTC
-        },
-        {
-            "id": "SW-14",
-            "name": "Testing",
-            "description": "Testing the system",
-            "milestone_id": 3,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "MEDIUM",
-            "start_date": 1739856000,  # 2025-02-20 00:00:00 UTC
-            "end_date": 1741075200,  # 2025-03-01 00:00:00 UTC
-        },
-        {
-            "id": "SW-15",
-            "name": "Deployment",
-            "description": "Deploying the system",
-            "milestone_id": 3,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "HIGH",
-            "start_date": 1741075200,  # 2025-03-01 00:00:00 UTC
-            "end_date": 1741372800,  # 2025-03-05 00:00:00 UTC
-        },
-        {
-            "id": "SW-25",
-            "name": "Post-deployment",
-            "description": "Post-deployment review",
-            "milestone_id": 4,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "LOW",
-            "start_date": 1741680000,  # 2025-03-10 00:00:00 UTC
-            "end_date": 1742188800,  # 2025-03-15 00:00:00 UTC
-        },
+    scale = 100 / total_days
+
+    start_days, start_labels = day_offsets(
+        tasks["start_date"].to_numpy(), first_month
+    )
+    end_days, end_labels = day_offsets(
+        tasks["end_date"].to_numpy(), first_month
+    )
+
+    has_start = ~np.isnan(start_days)
+    has_end = ~np.isnan(end_days)
+
+    start_left = start_days * scale
+    end_left = end_days * scale
+
+    # a task with a single date is drawn as a short marker, after its start
+    # or before its end
+    width = np.where(
+        has_start & has_end,
+        end_left - start_left,
+        np.where(has_start, 1, -1) * TASK_MARKER_DAYS * scale,
+    )
+
+    return pd.DataFrame(
         {
-            "id": "SW-30",
-            "name": "Review",
-            "description": "Final review",
-            "milestone_id": 4,
-            "status_id": 2,  # 2 maps to "IN PROGRESS"
-            "priority": "LOW",
-            "start_date": 1748016000,  # 2025-05-23 00:00:00 UTC
-            "end_date": 1748508000,  # 2025-05-28 00:00:00 UTC
+            "left": np.where(has_start, start_left, end_left),
+            "width": width,
+            "start_time": pd.Series(start_labels, tasks.index, object),
+            "end_time": pd.Series(end_labels, tasks.index, object),
         },
-    ]
+        index=tasks.index,
+    )
 
-    # Convert epoch timestamps to date strings and map status_id to status
-    status_map = {1: "DONE", 2: "IN PROGRESS"}
-    data = [
-        {
-            "id": task["id"],
-            "name": task["name"],
-            "start_date": epoch_to_date(task["start_date"]),
-            "end_date": epoch_to_date(task["end_date"]),
-            "status": status_map.get(task["status_id"], "IN PROGRESS"),
-            "milestone_id": task["milestone_id"],
-        }
-        for task in mock_data
-    ]
 
-    data = [
+def layout_milestones(
+    tasks: pd.DataFrame, first_month: datetime, total_days: int
+) -> pd.DataFrame:
+    """
+    Computes the span of each milestone, from the earliest to the latest
+    date of its tasks. Returns a frame indexed by milestone ID with the
+    `left`, `width`, `start_time` and `end_time` columns, milestones
+    without any dated task are left out.
+    """
+    dates = tasks[["start_date", "end_date"]]
+    spans = (
+        pd.DataFrame(
+            {
+                "milestone_id": tasks["milestone_id"],
+                "first": dates.min(axis=1),
+                "last": dates.max(axis=1),
+            }
+        )
+        .dropna()
+        .groupby("milestone_id")
+        .agg(first=("first", "min"), last=("last", "max"))
+    )
+
+    scale = 100 / total_days
+
+    first_days, first_labels = day_offsets(
+        np.asarray(spans["first"], dtype=np.float64), first_month
+    )
+    last_days, last_labels = day_offsets(
+        np.asarray(spans["last"], dtype=np.float64), first_month
+    )
+
+    index = spans.index.astype(np.int64)
+
+    return pd.DataFrame(
         {
-            "id": task.id,
-            "name": task.name,
-            "start_date": (
-                epoch_to_date(task.start_date)
-                if task.start_date is not None
-                else None
-            ),
-            "end_date": (
-                epoch_to_date(task.end_date)
-                if task.end_date is not None
-                else None
-            ),
-            "status": project_data.statuses_by_id[task.status_id].name,
-            "milestone_id": task.milestone_id,
-        }
-        for task in project_data.tasks_by_id.values()
-    ]
-    return pd.DataFrame(data)
+            "left": first_days * scale,
+            "width": (last_days - first_days) * scale,
+            "start_time": pd.Series(first_labels, index, object),
+            "end_time": pd.Series(last_labels, index, object),
+        },
+        index=index,
+    )
 
 
 class TaskDict(TypedDict):
@@ -279,20 +239,118 @@ class DateRange(rx.Base):
     end_time: str | None
 
 
-class TaskRender(rx.Base):
+class TimelineRow(rx.Base):
+    """
+    A row of the timeline, either a milestone or a task of an expanded
+    milestone.
+    """
+
+    kind: Literal["milestone", "task"]
     id: int
-    date_range: DateRange | None
+    name: str
 
+    striped: bool
+    """
+    Whether the row belongs to an even milestone, rows are striped by
+    milestone.
+    """
+
+    expanded: bool = False
+    """
+    Whether the tasks of the milestone are shown, always False for a task.
+    """
+
+    critical: bool = False
+    """
+    Whether the task is on the critical path of the project.
+    """
 
-class MilestoneRender(rx.Base):
-    id: int
-    tasks: List[TaskRender]
     date_range: DateRange | None
+    """
+    The bar of the row, None if the row has no date or if the bar is outside
+    of the rendered window.
+    """
+
+
+class RowWindow(rx.Base):
+    rows: List[TimelineRow]
+
+    padding_top: int
+    """
+    Height in pixels of the rows above the window.
+    """
+
+    padding_bottom: int
+    """
+    Height in pixels of the rows below the window.
+    """
+
+
+class MonthHeader(rx.Base):
+    string: str
+    left: int
+    width: int
+
+
+ROW_HEIGHT = 40
+"""
+Height in pixels of every row of the timeline.
+"""
+
+DAY_WIDTH = 10
+"""
+Width in pixels of a day on the timeline.
+"""
+
+OVERSCAN_ROWS = 10
+"""
+Number of rows rendered beyond each edge of the viewport. The rendered rows
+only change once the viewport scrolled by this many rows.
+"""
+
+OVERSCAN_PIXELS = 1200
+"""
+Width in pixels rendered beyond each side of the viewport. The rendered
+bars and month headers only change once the viewport scrolled by this much.
+"""
+
+TIMELINE_VIEWPORT_ID = "timeline-viewport"
+
+VIEWPORT_SCRIPT = f"""
+(() => {{
+    const viewport = document.getElementById("{TIMELINE_VIEWPORT_ID}");
+    return viewport === null ? null : [
+        viewport.scrollLeft,
+        viewport.scrollTop,
+        viewport.clientWidth,
+        viewport.clientHeight,
+    ];
+}})()
+"""
+"""
+Reports the scroll position and the size of the timeline's viewport.
+"""
+
+
+def clip_date_range(
+    date_range: DateRange,
+    total_width: int,
+    window_left: int,
+    window_right: int,
+) -> DateRange | None:
+    """
+    Returns the date range if its bar overlaps the window, None otherwise.
+    """
+    left = date_range.left * total_width / 100
+    right = left + date_range.width * total_width / 100
+
+    if max(left, right) < window_left or min(left, right) > window_right:
+        return None
+
+    return date_range
 
 
 class TimelineState(rx.State):
-    sprint_data: pd.DataFrame = pd.DataFrame([])
-    milestone_data: pd.DataFrame = pd.DataFrame([])
     current_date: datetime = datetime.now()
     months: List[str] = []
     month_widths: List[float] = []
@@ -306,11 +364,31 @@ class TimelineState(rx.State):
     current_project_id: int | None = None
     current_project: J3ktMan.model.project.Project | None = None
 
+    window_left: int = 0
+    """
+    Left edge in pixels of the rendered part of the timeline.
+    """
+
+    window_right: int = 3 * OVERSCAN_PIXELS
+    """
+    Right edge in pixels of the rendered part of the timeline.
+    """
+
+    first_row: int = 0
+    """
+    Index of the first rendered row.
+    """
+
+    last_row: int = 6 * OVERSCAN_ROWS
+    """
+    Index of the row after the last rendered row.
+    """
+
     @rx.event
     async def on_mount(self):
         project_state = await self.get_state(ProjectState)
 
-        if project_state.data is None:
+        if project_state.project_id is None:
             return
 
         milestones = project_state.milestones
@@ -318,17 +396,43 @@ class TimelineState(rx.State):
             milestone.id: False for milestone in milestones
         }
 
+        return rx.call_script(
+            VIEWPORT_SCRIPT, callback=TimelineState.set_viewport
+        )
+
+    @rx.event
+    def set_viewport(self, viewport: list[float] | None):
+        """
+        Moves the rendered window to the viewport reported by
+        `VIEWPORT_SCRIPT`: `[scroll_left, scroll_top, width, height]`.
+        """
+        if viewport is None:
+            return
+
+        scroll_left, scroll_top, width, height = map(int, viewport)
+
+        window = get_window(scroll_left, width, OVERSCAN_PIXELS)
+        rows = get_window(
+            scroll_top // ROW_HEIGHT,
+            -(-height // ROW_HEIGHT) + 1,
+            OVERSCAN_ROWS,
+        )
+
+        # only touch the vars when the window moves, so that scrolling
+        # inside the overscan doesn't recompute anything
+        if window != (self.window_left, self.window_right):
+            self.window_left, self.window_right = window
+
+        if rows != (self.first_row, self.last_row):
+            self.first_row, self.last_row = rows
+
     @rx.event
     async def on_update(self):
         project_state = await self.get_state(ProjectState)
 
-        if project_state.data is None:
+        if project_state.project_id is None:
             return
 
-        self.current_project = project_state.data  # type: ignore
-        self.milestone_data = get_milestone_data(project_state.data)
-        self.sprint_data = get_sprint_data(project_state.data)
-
         self.set(
             milestones=[
                 {
@@ -358,30 +462,27 @@ class TimelineState(rx.State):
     async def task_date_rnage(self) -> tuple[datetime, datetime] | None:
         project_state = await self.get_state(ProjectState)
 
-        if project_state.data is None:
+        if project_state.project_id is None:
             return None
 
         # Get the start and end dates of the tasks
         all_dates = [
-            datetime.fromtimestamp(x.start_date)
-            for x in project_state.data.tasks_by_id.values()
-            if x.start_date is not None
-        ] + [
-            datetime.fromtimestamp(x.end_date)
-            for x in project_state.data.tasks_by_id.values()
-            if x.end_date is not None
+            date
+            for task in project_state._get_tasks()
+            for date in (task.start_date, task.end_date)
+            if date is not None
         ]
 
         if len(all_dates) == 0:
             return None
 
-        start = min(all_dates)
-        end = max(all_dates)
+        start = datetime.fromtimestamp(min(all_dates))
+        end = datetime.fromtimestamp(max(all_dates))
 
         return (start, end)
 
     @rx.var(cache=True)
-    async def all_month_ranges(self) -> list[MonthRange]:
+    async def _all_month_ranges(self) -> list[MonthRange]:
         task_date = await self.task_date_rnage
 
         if task_date is not None:
@@ -435,343 +536,384 @@ class TimelineState(rx.State):
     @rx.var(cache=True)
     async def total_days(self) -> int:
         """Compute the total number of days in the timeline."""
-        all_month_ranges = await self.all_month_ranges
+        all_month_ranges = await self._all_month_ranges
         total_days = sum(month.day_count for month in all_month_ranges)
         return total_days
 
     @rx.var(cache=True)
     async def total_width_pixels(self) -> int:
         """Compute the total width of the timeline in pixels."""
-        return await self.total_days * 10
+        return await self.total_days * DAY_WIDTH
+
+    @rx.var(cache=True)
+    async def _sprint_data(self) -> pd.DataFrame:
+        project_state = await self.get_state(ProjectState)
+
+        # read here, the dependencies aren't detected through the state
+        # passed to a function
+        tasks = project_state._get_tasks()
+
+        return get_sprint_data(tasks).set_index("id")
 
     @rx.var(cache=True)
-    async def render_milestone(self) -> list[MilestoneRender]:
-        all_month_ranges = await self.all_month_ranges
-        total_days = await self.total_days
-        first_month = datetime(
+    async def _first_month(self) -> datetime:
+        all_month_ranges = await self._all_month_ranges
+
+        return datetime(
             all_month_ranges[0].year, all_month_ranges[0].month, 1
         )
 
+    @rx.var(cache=True)
+    async def _task_layout(self) -> pd.DataFrame:
+        return layout_tasks(
+            await self._sprint_data,
+            await self._first_month,
+            await self.total_days,
+        )
+
+    @rx.var(cache=True)
+    async def _milestone_layout(self) -> pd.DataFrame:
+        return layout_milestones(
+            await self._sprint_data,
+            await self._first_month,
+            await self.total_days,
+        )
+
+    @rx.var(cache=True)
+    async def _critical_task_ids(self) -> set[int]:
         project_state = await self.get_state(ProjectState)
 
-        if project_state.data is None:
-            return []
+        if project_state.project_id is None:
+            return set()
 
-        data = project_state.data
+        # recomputed whenever the tasks, and so their dates, change
+        await self._sprint_data
 
-        milestone_renders = []
-        for milestone in project_state.milestones:
-            task_renders = []
-            for task in milestone.task_ids:
-                task_data = data.tasks_by_id[task]
-                start_info = None
-                end_info = None
+        return await aio.get_critical_task_ids(project_state.project_id)
 
-                if task_data.start_date is not None:
-                    start_date = datetime.fromtimestamp(task_data.start_date)
-                    delta = start_date - first_month
-                    left_percent = (delta.days / total_days) * 100
+    @rx.var(cache=True)
+    async def row_window(self) -> RowWindow:
+        """
+        The rows inside the rendered window. The layout of the whole
+        timeline is kept on the backend, only the visible rows are sent.
+        """
+        project_state = await self.get_state(ProjectState)
 
-                    start_info = (
-                        left_percent,
-                        datetime.strftime(start_date, "%Y-%m-%d"),
-                    )
+        if project_state.project_id is None:
+            return RowWindow(rows=[], padding_top=0, padding_bottom=0)
 
-                if task_data.end_date is not None:
-                    end_date = datetime.fromtimestamp(task_data.end_date)
-                    delta = end_date - first_month
-                    left_percent = (delta.days / total_days) * 100
+        # (kind, id, milestone index) of the rows inside the window, the
+        # rows of the milestones outside of it are only counted
+        selected: list[tuple[str, int, int]] = []
+        row_count = 0
 
-                    end_info = (
-                        left_percent,
-                        datetime.strftime(end_date, "%Y-%m-%d"),
-                    )
+        for index, milestone in enumerate(project_state.milestones):
+            task_ids = project_state._get_milestone_task_ids(milestone.id)
+            expanded = self.expanded_milestones.get(milestone.id, False)
 
-                date_range = None
-                match (start_info, end_info):
-                    case (None, None):
-                        pass
-
-                    case (None, tuple(end_info)):
-                        date_range = DateRange(
-                            left=end_info[0],
-                            width=-(5 / total_days) * 100,
-                            start_time=None,
-                            end_time=end_info[1],
-                        )
+            if self.first_row <= row_count < self.last_row:
+                selected.append(("milestone", milestone.id, index))
 
-                    case (tuple(start_info), None):
-                        date_range = DateRange(
-                            left=start_info[0],
-                            width=(5 / total_days) * 100,
-                            start_time=start_info[1],
-                            end_time=None,
-                        )
+            row_count += 1
 
-                    case (tuple(start_info), tuple(end_info)):
-                        start_left = start_info[0]
-                        end_left = end_info[0]
-                        width = end_left - start_left
-                        date_range = DateRange(
-                            left=start_left,
-                            width=width,
-                            start_time=start_info[1],
-                            end_time=end_info[1],
-                        )
+            if expanded:
+                first = max(0, self.first_row - row_count)
+                last = max(0, min(len(task_ids), self.last_row - row_count))
 
-                task_renders.append(
-                    TaskRender(
-                        id=task_data.id,
-                        date_range=date_range,
-                    )
+                selected.extend(
+                    ("task", task_id, index)
+                    for task_id in itertools.islice(task_ids, first, last)
                 )
 
-            all_dates = [
-                datetime.fromtimestamp(x.start_date)
-                for x in map(
-                    lambda x: data.tasks_by_id[x],
-                    milestone.task_ids,
-                )
-                if x.start_date is not None
-            ] + [
-                datetime.fromtimestamp(x.end_date)
-                for x in map(
-                    lambda x: data.tasks_by_id[x],
-                    milestone.task_ids,
-                )
-                if x.end_date is not None
-            ]
+                row_count += len(task_ids)
+
+        task_layout = await self._task_layout
+        milestone_layout = await self._milestone_layout
+        critical_task_ids = await self._critical_task_ids
+        total_width = await self.total_width_pixels
+
+        def date_range(layout: pd.DataFrame, id: int) -> DateRange | None:
+            if id not in layout.index:
+                return None
+
+            left, width, start_time, end_time = layout.loc[
+                id, ["left", "width", "start_time", "end_time"]
+            ].tolist()
 
-            if len(all_dates) == 0:
-                milestone_renders.append(
-                    MilestoneRender(
-                        id=milestone.id,
-                        tasks=task_renders,
-                        date_range=None,
+            if np.isnan(left):
+                return None
+
+            return clip_date_range(
+                DateRange(
+                    left=left,
+                    width=width,
+                    start_time=start_time,
+                    end_time=end_time,
+                ),
+                total_width,
+                self.window_left,
+                self.window_right,
+            )
+
+        rows = []
+        for kind, id, index in selected:
+            if kind == "milestone":
+                rows.append(
+                    TimelineRow(
+                        kind="milestone",
+                        id=id,
+                        name=project_state.milestones_by_id[id].name,
+                        striped=index % 2 == 0,
+                        expanded=self.expanded_milestones.get(id, False),
+                        date_range=date_range(milestone_layout, id),
                     )
                 )
-
             else:
-                start = min(all_dates)
-                end = max(all_dates)
-
-                left = ((start - first_month).days / total_days) * 100
-                right = ((end - first_month).days / total_days) * 100
-
-                width = right - left
-
-                milestone_renders.append(
-                    MilestoneRender(
-                        id=milestone.id,
-                        tasks=task_renders,
-                        date_range=DateRange(
-                            left=left,
-                            width=width,
-                            start_time=datetime.strftime(start, "%Y-%m-%d"),
-                            end_time=datetime.strftime(end, "%Y-%m-%d"),
-                        ),
+                rows.append(
+                    TimelineRow(
+                        kind="task",
+                        id=id,
+                        name=project_state._get_task(id).name,  # type: ignore
+                        striped=index % 2 == 0,
+                        critical=id in critical_task_ids,
+                        date_range=date_range(task_layout, id),
                     )
                 )
 
-        return milestone_renders
+        first_row = min(self.first_row, row_count)
+
+        return RowWindow(
+            rows=rows,
+            padding_top=first_row * ROW_HEIGHT,
+            padding_bottom=(row_count - first_row - len(rows)) * ROW_HEIGHT,
+        )
+
+    @rx.var(cache=True)
+    async def visible_months(self) -> list[MonthHeader]:
+        """
+        The month headers inside the rendered window.
+        """
+        headers = []
+        left = 0
+
+        for month in await self._all_month_ranges:
+            width = month.day_count * DAY_WIDTH
+
+            if left + width >= self.window_left and left <= self.window_right:
+                headers.append(
+                    MonthHeader(string=month.string, left=left, width=width)
+                )
+
+            left += width
+
+        return headers
+
+
+def row_window() -> ObjectVar[RowWindow]:
+    """
+    `TimelineState.row_window` typed as the window it holds, the async
+    computed vars are typed as the coroutines they return.
+    """
+    return TimelineState.row_window.to(ObjectVar, RowWindow)
+
+
+def visible_months() -> ArrayVar[list[MonthHeader]]:
+    """
+    `TimelineState.visible_months` typed as the headers it holds.
+    """
+    return TimelineState.visible_months.to(ArrayVar, list[MonthHeader])
 
 
 def render_month_headers():
-    """Render the month headers dynamically."""
-    return rx.hstack(
+    """Render the month headers inside the rendered window."""
+    return rx.box(
         rx.foreach(
-            TimelineState.all_month_ranges,  # type: ignore
+            visible_months(),
             lambda month: month_header(
                 month.string,
-                width=f"{month.day_count * 10}px",  # type: ignore
+                width=f"{month.width}px",
+                left=f"{month.left}px",
             ),
         ),
-        spacing="0",
+        position="sticky",
+        top="0",
+        z_index="1",
+        height=f"{ROW_HEIGHT}px",
         width=f"{TimelineState.total_width_pixels}px",
+        class_name=rx.color_mode_cond(
+            light="bg-zinc-200",
+            dark="bg-zinc-800",
+        ),
     )
 
 
-def render_task_name():
-    """Render the milestone names and their tasks (when expanded)."""
+def row_class_name(row: TimelineRow) -> rx.Var:
+    return rx.cond(
+        row.striped,
+        rx.color_mode_cond(
+            light="bg-zinc-100",
+            dark="bg-zinc-900",
+        ),
+        "",
+    )
 
-    def render_milestone_name(
-        milestone: MilestoneData, index: int
-    ) -> rx.Component:
-        is_expanded = TimelineState.expanded_milestones[milestone.id]
-        data: ProjectData = ProjectState.data  # type: ignore
 
-        return rx.vstack(
-            rx.hstack(
-                rx.button(
-                    # tag="chevron-right" if not is_expanded else "chevron-down",
-                    rx.icon(
-                        rx.cond(
-                            is_expanded,
-                            "chevron-down",
-                            "chevron-right",
-                        ),
-                        size=1,
-                    ),
-                    on_click=lambda: TimelineState.toggle_milestone(
-                        milestone.id  # type:ignore
+def render_task_name():
+    """Render the names of the rows inside the rendered window."""
+
+    def render_milestone_name(row: TimelineRow) -> rx.Component:
+        return rx.hstack(
+            rx.button(
+                rx.icon(
+                    rx.cond(
+                        row.expanded,
+                        "chevron-down",
+                        "chevron-right",
                     ),
-                    cursor="pointer",
-                    margin_right="0.5rem",
-                    variant="ghost",
-                    color_scheme="gray",
-                    class_name="p-0 ml-1",
+                    size=1,
                 ),
-                rx.text(
-                    milestone.name,
-                    font_size="14px",
-                    font_weight="bold",
-                    class_name="line-clamp-1 grow",
+                on_click=lambda: TimelineState.toggle_milestone(
+                    row.id  # type:ignore
                 ),
-                # a + button to create a new task under the milestone
-                create_task_dialog(milestone),
-                spacing="2",
-                align_items="center",
-                width="100%",
-                height="40px",
+                cursor="pointer",
+                margin_right="0.5rem",
+                variant="ghost",
+                color_scheme="gray",
+                class_name="p-0 ml-1",
             ),
-            rx.cond(
-                is_expanded,
-                rx.foreach(
-                    milestone.task_ids,
-                    lambda task_id: rx.box(
-                        rx.hstack(
-                            task_dialog(
-                                trigger=rx.dialog.trigger(
-                                    rx.button(
-                                        rx.hstack(
-                                            rx.icon(
-                                                tag="brackets",
-                                                size=12,
-                                                class_name="my-auto",
-                                            ),
-                                            rx.text(
-                                                data.tasks_by_id[task_id].name,
-                                                font_size="14px",
-                                                font_weight="medium",
-                                                class_name="my-auto line-clamp-1 ",
-                                            ),
-                                            class_name="flex",
-                                            width="100%",
-                                        ),
-                                        variant="ghost",
-                                        color_scheme="gray",
-                                        width="95%",
-                                    )
+            rx.text(
+                row.name,
+                font_size="14px",
+                font_weight="bold",
+                class_name="line-clamp-1 grow",
+            ),
+            # a + button to create a new task under the milestone
+            create_task_dialog(row),
+            spacing="2",
+            align_items="center",
+            width="100%",
+            height=f"{ROW_HEIGHT}px",
+        )
+
+    def render_task_name(row: TimelineRow) -> rx.Component:
+        return rx.box(
+            rx.hstack(
+                task_dialog(
+                    trigger=rx.dialog.trigger(
+                        rx.button(
+                            rx.hstack(
+                                rx.icon(
+                                    tag="brackets",
+                                    size=12,
+                                    class_name="my-auto",
+                                ),
+                                rx.text(
+                                    row.name,
+                                    font_size="14px",
+                                    font_weight="medium",
+                                    class_name="my-auto line-clamp-1 ",
                                 ),
-                                task_id=task_id,
+                                class_name="flex",
+                                width="100%",
                             ),
-                            class_name="my-auto",
-                            width="100%",
-                        ),
-                        padding_left="2rem",
-                        height="40px",
-                        class_name="flex",
+                            variant="ghost",
+                            color_scheme="gray",
+                            width="95%",
+                        )
                     ),
+                    task_id=row.id,
                 ),
+                class_name="my-auto",
+                width="100%",
             ),
-            width="100%",
-            spacing="0",
-            align_items="stretch",
-            class_name="border-r "
-            + rx.color_mode_cond(  # type: ignore
-                light="border-zinc-200 ",
-                dark="border-zinc-800 ",
-            )
-            + rx.cond(  # type: ignore
-                index % 2 == 0,
-                rx.color_mode_cond(
-                    light="bg-zinc-100",
-                    dark="bg-zinc-900",
-                ),
-                "",
-            ),
+            padding_left="2rem",
+            height=f"{ROW_HEIGHT}px",
+            class_name="flex",
         )
 
     return rx.fragment(
         rx.box(
-            height="40px",
+            position="sticky",
+            top="0",
+            z_index="1",
+            height=f"{ROW_HEIGHT}px",
             class_name=rx.color_mode_cond(
                 light="bg-zinc-200 border-r border-zinc-300",
                 dark="bg-zinc-800 border-r border-zinc-700",
             ),
         ),  # ensure the first task name aligns with the first timeline bar
+        rx.box(height=f"{row_window().padding_top}px"),
         rx.foreach(
-            ProjectState.milestones,
-            lambda milestone, index: render_milestone_name(milestone, index),
+            row_window().rows,
+            lambda row: rx.box(
+                rx.cond(
+                    row.kind == "milestone",
+                    render_milestone_name(row),
+                    render_task_name(row),
+                ),
+                width="100%",
+                class_name="border-r "
+                + rx.color_mode_cond(  # type: ignore
+                    light="border-zinc-200 ",
+                    dark="border-zinc-800 ",
+                )
+                + row_class_name(row),
+            ),
         ),
+        rx.box(height=f"{row_window().padding_bottom}px"),
     )
 
 
-def render_tasks():
-    """Render the milestone rows with timeline bars (collapsed or expanded)."""
-
-    def render_milestone_row(
-        milestone: MilestoneRender, index: int
-    ) -> rx.Component:
-        is_expanded = TimelineState.expanded_milestones[milestone.id]
-        return rx.vstack(
-            rx.hstack(
+def milestone_row(row: TimelineRow) -> rx.Component:
+    return rx.hstack(
+        rx.box(
+            # timeline bar
+            rx.cond(
+                row.date_range,
                 rx.box(
-                    # timeline bar
-                    rx.cond(
-                        milestone.date_range,
-                        rx.box(
-                            position="absolute",
-                            left=f"{milestone.date_range.left}%",  # type: ignore
-                            width=f"{milestone.date_range.width}%",  # type: ignore
-                            height="100%",
-                            border_radius="3px",
-                            class_name="my-auto bg-gradient-to-r shadow-lg "  # type:ignore
-                            + rx.color_mode_cond(
-                                light="from-indigo-500 to-purple-400",
-                                dark="from-indigo-400 to-purple-700",
-                            ),
-                        ),
-                    ),
-                    position="relative",
+                    position="absolute",
+                    left=f"{row.date_range.left}%",  # type: ignore
+                    width=f"{row.date_range.width}%",  # type: ignore
                     height="100%",
-                    width=f"{TimelineState.total_width_pixels}px",
-                    class_name="my-auto flex",
-                ),
-                width="100%",
-                padding_y="0.5rem",
-                height="40px",
-            ),
-            rx.cond(
-                is_expanded,
-                rx.foreach(
-                    milestone.tasks,
-                    lambda task: task_row(task),
-                ),
-            ),
-            spacing="0",
-            width="100%",
-            class_name=rx.cond(
-                index % 2 == 0,
-                rx.color_mode_cond(
-                    light="bg-zinc-100",
-                    dark="bg-zinc-900",
+                    border_radius="3px",
+                    class_name="my-auto bg-gradient-to-r shadow-lg "  # type:ignore
+                    + rx.color_mode_cond(
+                        light="from-indigo-500 to-purple-400",
+                        dark="from-indigo-400 to-purple-700",
+                    ),
                 ),
-                "",
             ),
-        )
+            position="relative",
+            height="100%",
+            width=f"{TimelineState.total_width_pixels}px",
+            class_name="my-auto flex",
+        ),
+        width="100%",
+        padding_y="0.5rem",
+        height=f"{ROW_HEIGHT}px",
+    )
 
-    return rx.fragment(
-        rx.box(
-            rx.foreach(
-                TimelineState.render_milestone,  # type: ignore
-                lambda milestone, index: render_milestone_row(
-                    milestone, index
+
+def render_tasks():
+    """Render the timeline bars of the rows inside the rendered window."""
+
+    return rx.box(
+        rx.box(height=f"{row_window().padding_top}px"),
+        rx.foreach(
+            row_window().rows,
+            lambda row: rx.box(
+                rx.cond(
+                    row.kind == "milestone",
+                    milestone_row(row),
+                    task_row(row),
                 ),
+                width="100%",
+                class_name=row_class_name(row),
             ),
-            width="100%",
-            min_width=f"{TimelineState.total_width_pixels}px",  # Ensure the tasks area matches the headers
-        )
+        ),
+        rx.box(height=f"{row_window().padding_bottom}px"),
+        width="100%",
+        min_width=f"{TimelineState.total_width_pixels}px",  # Ensure the tasks area matches the headers
     )
 
 
@@ -786,54 +928,60 @@ def timeline_view() -> rx.Component:
                 rx.text(
                     "Project Timeline", class_name="text-3xl font-bold mb-20"
                 ),
-                rx.flex(
-                    rx.box(
-                        render_task_name(),
-                        # Create new milestone button in the last row
-                        create_milestone_dialog(
-                            trigger=rx.box(
-                                rx.button(
-                                    rx.hstack(
-                                        rx.icon(
-                                            tag="plus", class_name="my-auto"
-                                        ),
-                                        rx.text(
-                                            "Create New Milestone",
-                                            class_name="my-auto",
+                rx.box(
+                    rx.flex(
+                        rx.box(
+                            render_task_name(),
+                            # Create new milestone button in the last row
+                            create_milestone_dialog(
+                                trigger=rx.box(
+                                    rx.button(
+                                        rx.hstack(
+                                            rx.icon(
+                                                tag="plus",
+                                                class_name="my-auto",
+                                            ),
+                                            rx.text(
+                                                "Create New Milestone",
+                                                class_name="my-auto",
+                                            ),
+                                            class_name="flex",
                                         ),
-                                        class_name="flex",
+                                        variant="soft",
+                                        color_scheme="indigo",
+                                        width="100%",
                                     ),
-                                    variant="soft",
-                                    color_scheme="indigo",
-                                    width="100%",
-                                ),
-                                class_name="p-4",
-                            )
+                                    class_name="p-4",
+                                )
+                            ),
+                            width="400px",
+                            flex_shrink="0",
+                            align_items="flex-start",
+                            height="auto",
+                            # the names stay visible while scrolling the bars
+                            position="sticky",
+                            left="0",
+                            z_index="2",
+                            background_color="var(--color-background)",
                         ),
-                        width="400px",
-                        align_items="flex-start",
-                        height="auto",
-                    ),
-                    rx.scroll_area(
                         rx.vstack(
-                            rx.hstack(
-                                render_month_headers(),
-                                spacing="0",
-                                width="100%",
-                                overflow_x="auto",
-                            ),
+                            render_month_headers(),
                             render_tasks(),
                             spacing="0",
                             width=f"{TimelineState.total_width_pixels}px",
                         ),
-                        height="auto",
-                        overflow_x="auto",
-                        scrollbars="horizontal",
+                        direction="row",
+                        width="max-content",
+                        min_width="100%",
+                        spacing="0",
                     ),
-                    direction="row",
+                    id=TIMELINE_VIEWPORT_ID,
+                    on_scroll=rx.call_script(
+                        VIEWPORT_SCRIPT, callback=TimelineState.set_viewport
+                    ).debounce(50),
+                    overflow="auto",
                     width="100%",
-                    spacing="0",
-                    height="100%",
+                    height="70vh",
                 ),
                 width="100%",
                 spacing="5",
@@ -862,8 +1010,8 @@ class TooltipState(rx.State):
         self.hovered_task_id = None
 
 
-def month_header(month: str, width: str) -> rx.Component:
-    """Month header box."""
+def month_header(month: str, width: str, left: str) -> rx.Component:
+    """Month header box, positioned inside the month headers row."""
     return rx.box(
         rx.text(
             month,
@@ -872,7 +1020,9 @@ def month_header(month: str, width: str) -> rx.Component:
             weight="bold",
         ),
         width=width,
-        height="40px",
+        height=f"{ROW_HEIGHT}px",
+        position="absolute",
+        left=left,
         class_name="flex my-auto "  # type: ignore
         + rx.color_mode_cond(
             light="bg-zinc-200 border-r border-zinc-300",
@@ -881,7 +1031,7 @@ def month_header(month: str, width: str) -> rx.Component:
     )
 
 
-def task_box(task: TaskRender, date_range: DateRange):
+def task_box(task: TimelineRow, date_range: DateRange):
     start_pos = date_range.left
     end_pos = date_range.left + date_range.width
 
@@ -1011,14 +1161,21 @@ def task_box(task: TaskRender, date_range: DateRange):
         width=f"{width_percent}%",
         border_radius="3px",
         class_name="my-auto bg-gradient-to-r shadow-sm "  # type:ignore
-        + rx.color_mode_cond(
-            light="from-indigo-500 to-purple-400",
-            dark="from-indigo-400 to-purple-700",
+        + rx.cond(
+            task.critical,
+            rx.color_mode_cond(
+                light="from-red-500 to-orange-400",
+                dark="from-red-400 to-orange-700",
+            ),
+            rx.color_mode_cond(
+                light="from-indigo-500 to-purple-400",
+                dark="from-indigo-400 to-purple-700",
+            ),
         ),
     )
 
 
-def task_row(task: TaskRender) -> rx.Component:
+def task_row(task: TimelineRow) -> rx.Component:
     return rx.hstack(
         rx.box(
             rx.cond(
@@ -1031,7 +1188,7 @@ def task_row(task: TaskRender) -> rx.Component:
         ),
         width="100%",
         padding_y="0.5rem",
-        height="40px",
+        height=f"{ROW_HEIGHT}px",
     )
 
 
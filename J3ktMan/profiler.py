@@ -0,0 +1,254 @@
+"""
+Opt-in profiler of the database work done by each event handler and computed
+var, enabled by setting `DATABASE_PROFILE=1`.
+
+Every event handler and every recomputation of a computed var is tracked,
+e.g. `State.load_project` or `TimelineState._critical_task_ids`, together
+with the `aio` calls it awaits. The queries are counted with the engine's
+events, the work of each tracked call is logged on one line, and the work of
+each `aio` call with the function that awaited it:
+
+    State.load_project -> get_project_snapshot: 4 queries, 12.3ms, 1042 rows,
+    1 checkouts
+    State.load_project: 4 queries, 12.3ms, 1042 rows, 1 checkouts
+
+The totals per event handler and computed var are kept for the lifetime of
+the process and served at `/_health/db/profile`, so N+1 patterns show up as
+callers whose query count grows with the size of the project.
+"""
+
+from reflex.state import BaseState
+from reflex.vars.base import AsyncComputedVar, ComputedVar
+from sqlalchemy import event
+import reflex as rx
+import sqlalchemy
+
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+
+class CallStats(rx.Base):
+    calls: int = 0
+    queries: int = 0
+    seconds: float = 0.0
+    """
+    Total time spent executing the queries.
+    """
+
+    rows: int = 0
+    """
+    Rows returned or affected, as reported by the database driver.
+    """
+
+    checkouts: int = 0
+    """
+    Connections checked out of the pool.
+    """
+
+
+class ProfileEntry(rx.Base):
+    caller: str
+    stats: CallStats
+
+
+_current_stats: contextvars.ContextVar[CallStats | None] = (
+    contextvars.ContextVar("current_stats", default=None)
+)
+
+_totals: dict[str, CallStats] = {}
+_lock = threading.Lock()
+"""
+Guards the totals and the stats shared with the `aio` calls, which run on
+other threads.
+"""
+
+_hooks_installed = False
+
+
+def is_enabled() -> bool:
+    return os.getenv("DATABASE_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+def install(engine: sqlalchemy.Engine) -> None:
+    """
+    Listens to the queries and the checkouts of the engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.pool, "checkout", _on_checkout)
+
+
+def install_state_hooks() -> None:
+    """
+    Tracks the event handlers and the computed vars of every Reflex state.
+    """
+    global _hooks_installed
+
+    if _hooks_installed:
+        return
+
+    _hooks_installed = True
+    process_event = BaseState._process_event
+
+    async def tracked_process_event(self, handler, state, payload):
+        with track(handler.fn.__qualname__):
+            async for update in process_event(self, handler, state, payload):
+                yield update
+
+    # the getters are only called when a var is recomputed, cache hits
+    # aren't counted
+    setattr(BaseState, "_process_event", tracked_process_event)
+    setattr(
+        ComputedVar, "fget", property(lambda var: _tracked_getter(var._fget))
+    )
+    setattr(
+        AsyncComputedVar,
+        "fget",
+        property(lambda var: _tracked_async_getter(var._fget)),
+    )
+
+
+@contextlib.contextmanager
+def track(caller: str) -> Iterator[None]:
+    """
+    Attributes the database work done inside the block, including the `aio`
+    calls it awaits, to the caller. The work of a nested block is only
+    attributed to the nested caller.
+    """
+    stats = CallStats(calls=1)
+    previous = _current_stats.get()
+    _current_stats.set(stats)
+
+    try:
+        yield
+    finally:
+        # restored rather than reset with a token, an event handler's
+        # generator may be closed from another context
+        _current_stats.set(previous)
+
+        if stats.queries or stats.checkouts:
+            _log(caller, stats)
+
+            with _lock:
+                _add(_totals.setdefault(caller, CallStats()), stats)
+
+
+def profile(
+    call: Callable[[], R], caller: str, callee: str
+) -> Callable[[], R]:
+    """
+    Returns the call wrapped so that its database work is logged and added to
+    the work of the tracked event handler or computed var awaiting it, or to
+    the totals of the caller outside of one. The call must run in its own
+    context.
+    """
+    parent = _current_stats.get()
+
+    def profiled() -> R:
+        stats = CallStats(calls=1)
+        _current_stats.set(stats)
+
+        try:
+            return call()
+        finally:
+            _log(f"{caller} -> {callee}", stats)
+
+            with _lock:
+                if parent is None:
+                    _add(_totals.setdefault(caller, CallStats()), stats)
+                else:
+                    stats.calls = 0
+                    _add(parent, stats)
+
+    return profiled
+
+
+def get_report() -> list[ProfileEntry]:
+    """
+    Returns the totals of every caller, the most queries first.
+    """
+    with _lock:
+        entries = [
+            ProfileEntry(caller=caller, stats=stats.copy())
+            for caller, stats in _totals.items()
+        ]
+
+    return sorted(entries, key=lambda entry: -entry.stats.queries)
+
+
+def _log(caller: str, stats: CallStats) -> None:
+    logger.info(
+        "%s: %d queries, %.1fms, %d rows, %d checkouts",
+        caller,
+        stats.queries,
+        stats.seconds * 1000,
+        stats.rows,
+        stats.checkouts,
+    )
+
+
+def _add(total: CallStats, stats: CallStats) -> None:
+    total.calls += stats.calls
+    total.queries += stats.queries
+    total.seconds += stats.seconds
+    total.rows += stats.rows
+    total.checkouts += stats.checkouts
+
+
+def _tracked_getter(fget: Callable[[Any], R]) -> Callable[[Any], R]:
+    @functools.wraps(fget)
+    def getter(state: Any) -> R:
+        with track(fget.__qualname__):
+            return fget(state)
+
+    return getter
+
+
+def _tracked_async_getter(
+    fget: Callable[[Any], Awaitable[R]],
+) -> Callable[[Any], Awaitable[R]]:
+    @functools.wraps(fget)
+    async def getter(state: Any) -> R:
+        with track(fget.__qualname__):
+            return await fget(state)
+
+    return getter
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, *_):
+    # kept on the statement's context rather than the connection, nothing
+    # is left behind when the statement fails
+    context._profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, *_):
+    start = context._profiler_start
+    stats = _current_stats.get()
+
+    if stats is None:
+        return
+
+    with _lock:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - start
+        stats.rows += max(cursor.rowcount, 0)
+
+
+def _on_checkout(*_: Any) -> None:
+    stats = _current_stats.get()
+
+    if stats is None:
+        return
+
+    with _lock:
+        stats.checkouts += 1
@@ -0,0 +1,358 @@
+"""
+Critical path method over the dependency graph of a project.
+
+Every task is scheduled as early as its own dates and its dependencies allow
+(forward pass), then as late as possible without delaying the end of the
+project (backward pass). Both passes visit each task and edge once, in the
+topological order maintained by `DependencyGraph`.
+
+Changing the dates of a single task or adding a single dependency only
+propagates through the tasks whose schedule actually changes.
+"""
+
+from typing import Iterable, NamedTuple
+
+import heapq
+
+from .dependency_graph import DependencyGraph
+
+
+class TaskDates(NamedTuple):
+    start_date: int | None
+    end_date: int | None
+
+
+class TaskTiming(NamedTuple):
+    """
+    Schedule of a single task, in Unix epoch seconds.
+    """
+
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+
+    @property
+    def slack(self) -> int:
+        """
+        How long the task can be delayed without delaying the project.
+        """
+        return self.latest_start - self.earliest_start
+
+    @property
+    def critical(self) -> bool:
+        return self.slack == 0
+
+
+def _anchor(dates: TaskDates) -> int | None:
+    """
+    Returns the date before which the task can't start, None for a task
+    without any date.
+    """
+    if dates.start_date is not None:
+        return dates.start_date
+
+    return dates.end_date
+
+
+def _duration(dates: TaskDates) -> int:
+    if dates.start_date is None or dates.end_date is None:
+        return 0
+
+    return dates.end_date - dates.start_date
+
+
+class ProjectSchedule:
+    """
+    Earliest and latest start/finish of every task of a project. The
+    schedule keeps a reference to the graph and must be notified of every
+    change made to it through `set_task_dates`, `add_dependency` and
+    `remove_dependency`.
+    """
+
+    def __init__(
+        self, graph: DependencyGraph, dates: dict[int, TaskDates]
+    ) -> None:
+        self._graph = graph
+        self._dates = dict(dates)
+
+        for task_id in self._dates:
+            graph.add_task(task_id)
+
+        for task_id in graph.topological_order():
+            self._dates.setdefault(task_id, TaskDates(None, None))
+
+        self._earliest_start: dict[int, int] = {}
+        self._earliest_finish: dict[int, int] = {}
+        self._latest_start: dict[int, int] = {}
+        self._latest_finish: dict[int, int] = {}
+
+        self._project_start = 0
+        self._project_end = 0
+
+        self._compute()
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """
+        The dependency graph of the schedule, only to be read: it must only
+        be changed through the schedule.
+        """
+        return self._graph
+
+    @property
+    def project_start(self) -> int:
+        return self._project_start
+
+    @property
+    def project_end(self) -> int:
+        return self._project_end
+
+    def timing(self, task_id: int) -> TaskTiming:
+        return TaskTiming(
+            earliest_start=self._earliest_start[task_id],
+            earliest_finish=self._earliest_finish[task_id],
+            latest_start=self._latest_start[task_id],
+            latest_finish=self._latest_finish[task_id],
+        )
+
+    def timings(self) -> dict[int, TaskTiming]:
+        return {task_id: self.timing(task_id) for task_id in self._dates}
+
+    def critical_tasks(self) -> set[int]:
+        """
+        Returns the tasks that have no slack. Tasks without any date are
+        never critical.
+        """
+        return {
+            task_id
+            for task_id, dates in self._dates.items()
+            if _anchor(dates) is not None
+            and self._latest_start[task_id] == self._earliest_start[task_id]
+        }
+
+    def critical_path(self) -> list[int]:
+        """
+        Returns one chain of critical tasks, from a task that starts the
+        project to the task that ends it.
+        """
+        critical = self.critical_tasks()
+
+        current = next(
+            (
+                task_id
+                for task_id in sorted(critical)
+                if self._earliest_finish[task_id] == self._project_end
+            ),
+            None,
+        )
+
+        path: list[int] = []
+        while current is not None:
+            path.append(current)
+            start = self._earliest_start[current]
+
+            current = next(
+                (
+                    dependency
+                    for dependency in sorted(
+                        self._graph.dependencies(current)
+                    )
+                    if dependency in critical
+                    and self._earliest_finish[dependency] == start
+                ),
+                None,
+            )
+
+        path.reverse()
+        return path
+
+    def set_task_dates(
+        self,
+        task_id: int,
+        start_date: int | None,
+        end_date: int | None,
+    ) -> None:
+        """
+        Updates the dates of the task, adding it if needed, and reschedules
+        the tasks affected by the change.
+        """
+        self._graph.add_task(task_id)
+        self._dates[task_id] = TaskDates(start_date, end_date)
+
+        self._update([task_id], [task_id])
+
+    def add_dependency(self, dependency: int, dependant: int) -> None:
+        """
+        Adds the edge to the graph and reschedules the tasks affected by it.
+        Throws `CycleError` like `DependencyGraph.add_edge`.
+        """
+        self._graph.add_edge(dependency, dependant)
+
+        for task_id in (dependency, dependant):
+            self._dates.setdefault(task_id, TaskDates(None, None))
+
+        # both ends are seeded in both passes, either may be new to the
+        # schedule and have no dates computed yet
+        self._update([dependency, dependant], [dependant, dependency])
+
+    def remove_dependency(self, dependency: int, dependant: int) -> None:
+        """
+        Removes the edge from the graph, if it exists, and reschedules the
+        tasks affected by it.
+        """
+        if not self._graph.has_edge(dependency, dependant):
+            return
+
+        self._graph.remove_edge(dependency, dependant)
+        self._update([dependant], [dependency])
+
+    def _first_anchor(self) -> int:
+        """
+        Returns the earliest date of the project, where the tasks without
+        any date or dependency are scheduled.
+        """
+        return min(
+            (
+                anchor
+                for anchor in map(_anchor, self._dates.values())
+                if anchor is not None
+            ),
+            default=0,
+        )
+
+    def _compute(self) -> None:
+        """
+        Full forward and backward passes, O(tasks + dependencies) once the
+        topological order is known.
+        """
+        order = [
+            task_id
+            for task_id in self._graph.topological_order()
+            if task_id in self._dates
+        ]
+
+        self._project_start = self._first_anchor()
+
+        for task_id in order:
+            self._forward(task_id)
+
+        self._project_end = max(
+            self._earliest_finish.values(), default=self._project_start
+        )
+
+        for task_id in reversed(order):
+            self._backward(task_id)
+
+    def _forward(self, task_id: int) -> bool:
+        """
+        Recomputes the earliest start/finish of the task from its
+        dependencies. Returns True if they changed.
+        """
+        dates = self._dates[task_id]
+        anchor = _anchor(dates)
+
+        start = max(
+            (
+                self._earliest_finish[dependency]
+                for dependency in self._graph.dependencies(task_id)
+            ),
+            default=self._project_start,
+        )
+        if anchor is not None:
+            start = max(start, anchor)
+
+        finish = start + _duration(dates)
+
+        changed = (
+            self._earliest_start.get(task_id) != start
+            or self._earliest_finish.get(task_id) != finish
+        )
+        self._earliest_start[task_id] = start
+        self._earliest_finish[task_id] = finish
+
+        return changed
+
+    def _backward(self, task_id: int) -> bool:
+        """
+        Recomputes the latest start/finish of the task from its dependants.
+        Returns True if they changed.
+        """
+        finish = min(
+            (
+                self._latest_start[dependant]
+                for dependant in self._graph.dependants(task_id)
+            ),
+            default=self._project_end,
+        )
+        start = finish - _duration(self._dates[task_id])
+
+        changed = (
+            self._latest_start.get(task_id) != start
+            or self._latest_finish.get(task_id) != finish
+        )
+        self._latest_start[task_id] = start
+        self._latest_finish[task_id] = finish
+
+        return changed
+
+    def _update(
+        self, forward_seeds: Iterable[int], backward_seeds: Iterable[int]
+    ) -> None:
+        """
+        Propagates a change through the tasks whose schedule depends on the
+        seeds. Moving the start or the end of the project affects every
+        task, a full pass is done in that case.
+
+        `forward_seeds` are the tasks whose earliest dates may have changed,
+        `backward_seeds` the ones whose latest dates may have changed.
+        """
+        if self._first_anchor() != self._project_start:
+            self._compute()
+            return
+
+        position = self._graph.position
+
+        # forward pass in topological order, stopping at the tasks whose
+        # earliest dates don't change
+        heap = [(position(task_id), task_id) for task_id in forward_seeds]
+        heapq.heapify(heap)
+        visited: set[int] = set()
+
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            if task_id in visited:
+                continue
+
+            visited.add(task_id)
+            if self._forward(task_id):
+                for dependant in self._graph.dependants(task_id):
+                    heapq.heappush(heap, (position(dependant), dependant))
+
+        project_end = max(
+            self._earliest_finish.values(), default=self._project_start
+        )
+        if project_end != self._project_end:
+            self._project_end = project_end
+
+            for task_id in reversed(self._graph.topological_order()):
+                if task_id in self._dates:
+                    self._backward(task_id)
+
+            return
+
+        # backward pass in reverse topological order, stopping at the tasks
+        # whose latest dates don't change
+        heap = [(-position(task_id), task_id) for task_id in backward_seeds]
+        heapq.heapify(heap)
+        visited = set()
+
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            if task_id in visited:
+                continue
+
+            visited.add(task_id)
+            if self._backward(task_id):
+                for dependency in self._graph.dependencies(task_id):
+                    heapq.heappush(heap, (-position(dependency), dependency))
@@ -1,7 +1,7 @@
 import reflex as rx
 from typing import List, Dict, Any
 
-from J3ktMan.crud.project import get_projects
+from J3ktMan.crud import aio
 from reflex_clerk import ClerkState
 import datetime
 
@@ -22,7 +22,7 @@ class HomeState(rx.State):
 
         # The refresh_trigger will force the computed var to re-run
         _ = self.refresh_trigger
-        projects = get_projects(clerk_state.user_id)  # type: ignore
+        projects = await aio.get_projects(clerk_state.user_id)  # type: ignore
 
         # Convert projects to dictionaries with formatted dates
         result = []
@@ -1,35 +1,37 @@
 import reflex_clerk as clerk
 import reflex as rx
 
-from reflex.event import EventSpec
-
-from J3ktMan.crud.project import (
-    InvalidProjectIDError,
-    get_project,
-    is_in_project,
-)
+from reflex.event import EventCallback, EventSpec
+from reflex.utils.prerequisites import get_and_validate_app
+
+from J3ktMan import change_feed
+from J3ktMan.change_feed import Change, ChangeKind
+from J3ktMan.crud import aio
+from J3ktMan.crud.project import InvalidProjectIDError
+from J3ktMan.crud.snapshot import ProjectSnapshot, get_project_snapshot_at
 from J3ktMan.crud.tasks import (
     ExistingMilestoneNameError,
     ExistingStatusNameError,
     ExistingTaskNameError,
     MilestoneCreate,
     DateError,
-    assign_milestone,
-    create_milestone,
-    create_status,
-    create_task,
-    delete_status,
-    delete_task,
-    get_milestones_by_project_id,
-    get_statuses_by_project_id,
-    get_tasks_by_status_id,
-    rename_status,
-    rename_task,
-    set_status,
-    set_task_description,
-    update_task_dates,
+    TaskChange,
+    VersionConflictError,
 )
-from J3ktMan.model.tasks import Priority
+from J3ktMan.model.tasks import (
+    Priority,
+    Status as StatusModel,
+    Task as TaskModel,
+)
+
+import uuid
+from typing import Callable
+
+WATCH_INTERVAL = 30
+"""
+Number of seconds between two checks that the client of a change watcher is
+still connected.
+"""
 
 
 class Task(rx.Base):
@@ -40,58 +42,83 @@ class Task(rx.Base):
     milestone_id: int | None
     start_date: int | None
     end_date: int | None
+    version: int
 
 
 class Status(rx.Base):
     id: int
     name: str
     description: str
-    task_ids: list[int]
+    version: int
 
 
 class Milestone(rx.Base):
     id: int
     name: str
     description: str
-    task_ids: list[int]
-
-
-class Data(rx.Base):
-    project_id: int
-    project_name: str
-    milestones_by_id: dict[int, Milestone]
-    tasks_by_id: dict[int, Task]
-    statuses_by_id: dict[int, Status]
 
 
 class State(rx.State):
     """
     This state fetches all the data needed to display the project page. It was
     meant to be used in pages that uses the project information.
+
+    Each kind of data lives in its own var, so that a mutation only sends the
+    vars it touched to the browser, e.g. moving a task doesn't send the
+    statuses or milestones. The tasks, and the task IDs by status and by
+    milestone, stay on the backend: the pages' computed vars only send the
+    tasks they display, so moving a task sends that task and the windows of
+    the cards around it instead of every task of the project.
+
+    The tasks and their IDs by status and by milestone are read from the
+    project's snapshot, shared by all the sessions of the worker viewing the
+    project through the cache of `crud.snapshot`. A session only keeps the
+    version of the snapshot and copies of the tasks it changes, through
+    `_edit_task`, and reads them merged with the snapshot with the `_get_*`
+    methods: the newest version of a task wins, so the copies stay right if
+    the snapshot was evicted and the current one is read instead.
     """
 
-    data: Data | None
+    project_id: int | None = None
+    project_name: str = ""
+
+    milestones_by_id: dict[int, Milestone] = {}
+    statuses_by_id: dict[int, Status] = {}
+
+    _snapshot_version: int = 0
+    """
+    Version of the snapshot the project was loaded from, read from the cache
+    of `crud.snapshot` with `_get_snapshot`.
+    """
+
+    _task_overrides: dict[int, Task | None] = {}
+    """
+    Copies of the tasks changed since the snapshot was loaded, None for the
+    deleted ones. The tasks moved to another status or milestone, and the
+    created ones, are displayed after the tasks of the snapshot in the order
+    of this dict.
+    """
+
+    _watcher_id: str = ""
+    """
+    ID of the running `watch_changes` task, the other ones stop.
+    """
 
     @rx.event
-    async def load_project(self) -> None | list[EventSpec]:
+    async def load_project(self) -> None | list[EventSpec | EventCallback]:
         """
         Invokes this once before the page is loaded to load the project data.
         """
         self.reset()
 
-        milestones_by_id: dict[int, Milestone] = {}
-        tasks_by_id: dict[int, Task] = {}
-        statuses_by_id: dict[int, Status] = {}
-
         clerk_state = await self.get_state(clerk.ClerkState)
         if clerk_state.user_id is None:
             return
 
         try:
             project_id = int(self.router.page.params["project_id"])
-            project = get_project(project_id)
 
-            if not is_in_project(clerk_state.user_id, project_id):
+            if not await aio.is_in_project(clerk_state.user_id, project_id):
                 return [
                     rx.toast.error(
                         "You are not authorized to view this project",
@@ -99,53 +126,13 @@ class State(rx.State):
                     ),
                 ]
 
-            milestones = get_milestones_by_project_id(project_id)
-            for milestone in milestones:
-                milestones_by_id[milestone.id] = Milestone(
-                    id=milestone.id,
-                    name=milestone.name,
-                    description=milestone.description,
-                    task_ids=[],
-                )
-
-            statuses = get_statuses_by_project_id(project_id)
-            for status in statuses:
-                statuses_by_id[status.id] = Status(
-                    id=status.id,
-                    name=status.name,
-                    description=status.description,
-                    task_ids=[],
-                )
-
-                tasks = get_tasks_by_status_id(status.id)
-
-                for task in tasks:
-                    tasks_by_id[task.id] = Task(
-                        id=task.id,
-                        name=task.name,
-                        description=task.description,
-                        status_id=task.status_id,
-                        milestone_id=task.milestone_id,
-                        start_date=task.start_date,
-                        end_date=task.end_date,
-                    )
-
-                    statuses_by_id[status.id].task_ids.append(task.id)
+            snapshot = await aio.get_project_snapshot(project_id)
 
-                    if task.milestone_id is not None:
-                        milestones_by_id[task.milestone_id].task_ids.append(
-                            task.id
-                        )
-
-            new_page_data = Data(
-                project_id=project_id,
-                project_name=project.name,
-                milestones_by_id=milestones_by_id,
-                tasks_by_id=tasks_by_id,
-                statuses_by_id=statuses_by_id,
-            )
+            self._set_snapshot(snapshot)
+            self.project_id = project_id
+            self._watcher_id = uuid.uuid4().hex
 
-            self.data = new_page_data
+            return [State.watch_changes]
 
         except (KeyError, ValueError, InvalidProjectIDError):
             return [
@@ -156,21 +143,376 @@ class State(rx.State):
                 ),
             ]
 
+    def _set_snapshot(self, snapshot: ProjectSnapshot) -> None:
+        """
+        Replaces the project data with the one of the snapshot. Only the
+        milestones and statuses, sent to the browser, are copied.
+        """
+        milestones_by_id: dict[int, Milestone] = {}
+        statuses_by_id: dict[int, Status] = {}
+
+        for milestone in snapshot.milestones:
+            milestones_by_id[milestone.id] = Milestone(  # type: ignore
+                id=milestone.id,
+                name=milestone.name,
+                description=milestone.description,
+            )
+
+        for status in snapshot.statuses:
+            statuses_by_id[status.id] = Status(  # type: ignore
+                id=status.id,
+                name=status.name,
+                description=status.description,
+                version=status.version,
+            )
+
+        self.project_name = snapshot.project.name
+        self.milestones_by_id = milestones_by_id
+        self.statuses_by_id = statuses_by_id
+        self._snapshot_version = snapshot.version
+        self._task_overrides = {}
+
+    def _get_snapshot(self) -> ProjectSnapshot | None:
+        """
+        Returns the snapshot the project was loaded from, shared with the
+        other sessions, it must never be mutated.
+        """
+        if self.project_id is None:
+            return None
+
+        return get_project_snapshot_at(
+            self.project_id, self._snapshot_version
+        )
+
+    def _get_task(self, task_id: int) -> Task | TaskModel | None:
+        """
+        Returns the task, None if it doesn't exist. The tasks of the snapshot
+        are shared and must only be read, see `_edit_task`.
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return None
+
+        shared = snapshot.tasks_by_id.get(task_id)
+
+        if task_id not in self._task_overrides:
+            return shared
+
+        task = self._task_overrides[task_id]
+
+        if (
+            task is not None
+            and shared is not None
+            and shared.version > task.version
+        ):
+            return shared
+
+        return task
+
+    def _get_tasks(self) -> list[Task | TaskModel]:
+        """
+        Returns every task of the project, in the order they were created.
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return []
+
+        get_task = self._get_task
+        tasks_by_id = snapshot.tasks_by_id
+        overrides = self._task_overrides
+
+        tasks = []
+        for task_id, task in tasks_by_id.items():
+            if task_id in overrides:
+                task = get_task(task_id)
+
+            if task is not None:
+                tasks.append(task)
+
+        for task_id, task in overrides.items():
+            if task is not None and task_id not in tasks_by_id:
+                tasks.append(task)
+
+        return tasks
+
+    def _get_status_task_ids(self, status_id: int) -> dict[int, None]:
+        """
+        Returns the IDs of the tasks in the status, in display order.
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return {}
+
+        return self._merge_task_ids(
+            snapshot.task_ids_by_status_id.get(status_id, {}),
+            lambda task: task.status_id == status_id,
+        )
+
+    def _get_milestone_task_ids(self, milestone_id: int) -> dict[int, None]:
+        """
+        Returns the IDs of the tasks in the milestone, in display order.
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return {}
+
+        return self._merge_task_ids(
+            snapshot.task_ids_by_milestone_id.get(milestone_id, {}),
+            lambda task: task.milestone_id == milestone_id,
+        )
+
+    def _merge_task_ids(
+        self,
+        shared_task_ids: dict[int, None],
+        contains: Callable[[Task | TaskModel], bool],
+    ) -> dict[int, None]:
+        """
+        Returns the task IDs of a column of the snapshot, without the changed
+        tasks no longer in it, followed by the changed tasks moved to it.
+        Kept as ordered sets, the keys of dicts without values.
+        """
+        overrides = self._task_overrides
+        if not overrides:
+            return shared_task_ids
+
+        get_task = self._get_task
+
+        task_ids: dict[int, None] = {}
+        for task_id in shared_task_ids:
+            if task_id not in overrides:
+                task_ids[task_id] = None
+                continue
+
+            task = get_task(task_id)
+            if task is not None and contains(task):
+                task_ids[task_id] = None
+
+        for task_id in overrides:
+            if task_id in task_ids:
+                continue
+
+            task = get_task(task_id)
+            if task is not None and contains(task):
+                task_ids[task_id] = None
+
+        return task_ids
+
+    def _edit_task(self, task_id: int) -> Task:
+        """
+        Returns the session's copy of the task, to be changed in place. The
+        task of the snapshot is copied on the first change.
+        """
+        shared = self._get_task(task_id)
+        assert shared is not None
+
+        task = self._task_overrides.get(task_id)
+
+        if task is None or task.version < shared.version:
+            self._task_overrides[task_id] = Task(
+                id=shared.id,  # type: ignore
+                name=shared.name,
+                description=shared.description,
+                status_id=shared.status_id,
+                milestone_id=shared.milestone_id,
+                start_date=shared.start_date,
+                end_date=shared.end_date,
+                version=shared.version,
+            )
+            task = self._task_overrides[task_id]
+
+        return task  # type: ignore
+
+    def _add_task(self, task: Task) -> None:
+        """
+        Adds a task created since the snapshot was loaded.
+        """
+        self._task_overrides[task.id] = task
+
+    def _remove_task(self, task_id: int) -> Task | TaskModel | None:
+        """
+        Removes the task, returns it or None if it doesn't exist.
+        """
+        task = self._get_task(task_id)
+        if task is None:
+            return None
+
+        self._task_overrides[task_id] = None
+
+        return task
+
+    def _apply_change(self, change: Change) -> bool:
+        """
+        Applies a change published by a session, this one included: applying
+        a change already made has no effect. Returns False if the change
+        can't be applied and the project has to be loaded again.
+        """
+        if change.kind == ChangeKind.PROJECT_CHANGED or change.partial:
+            return False
+
+        task_id = change.task_id
+        assert task_id is not None
+
+        task = self._get_task(task_id)
+
+        if change.kind == ChangeKind.TASK_DELETED:
+            self._remove_task(task_id)
+            return True
+
+        fields = change.fields()
+
+        # a status or a milestone created since the project was loaded
+        if (
+            "status_id" in fields
+            and fields["status_id"] not in self.statuses_by_id
+        ):
+            return False
+
+        if (
+            fields.get("milestone_id") is not None
+            and fields["milestone_id"] not in self.milestones_by_id
+        ):
+            return False
+
+        if change.kind == ChangeKind.TASK_CREATED:
+            if task is None:
+                self._add_task(Task(id=task_id, **fields))
+
+            return True
+
+        if task is None:
+            return False
+
+        # already overwritten by a later change
+        if change.version is not None and change.version < task.version:
+            return True
+
+        self._move_task(
+            task_id,
+            fields.get("status_id", task.status_id),
+            fields.get("milestone_id", task.milestone_id),
+        )
+
+        task = self._edit_task(task_id)
+        for field, value in fields.items():
+            setattr(task, field, value)
+
+        return True
+
+    def _move_task(
+        self, task_id: int, status_id: int, milestone_id: int | None
+    ) -> None:
+        """
+        Moves the task to the end of the status and of the milestone, if they
+        changed. The task itself is left unchanged, its status and milestone
+        are set by the caller.
+        """
+        task = self._get_task(task_id)
+        assert task is not None
+
+        if status_id == task.status_id and milestone_id == task.milestone_id:
+            return
+
+        self._edit_task(task_id)
+
+        overrides = self._task_overrides
+        overrides[task_id] = overrides.pop(task_id)
+
+    def _resolve_conflict(
+        self, error: VersionConflictError
+    ) -> list[EventSpec]:
+        """
+        Replaces the outdated copy of the task or status with the current one
+        of the conflict, so that the user can retry the change on it.
+        """
+        current = error.current
+
+        if isinstance(current, StatusModel):
+            status = self.statuses_by_id.get(current.id)
+
+            if status is not None:
+                status.name = current.name
+                status.description = current.description
+                status.version = current.version
+        else:
+            self._apply_change(
+                Change(
+                    kind=ChangeKind.TASK_UPDATED,
+                    project_id=self.project_id,  # type: ignore
+                    task_id=current.id,
+                    name=current.name,
+                    description=current.description,
+                    status_id=current.status_id,
+                    milestone_id=current.milestone_id,
+                    start_date=current.start_date,
+                    end_date=current.end_date,
+                    version=current.version,
+                )
+            )
+
+        return [
+            rx.toast.error(
+                f'"{current.name}" was changed by someone else, please try '
+                "again",
+                position="top-center",
+            )
+        ]
+
+    @rx.event(background=True)
+    async def watch_changes(self) -> None:
+        """
+        Applies the changes made to the project by the other sessions, until
+        the client disconnects or another project is loaded.
+        """
+        async with self:
+            project_id = self.project_id
+            watcher_id = self._watcher_id
+            token = self.router.session.client_token
+
+        if project_id is None:
+            return
+
+        with change_feed.get_bus().subscribe(project_id) as subscription:
+            while _is_connected(token):
+                changes = await subscription.get(timeout=WATCH_INTERVAL)
+
+                reload = subscription.lost
+                subscription.lost = False
+
+                async with self:
+                    if self._watcher_id != watcher_id:
+                        return
+
+                    for change in changes:
+                        if not self._apply_change(change):
+                            reload = True
+                            break
+
+                if not reload:
+                    continue
+
+                snapshot = await aio.get_project_snapshot(project_id)
+
+                async with self:
+                    if self._watcher_id != watcher_id:
+                        return
+
+                    self._set_snapshot(snapshot)
+
     @rx.var
     def loaded(self) -> bool:
         """
         Returns True if the project data has been loaded.
         """
 
-        return self.data is not None
+        return self.project_id is not None
 
     @rx.var(cache=True)
     def milestone_name_by_ids(self) -> dict[int, str]:
-        if self.data is None:
+        if self.project_id is None:
             return {}
 
         result = {}
-        for id, mil in self.data.milestones_by_id.items():
+        for id, mil in self.milestones_by_id.items():
             result[id] = mil.name
 
         return result
@@ -181,10 +523,10 @@ class State(rx.State):
         Returns the list of milestones.
         """
 
-        if self.data is None:
+        if self.project_id is None:
             return []
 
-        return list(self.data.milestones_by_id.values())
+        return list(self.milestones_by_id.values())
 
     @rx.var(cache=True)
     def statuses(self) -> list[Status]:
@@ -192,34 +534,38 @@ class State(rx.State):
         Returns the list of statuses.
         """
 
-        if self.data is None:
+        if self.project_id is None:
             return []
 
-        return list(self.data.statuses_by_id.values())
+        return list(self.statuses_by_id.values())
 
     def tasks(self) -> dict[int, Task]:
         """
         Returns the dict of tasks.
         """
 
-        if self.data is None:
+        if self.project_id is None:
             return {}
 
-        return self.data.tasks_by_id
+        return {task.id: task for task in self._get_tasks()}  # type: ignore
 
     @rx.event
-    def create_status(self, status_name: str) -> list[EventSpec] | None:
-        if self.data is None:
+    async def create_status(
+        self, status_name: str
+    ) -> list[EventSpec] | None:
+        if self.project_id is None:
             return
 
         try:
-            status = create_status(status_name, "", self.data.project_id)
+            status = await aio.create_status(
+                status_name, "", self.project_id
+            )
 
-            self.data.statuses_by_id[status.id] = Status(
+            self.statuses_by_id[status.id] = Status(
                 id=status.id,
                 name=status.name,
                 description=status.description,
-                task_ids=[],
+                version=status.version,
             )
 
             return [
@@ -238,7 +584,7 @@ class State(rx.State):
             ]
 
     @rx.event
-    def create_task(
+    async def create_task(
         self,
         name: str,
         description: str,
@@ -249,12 +595,12 @@ class State(rx.State):
         end_date: int | None = None,
     ) -> list[EventSpec] | None:
 
-        if self.data is None:
+        if self.project_id is None:
             return
 
         try:
             # create task
-            task = create_task(
+            task = await aio.create_task(
                 name,
                 description,
                 priority,
@@ -264,21 +610,18 @@ class State(rx.State):
                 end_date,
             )
 
-            self.data.tasks_by_id[task.id] = Task(
-                id=task.id,
-                name=task.name,
-                description=task.description,
-                status_id=task.status_id,
-                milestone_id=milestone_id,
-                start_date=task.start_date,
-                end_date=task.end_date,
-            )
-            self.data.statuses_by_id[status_id].task_ids.append(task.id)
-
-            if milestone_id is not None:
-                self.data.milestones_by_id[milestone_id].task_ids.append(
-                    task.id
+            self._add_task(
+                Task(
+                    id=task.id,
+                    name=task.name,
+                    description=task.description,
+                    status_id=task.status_id,
+                    milestone_id=milestone_id,
+                    start_date=task.start_date,
+                    end_date=task.end_date,
+                    version=task.version,
                 )
+            )
 
             return [
                 rx.toast.success(
@@ -304,15 +647,18 @@ class State(rx.State):
             ]
 
     @rx.event
-    def rename_status(
+    async def rename_status(
         self, status_id: int, new_name: str
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
         try:
-            status = rename_status(status_id, new_name)
-            self.data.statuses_by_id[status.id].name = status.name
+            status = await aio.rename_status(
+                status_id, new_name, self.statuses_by_id[status_id].version
+            )
+            self.statuses_by_id[status.id].name = status.name
+            self.statuses_by_id[status.id].version = status.version
 
             return [
                 rx.toast.success(
@@ -329,42 +675,54 @@ class State(rx.State):
                 )
             ]
 
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
+
     @rx.event
-    def set_task_status(
+    async def set_task_status(
         self,
         task_id: int,
         status_id: int,
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
-        previous_status_id = set_status(task_id, status_id)
+        current_task = self._get_task(task_id)
+        assert current_task is not None
+
+        try:
+            task = await aio.set_status(
+                task_id, status_id, current_task.version
+            )
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
 
-        self.data.statuses_by_id[previous_status_id].task_ids.remove(task_id)
-        self.data.statuses_by_id[status_id].task_ids.append(task_id)
-        self.data.tasks_by_id[task_id].status_id = status_id
+        self._move_task(task_id, status_id, current_task.milestone_id)
+
+        edited_task = self._edit_task(task_id)
+        edited_task.status_id = status_id
+        edited_task.version = task.version
 
     @rx.event
-    def create_milestone(
+    async def create_milestone(
         self, name: str, description: str
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
         try:
-            milestone = create_milestone(
+            milestone = await aio.create_milestone(
                 MilestoneCreate(
                     name=name,
                     description=description,
-                    parent_project_id=self.data.project_id,
+                    parent_project_id=self.project_id,
                 )
             )
 
-            self.data.milestones_by_id[milestone.id] = Milestone(
+            self.milestones_by_id[milestone.id] = Milestone(
                 id=milestone.id,
                 name=milestone.name,
                 description=milestone.description,
-                task_ids=[],
             )
 
             return [
@@ -383,27 +741,38 @@ class State(rx.State):
             ]
 
     @rx.event
-    def delete_status(
+    async def delete_status(
         self, status_id: int, migration_status_id: int
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return None
 
         # delete status
-        affecting_tasks = delete_status(status_id, migration_status_id)
+        try:
+            affecting_tasks = await aio.delete_status(
+                status_id,
+                migration_status_id,
+                self.statuses_by_id[status_id].version,
+            )
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
 
         # remove status from state
-        deleted_status_name = self.data.statuses_by_id[status_id].name
-        del self.data.statuses_by_id[status_id]
+        deleted_status_name = self.statuses_by_id[status_id].name
+        del self.statuses_by_id[status_id]
 
-        # remove tasks from state
+        # move tasks to the migration status
         for affecting_task in affecting_tasks:
-            self.data.tasks_by_id[affecting_task.id].model = affecting_task
+            task_id: int = affecting_task.id  # type: ignore
 
-            self.data.statuses_by_id[migration_status_id].task_ids.append(
-                affecting_task.id
+            self._move_task(
+                task_id, migration_status_id, affecting_task.milestone_id
             )
 
+            task = self._edit_task(task_id)
+            task.status_id = migration_status_id
+            task.version = affecting_task.version
+
         return [
             rx.toast.success(
                 f"Status {deleted_status_name} has been deleted",
@@ -412,31 +781,26 @@ class State(rx.State):
         ]
 
     @rx.event
-    def assign_milestone(
+    async def assign_milestone(
         self, task_id: int, milestone_id: int | None
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
-        old_milestone_id = self.data.tasks_by_id[task_id].milestone_id
-        assign_milestone(milestone_id, task_id)
+        task = await aio.assign_milestone(milestone_id, task_id)
+        assert task is not None
 
         # update task in state
+        edited_task = self._edit_task(task_id)
+        self._move_task(task_id, edited_task.status_id, milestone_id)
 
-        if old_milestone_id is not None:
-            self.data.milestones_by_id[old_milestone_id].task_ids.remove(
-                task_id
-            )
-
-        self.data.tasks_by_id[task_id].milestone_id = milestone_id
-
-        if milestone_id is not None:
-            self.data.milestones_by_id[milestone_id].task_ids.append(task_id)
+        edited_task.milestone_id = milestone_id
+        edited_task.version = task.version
 
-        task_name = self.data.tasks_by_id[task_id].name
+        task_name = edited_task.name
 
         message = (
-            f'Task "{task_name}" has been assigned to "{self.data.milestones_by_id[milestone_id].name}"'  # type: ignore
+            f'Task "{task_name}" has been assigned to "{self.milestones_by_id[milestone_id].name}"'  # type: ignore
             if milestone_id is not None
             else f'Task "{task_name}" has been unassigned'
         )
@@ -446,25 +810,15 @@ class State(rx.State):
         ]
 
     @rx.event
-    def delete_task(self, task_id: int) -> list[EventSpec] | None:
-        if self.data is None:
+    async def delete_task(self, task_id: int) -> list[EventSpec] | None:
+        if self.project_id is None:
             return
 
-        delete_task(task_id)
+        await aio.delete_task(task_id)
 
         # delete task
-        deleted_task = self.data.tasks_by_id[task_id]
-        del self.data.tasks_by_id[task_id]
-
-        # remove task from status
-        self.data.statuses_by_id[deleted_task.status_id].task_ids.remove(
-            deleted_task.id
-        )
-
-        if deleted_task.milestone_id is not None:
-            self.data.milestones_by_id[
-                deleted_task.milestone_id
-            ].task_ids.remove(task_id)
+        deleted_task = self._remove_task(task_id)
+        assert deleted_task is not None
 
         return [
             rx.toast.success(
@@ -474,15 +828,22 @@ class State(rx.State):
         ]
 
     @rx.event
-    def rename_task(
+    async def rename_task(
         self, task_id: int, new_name: str
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
         try:
-            new_task_model = rename_task(task_id, new_name)
-            self.data.tasks_by_id[task_id].name = new_task_model.name
+            current_task = self._get_task(task_id)
+            assert current_task is not None
+
+            new_task_model = await aio.rename_task(
+                task_id, new_name, current_task.version
+            )
+            task = self._edit_task(task_id)
+            task.name = new_task_model.name
+            task.version = new_task_model.version
 
             return [
                 rx.toast.success(
@@ -499,16 +860,22 @@ class State(rx.State):
                 )
             ]
 
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
+
     @rx.event
-    def set_task_description(
+    async def set_task_description(
         self, task_id: int, new_description: str
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
-        set_task_description(task_id, new_description)
-        task = self.data.tasks_by_id[task_id]
+        new_task_model = await aio.set_task_description(
+            task_id, new_description
+        )
+        task = self._edit_task(task_id)
         task.description = new_description
+        task.version = new_task_model.version
 
         return [
             rx.toast.success(
@@ -518,19 +885,29 @@ class State(rx.State):
         ]
 
     @rx.event
-    def change_task_dates(
+    async def change_task_dates(
         self,
         task_id: int,
         start_date: int | None = None,
         end_date: int | None = None,
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
+
+        current_task = self._get_task(task_id)
+        assert current_task is not None
+
         try:
-            update_task_dates(task_id, start_date, end_date)
-            task = self.data.tasks_by_id[task_id]
+            new_task_model = await aio.update_task_dates(
+                task_id,
+                start_date,
+                end_date,
+                current_task.version,
+            )
+            task = self._edit_task(task_id)
             task.start_date = start_date
             task.end_date = end_date
+            task.version = new_task_model.version
 
             return [
                 rx.toast.success(
@@ -545,9 +922,11 @@ class State(rx.State):
                     position="top-center",
                 )
             ]
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
 
     @rx.event
-    def edit_task(
+    async def edit_task(
         self,
         task_id: int,
         name: str,
@@ -555,17 +934,31 @@ class State(rx.State):
         start_date: int | None = None,
         end_date: int | None = None,
     ) -> list[EventSpec] | None:
-        if self.data is None:
+        if self.project_id is None:
             return
 
+        current_task = self._get_task(task_id)
+        assert current_task is not None
+
         try:
-            task = rename_task(task_id, name)
-            task.description = description
-            update_task_dates(task_id, start_date, end_date)
-            self.data.tasks_by_id[task_id].name = task.name
-            self.data.tasks_by_id[task_id].description = task.description
-            self.data.tasks_by_id[task_id].start_date = start_date
-            self.data.tasks_by_id[task_id].end_date = end_date
+            [task] = await aio.apply_task_changes(
+                [
+                    TaskChange(
+                        task_id=task_id,
+                        name=name,
+                        description=description,
+                        start_date=start_date,
+                        end_date=end_date,
+                        version=current_task.version,
+                    )
+                ]
+            )
+            edited_task = self._edit_task(task_id)
+            edited_task.name = task.name
+            edited_task.description = task.description
+            edited_task.start_date = task.start_date
+            edited_task.end_date = task.end_date
+            edited_task.version = task.version
 
             return [
                 rx.toast.success(
@@ -580,3 +973,22 @@ class State(rx.State):
                     position="top-center",
                 )
             ]
+        except DateError:
+            return [
+                rx.toast.error(
+                    "Invalid date range",
+                    position="top-center",
+                )
+            ]
+        except VersionConflictError as error:
+            return self._resolve_conflict(error)
+
+
+def _is_connected(token: str) -> bool:
+    """
+    Returns True if the client with the given token is connected to this
+    worker.
+    """
+    namespace = get_and_validate_app().app.event_namespace
+
+    return namespace is not None and token in namespace.token_to_sid
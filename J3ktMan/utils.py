@@ -17,3 +17,15 @@ def date_to_epoch(date_str: str) -> int:
     if date_str is None or date_str == "":
         return 0
     return int(datetime.strptime(date_str, "%Y-%m-%d").timestamp())
+
+
+def get_window(start: int, size: int, overscan: int) -> tuple[int, int]:
+    """
+    Returns the `[first, last)` window covering `[start, start + size)`
+    extended by `overscan` on both sides. The window is aligned on multiples
+    of `overscan` so that small scrolls don't move it.
+    """
+    first = max(0, (start - overscan) // overscan * overscan)
+    last = -(-(start + size + overscan) // overscan) * overscan
+
+    return first, last
@@ -0,0 +1,84 @@
+"""
+Benchmark of the incremental cycle detection of `DependencyGraph`, run with
+`python -m benchmarks.dependency_graph` from the repository root.
+"""
+
+from J3ktMan.dependency_graph import CycleError, DependencyGraph
+
+import random
+import time
+
+
+def benchmark(
+    task_count: int = 10_000, edge_count: int = 50_000, seed: int = 0
+) -> None:
+    rng = random.Random(seed)
+
+    # a hidden ranking of the tasks guarantees that the edges form a DAG,
+    # the edges are then inserted in random order
+    ranking = list(range(task_count))
+    rng.shuffle(ranking)
+
+    edges: set[tuple[int, int]] = set()
+    while len(edges) < edge_count:
+        a, b = rng.sample(range(task_count), 2)
+        if ranking[a] > ranking[b]:
+            a, b = b, a
+        edges.add((a, b))
+
+    insertion = list(edges)
+    rng.shuffle(insertion)
+
+    graph = DependencyGraph()
+    for task_id in range(task_count):
+        graph.add_task(task_id)
+
+    slowest = 0.0
+    start = time.perf_counter()
+    for dependency, dependant in insertion:
+        before = time.perf_counter()
+        graph.add_edge(dependency, dependant)
+        slowest = max(slowest, time.perf_counter() - before)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"inserted {edge_count} edges over {task_count} tasks: "
+        f"{elapsed / edge_count * 1e6:.1f} us/edge on average, "
+        f"{slowest * 1e3:.2f} ms at worst"
+    )
+
+    # every reverse edge closes a cycle and must be rejected
+    rejected = rng.sample(insertion, 1_000)
+    start = time.perf_counter()
+    for dependency, dependant in rejected:
+        try:
+            graph.add_edge(dependant, dependency)
+        except CycleError:
+            pass
+        else:
+            raise AssertionError("cycle not detected")
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"rejected {len(rejected)} cyclic edges: "
+        f"{elapsed / len(rejected) * 1e6:.1f} us/edge on average"
+    )
+
+    start = time.perf_counter()
+    order = graph.topological_order()
+    elapsed = time.perf_counter() - start
+
+    position = {task_id: index for index, task_id in enumerate(order)}
+    assert all(position[a] < position[b] for a, b in graph.edges())
+
+    print(f"topological order of {task_count} tasks: {elapsed * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    DependencyGraph.from_edges(insertion, range(task_count))
+    elapsed = time.perf_counter() - start
+
+    print(f"bulk load of {edge_count} edges: {elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,3 @@
+# Reflex is imported first, as in the app: the models only build once Reflex
+# has set up sqlmodel
+import reflex  # noqa
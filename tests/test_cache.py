@@ -0,0 +1,81 @@
+from J3ktMan.cache import MISSING, TTLCache
+
+import time
+
+
+def test_expired_entry_is_missing():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+
+
+def test_none_is_cached():
+    cache: TTLCache[str, int | None] = TTLCache(maxsize=10, ttl=60)
+    calls = []
+
+    def load() -> None:
+        calls.append(None)
+
+    assert cache.get_or_load("a", load) is None
+    assert cache.get_or_load("a", load) is None
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_weigher_bounds_the_total_weight():
+    cache: TTLCache[str, list[int]] = TTLCache(maxsize=5, ttl=60, weigher=len)
+    cache.set("a", [1, 2])
+    cache.set("b", [1, 2, 3])
+    cache.set("c", [1])
+
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == [1, 2, 3]
+
+    # heavier than the whole cache, never stored
+    cache.set("d", [1] * 6)
+
+    assert cache.get("d") is MISSING
+    assert cache.get("b") == [1, 2, 3]
+
+
+def test_value_loaded_during_an_invalidation_is_not_stored():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+
+    def load() -> int:
+        # a write invalidates the key while the old value is being loaded
+        cache.invalidate("a")
+        return 1
+
+    assert cache.get_or_load("a", load) == 1
+    assert cache.get("a") is MISSING
+
+    assert cache.get_or_load("a", lambda: 2) == 2
+    assert cache.get("a") == 2
+
+
+def test_value_loaded_during_a_clear_is_not_stored():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+
+    def load() -> int:
+        cache.clear()
+        return 1
+
+    assert cache.get_or_load("a", load) == 1
+    assert cache.get("a") is MISSING
@@ -0,0 +1,105 @@
+from J3ktMan.dependency_graph import CycleError, DependencyGraph
+
+import pytest
+
+
+def assert_topological(graph: DependencyGraph) -> None:
+    for dependency, dependant in graph.edges():
+        assert graph.position(dependency) < graph.position(dependant)
+
+
+def test_edge_respecting_the_order_keeps_the_positions():
+    graph = DependencyGraph()
+    graph.add_edge(1, 2)
+    graph.add_edge(2, 3)
+
+    positions = {task_id: graph.position(task_id) for task_id in (1, 2, 3)}
+    graph.add_edge(1, 3)
+
+    assert {task_id: graph.position(task_id) for task_id in (1, 2, 3)} == (
+        positions
+    )
+    assert_topological(graph)
+
+
+def test_edge_violating_the_order_reorders_the_affected_tasks():
+    graph = DependencyGraph()
+    for task_id in range(1, 6):
+        graph.add_task(task_id)
+
+    graph.add_edge(4, 5)
+    graph.add_edge(1, 2)
+
+    # 5 is positioned before 2, the edge moves 2 after 5, without touching
+    # 3 which isn't between them
+    graph.add_edge(5, 2)
+
+    assert_topological(graph)
+    assert graph.position(4) < graph.position(5) < graph.position(2)
+    assert graph.position(3) == 2
+
+
+def test_reordering_moves_the_dependants_along():
+    graph = DependencyGraph()
+    graph.add_edge(1, 2)
+    graph.add_edge(2, 3)
+    graph.add_edge(4, 5)
+
+    graph.add_edge(5, 1)
+
+    assert_topological(graph)
+    assert graph.topological_order() == [4, 5, 1, 2, 3]
+
+
+def test_self_dependency_is_rejected():
+    graph = DependencyGraph()
+
+    with pytest.raises(CycleError):
+        graph.add_edge(1, 1)
+
+
+def test_cycle_is_rejected_and_the_graph_left_unchanged():
+    graph = DependencyGraph()
+    graph.add_edge(1, 2)
+    graph.add_edge(2, 3)
+    graph.add_edge(3, 4)
+
+    edges = set(graph.edges())
+    order = graph.topological_order()
+
+    with pytest.raises(CycleError):
+        graph.add_edge(4, 1)
+
+    with pytest.raises(CycleError):
+        graph.add_edge(3, 2)
+
+    assert set(graph.edges()) == edges
+    assert graph.topological_order() == order
+
+
+def test_removed_edge_no_longer_closes_a_cycle():
+    graph = DependencyGraph()
+    graph.add_edge(1, 2)
+    graph.add_edge(2, 3)
+
+    graph.remove_edge(2, 3)
+    graph.add_edge(3, 1)
+
+    assert not graph.has_edge(2, 3)
+    assert graph.depends_on(2, 3)
+    assert_topological(graph)
+
+
+def test_depends_on_follows_the_transitive_dependencies():
+    graph = DependencyGraph.from_edges([(1, 2), (2, 3), (4, 3)], [5])
+
+    assert graph.depends_on(3, 1)
+    assert graph.depends_on(3, 4)
+    assert not graph.depends_on(1, 3)
+    assert not graph.depends_on(2, 4)
+    assert not graph.depends_on(5, 1)
+
+
+def test_from_edges_rejects_a_cycle():
+    with pytest.raises(CycleError):
+        DependencyGraph.from_edges([(1, 2), (2, 3), (3, 1)])
@@ -0,0 +1,209 @@
+from sqlalchemy.pool import StaticPool
+import sqlmodel
+
+from J3ktMan import db
+from J3ktMan.crud import schedule as crud_schedule
+from J3ktMan.dependency_graph import CycleError, DependencyGraph
+from J3ktMan.model.project import Project
+from J3ktMan.model.tasks import Priority, Status, Task, TaskDependency
+from J3ktMan.schedule import ProjectSchedule, TaskDates, TaskTiming
+
+import pytest
+
+
+def rebuilt(schedule: ProjectSchedule) -> ProjectSchedule:
+    """
+    Returns the schedule computed from scratch on the same graph and dates.
+    """
+    dates = dict(schedule._dates)
+    graph = DependencyGraph.from_edges(schedule.graph.edges(), dates)
+
+    return ProjectSchedule(graph, dates)
+
+
+def test_forward_and_backward_passes():
+    dates = {
+        1: TaskDates(0, 10),
+        2: TaskDates(0, 5),
+        3: TaskDates(20, 25),
+    }
+    schedule = ProjectSchedule(DependencyGraph.from_edges([(1, 2)]), dates)
+
+    # 2 can't start before 1 finishes, 3 ends the project at 25
+    assert schedule.timing(2) == TaskTiming(10, 15, 20, 25)
+    assert schedule.timing(1) == TaskTiming(0, 10, 10, 20)
+    assert schedule.timing(3) == TaskTiming(20, 25, 20, 25)
+
+    assert schedule.project_end == 25
+    assert schedule.critical_tasks() == {3}
+
+
+def test_added_dependency_updates_the_critical_path():
+    dates = {
+        1: TaskDates(0, 10),
+        2: TaskDates(0, 5),
+        3: TaskDates(0, 20),
+    }
+    schedule = ProjectSchedule(DependencyGraph(), dates)
+
+    schedule.add_dependency(1, 2)
+
+    assert schedule.timing(2) == TaskTiming(10, 15, 15, 20)
+    assert schedule.critical_path() == [3]
+
+    schedule.add_dependency(3, 2)
+
+    # 2 now waits for 3 and pushes the end of the project to 25
+    assert schedule.timing(2) == TaskTiming(20, 25, 20, 25)
+    assert schedule.timing(1) == TaskTiming(0, 10, 10, 20)
+    assert schedule.project_end == 25
+    assert schedule.critical_tasks() == {2, 3}
+    assert schedule.critical_path() == [3, 2]
+    assert schedule.timings() == rebuilt(schedule).timings()
+
+
+def test_incremental_updates_match_a_full_computation():
+    dates = {task_id: TaskDates(task_id, task_id * 3) for task_id in range(8)}
+    schedule = ProjectSchedule(DependencyGraph(), dates)
+
+    for dependency, dependant in [(0, 3), (3, 5), (1, 5), (5, 7), (2, 6)]:
+        schedule.add_dependency(dependency, dependant)
+        assert schedule.timings() == rebuilt(schedule).timings()
+
+    schedule.set_task_dates(1, 4, 40)
+    assert schedule.timings() == rebuilt(schedule).timings()
+
+    schedule.remove_dependency(1, 5)
+    assert schedule.timings() == rebuilt(schedule).timings()
+    assert schedule.critical_path() == rebuilt(schedule).critical_path()
+
+
+def test_dependency_on_a_new_task_schedules_it():
+    schedule = ProjectSchedule(DependencyGraph(), {1: TaskDates(0, 10)})
+
+    schedule.add_dependency(1, 2)
+    schedule.add_dependency(3, 1)
+
+    assert schedule.timing(2) == TaskTiming(10, 10, 10, 10)
+    assert schedule.timing(3) == TaskTiming(0, 0, 0, 0)
+    assert schedule.timings() == rebuilt(schedule).timings()
+
+
+def test_cyclic_dependency_is_rejected():
+    schedule = ProjectSchedule(DependencyGraph(), {1: TaskDates(0, 1)})
+    schedule.add_dependency(1, 2)
+
+    with pytest.raises(CycleError):
+        schedule.add_dependency(2, 1)
+
+    assert not schedule.graph.has_edge(2, 1)
+
+
+@pytest.fixture
+def project_id(monkeypatch: pytest.MonkeyPatch) -> int:
+    engine = sqlmodel.create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    sqlmodel.SQLModel.metadata.create_all(engine)
+
+    monkeypatch.setattr(db, "_engine", engine)
+    crud_schedule._schedule_cache.clear()
+
+    with db.session() as session:
+        project = Project(name="project", created_at=0, starting_date=0)
+        session.add(project)
+        session.flush()
+
+        status = Status(name="todo", description="", project_id=project.id)
+        session.add(status)
+        session.flush()
+
+        for task_id in (1, 2, 3):
+            session.add(
+                Task(
+                    id=task_id,
+                    name=f"task {task_id}",
+                    description="",
+                    status_id=status.id,
+                    priority=Priority.MEDIUM,
+                    start_date=None,
+                    end_date=None,
+                )
+            )
+
+        session.commit()
+
+        return project.id
+
+
+def add_dependency(dependency_task_id: int, dependant_task_id: int) -> int:
+    """
+    Inserts the dependency behind the cache's back, like another process.
+    """
+    with db.session() as session:
+        dependency = TaskDependency(
+            dependency_id=dependency_task_id, dependant_id=dependant_task_id
+        )
+        session.add(dependency)
+        session.commit()
+
+        assert dependency.id is not None
+        return dependency.id
+
+
+def check_dependency(
+    project_id: int, dependency_task_id: int, dependant_task_id: int
+) -> None:
+    with db.session() as session:
+        crud_schedule.check_dependency(
+            session, project_id, dependency_task_id, dependant_task_id
+        )
+
+
+def test_check_dependency_rejects_a_cycle(project_id: int):
+    add_dependency(1, 2)
+    add_dependency(2, 3)
+
+    check_dependency(project_id, 1, 3)
+
+    with pytest.raises(CycleError):
+        check_dependency(project_id, 3, 1)
+
+    with pytest.raises(CycleError):
+        check_dependency(project_id, 2, 2)
+
+
+def test_check_dependency_catches_up_with_new_dependencies(project_id: int):
+    first_id = add_dependency(1, 2)
+    check_dependency(project_id, 2, 3)
+
+    cached = crud_schedule._schedule_cache.get(project_id)
+    assert isinstance(cached, crud_schedule._CachedSchedule)
+    assert cached.last_dependency_id == first_id
+
+    # created by another process, unknown to the cached graph
+    second_id = add_dependency(2, 3)
+    check_dependency(project_id, 1, 3)
+
+    assert crud_schedule._schedule_cache.get(project_id) is cached
+    assert cached.last_dependency_id == second_id
+    assert cached.schedule.graph.has_edge(2, 3)
+
+    with pytest.raises(CycleError):
+        check_dependency(project_id, 3, 1)
+
+
+def test_check_dependency_reloads_a_graph_with_removed_dependencies(
+    project_id: int,
+):
+    add_dependency(1, 2)
+    check_dependency(project_id, 2, 3)
+
+    with db.session() as session:
+        session.exec(sqlmodel.delete(TaskDependency))  # type: ignore
+        session.commit()
+
+    # the cached graph still has the removed dependency
+    check_dependency(project_id, 2, 1)